@@ -0,0 +1,324 @@
+"""Pooled HTTP transport for the Catalog API client.
+
+ABConnect's CatalogRequestHandler sends every call through requests.request(),
+which opens (and TLS-negotiates) a fresh connection each time, and it installs
+its handler on BaseCatalogEndpoint at class level, so concurrent requests in
+one process share whichever token was loaded last. build_catalog_api()
+returns a per-request CatalogAPI whose endpoints carry their own handler
+(scoped to that request's session token) while all HTTP goes through one
+process-wide requests.Session with a bounded keep-alive connection pool.
+
+Every call also passes through a process-wide circuit breaker, so once the
+API is failing, callers get CatalogAPIUnavailable immediately instead of
+each waiting out its own timeout, and holds a permit from the cluster-wide
+concurrency limiter in catalog.rate_limit while it is in flight. Calls are
+bounded by CATALOG_API_CONNECT_TIMEOUT/CATALOG_API_READ_TIMEOUT and by the
+remaining time budget of the Django request they run for (set_deadline()),
+and each one is counted in the request's metrics (catalog.instrumentation).
+"""
+
+import http.cookiejar
+import logging
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import requests
+from ABConnect.api.auth import SessionTokenStorage
+from ABConnect.api.catalog import CatalogAPI, CatalogRequestHandler
+from ABConnect.exceptions import ABConnectError
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from catalog import rate_limit
+from catalog.instrumentation import record_api_call
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogAPIUnavailable(ABConnectError):
+    """Raised instead of calling the Catalog API while its circuit breaker is open."""
+
+    def __init__(self, message="Catalog API circuit breaker is open"):
+        super().__init__(message, code="CIRCUIT_OPEN")
+
+
+class _CircuitBreaker:
+    """Error-rate circuit breaker for Catalog API calls.
+
+    Closed: calls go through and their outcomes are kept for the last
+    CATALOG_API_BREAKER_WINDOW seconds. Once at least
+    CATALOG_API_BREAKER_MIN_CALLS outcomes are in the window and the share
+    of failures (connection errors, timeouts, 5xx) reaches
+    CATALOG_API_BREAKER_ERROR_RATE, the breaker opens and calls fail fast for
+    CATALOG_API_BREAKER_COOLDOWN seconds. The first call after that is let
+    through as a trial (half-open): success closes the breaker, failure
+    re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes = deque()  # (monotonic time, failed)
+            self._opened_at = None
+            self._rejected = 0
+
+    def before_call(self):
+        """Raise CatalogAPIUnavailable unless a call may go ahead now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            cooldown = getattr(settings, "CATALOG_API_BREAKER_COOLDOWN", 30)
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= cooldown:
+                self._state = self.HALF_OPEN
+                return
+            self._rejected += 1
+        raise CatalogAPIUnavailable()
+
+    def record(self, failed):
+        """Record the outcome of a call that was let through."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if failed:
+                    self._open(now)
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info("Catalog API circuit breaker closed; trial call succeeded")
+                return
+            window = getattr(settings, "CATALOG_API_BREAKER_WINDOW", 30)
+            self._outcomes.append((now, failed))
+            while self._outcomes and self._outcomes[0][0] < now - window:
+                self._outcomes.popleft()
+            if self._state != self.CLOSED or len(self._outcomes) < getattr(settings, "CATALOG_API_BREAKER_MIN_CALLS", 10):
+                return
+            failures = sum(1 for _, f in self._outcomes if f)
+            if failures / len(self._outcomes) >= getattr(settings, "CATALOG_API_BREAKER_ERROR_RATE", 0.5):
+                self._open(now)
+
+    def record_inconclusive(self):
+        """Note a call cut short by its caller's own deadline, which says nothing about the API.
+
+        It is not counted; a half-open trial ends so the next call can be the trial.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic() - getattr(settings, "CATALOG_API_BREAKER_COOLDOWN", 30)
+
+    def _open(self, now):
+        self._state = self.OPEN
+        self._opened_at = now
+        logger.warning(
+            "Catalog API circuit breaker opened (%d of the last %d calls failed)",
+            sum(1 for _, f in self._outcomes if f), len(self._outcomes),
+        )
+        self._outcomes.clear()
+
+    def state(self):
+        with self._lock:
+            return {
+                "state": self._state,
+                "recent_calls": len(self._outcomes),
+                "recent_failures": sum(1 for _, f in self._outcomes if f),
+                "open_for": None if self._state == self.CLOSED
+                else round(time.monotonic() - self._opened_at, 3),
+                "rejected": self._rejected,
+            }
+
+
+api_breaker = _CircuitBreaker()
+
+
+# --- Per-request time budget ---
+
+
+def set_deadline(request, seconds=None):
+    """Give the Catalog API calls made for *request* *seconds* in total from now.
+
+    Defaults to CATALOG_API_REQUEST_BUDGET. Once the budget is spent, further
+    calls raise ABConnectError(code="DEADLINE_EXCEEDED") without being sent,
+    and calls in flight time out when it runs out.
+    """
+    if seconds is None:
+        seconds = getattr(settings, "CATALOG_API_REQUEST_BUDGET", 15)
+    request.catalog_deadline = time.monotonic() + seconds
+
+
+def remaining_time(request):
+    """Seconds left in *request*'s budget (may be negative), or None if it has none."""
+    deadline = getattr(request, "catalog_deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _deadline_exceeded(detail):
+    return ABConnectError(f"Request deadline exceeded {detail}", code="DEADLINE_EXCEEDED")
+
+
+def api_circuit_state():
+    """Return the Catalog API circuit breaker's state for monitoring.
+
+    {"state": "closed" | "open" | "half_open", "recent_calls": int,
+    "recent_failures": int, "open_for": seconds since it opened (None when
+    closed), "rejected": calls failed fast since start-up or the last reset}
+    """
+    return api_breaker.state()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _new_session():
+    pool_size = getattr(settings, "CATALOG_API_POOL_SIZE", 20)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not getattr(settings, "CATALOG_API_KEEP_ALIVE", True):
+        session.headers["Connection"] = "close"
+    # The session carries every user's calls; a cookie set for one must never reach another.
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_http_session():
+    """Return the process-wide pooled requests.Session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session()
+    return _session
+
+
+def reset_http_session():
+    """Close and drop the shared session (e.g. after fork or a settings change)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+class PooledCatalogRequestHandler(CatalogRequestHandler):
+    """CatalogRequestHandler that sends through the shared pooled session.
+
+    Tokens still come from the handler's own token storage, so refresh and
+    re-login stay scoped to the Django session that built it. *priority*
+    (rate_limit.INTERACTIVE or rate_limit.BACKGROUND) is the limiter class
+    its calls queue in; *request* supplies the time budget set_deadline()
+    put on it.
+    """
+
+    def __init__(self, token_storage, priority=rate_limit.INTERACTIVE, request=None):
+        super().__init__(token_storage)
+        self.priority = priority
+        self.request = request  # whose time budget bounds the calls, if any
+
+    def call(
+        self,
+        method,
+        path,
+        *,
+        params=None,
+        data=None,
+        json=None,
+        headers=None,
+        raw=False,
+        raise_for_status=True,
+    ):
+        request_headers = self._get_auth_headers()
+        if headers:
+            request_headers.update(headers)
+
+        url = f"{self.base_url}{path.lstrip('/')}"
+        logger.debug("Catalog API: %s %s", method.upper(), url)
+
+        connect_timeout = getattr(settings, "CATALOG_API_CONNECT_TIMEOUT", 5)
+        read_timeout = getattr(settings, "CATALOG_API_READ_TIMEOUT", 30)
+        remaining = remaining_time(self.request)
+        if remaining is not None and remaining <= 0:
+            raise _deadline_exceeded(f"before {method.upper()} {path}")
+
+        api_breaker.before_call()
+        permit = rate_limit.acquire(self.priority, wait=remaining)
+        started = time.monotonic()
+        remaining = remaining_time(self.request)
+        budget_bound = remaining is not None and remaining < read_timeout
+        if budget_bound:
+            connect_timeout, read_timeout = min(connect_timeout, remaining), max(0.001, remaining)
+        try:
+            response = get_http_session().request(
+                method=method.upper(),
+                url=url,
+                headers=request_headers,
+                params=params,
+                data=data,
+                json=json,
+                timeout=(max(0.001, connect_timeout), read_timeout),
+            )
+        except Exception as exc:
+            record_api_call(method, path, time.monotonic() - started, type(exc).__name__)
+            if budget_bound and isinstance(exc, requests.Timeout):
+                # Our budget ran out, not the API's patience: no failure, no overload signal
+                api_breaker.record_inconclusive()
+                rate_limit.release(permit, adapt=False)
+                raise _deadline_exceeded(f"during {method.upper()} {path}") from exc
+            api_breaker.record(failed=True)
+            rate_limit.release(permit, overloaded=True)
+            raise
+        latency = time.monotonic() - started
+        record_api_call(method, path, latency, response.status_code)
+        failed = response.status_code >= 500
+        api_breaker.record(failed=failed)
+        rate_limit.release(
+            permit,
+            overloaded=failed or response.status_code == 429,
+            latency=latency,
+        )
+        return self._handle_response(response, raw=raw, raise_for_status=raise_for_status)
+
+
+def detached_request(request):
+    """Return a request-like object for Catalog API work that outlives *request*.
+
+    Background refreshes run after the response has gone out, so they must
+    not use the request's time budget, queue as interactive, or write
+    refreshed tokens into a session that has already been saved. The copy
+    carries only the auth the client needs (the session's token, read now,
+    and the user), no deadline, and background limiter priority.
+    """
+    token = request.session.get("abc_token")
+    return SimpleNamespace(
+        session={"abc_token": dict(token)} if token else {},
+        user=getattr(request, "user", None),
+        catalog_api_priority=rate_limit.BACKGROUND,
+    )
+
+
+def build_catalog_api(request):
+    """Build a CatalogAPI for *request* whose endpoints use a pooled, request-scoped handler.
+
+    Calls queue in the limiter class named by ``request.catalog_api_priority``
+    (interactive unless set, e.g. by the upload worker).
+    """
+    token_storage = SessionTokenStorage(request=request)
+    api = CatalogAPI(token_storage)
+    handler = PooledCatalogRequestHandler(
+        token_storage,
+        priority=getattr(request, "catalog_api_priority", rate_limit.INTERACTIVE),
+        request=request,
+    )
+    api._handler = handler
+    # Instance attributes shadow the class-level handler CatalogAPI just installed
+    for endpoint in (api.catalogs, api.lots, api.sellers, api.bulk):
+        endpoint._handler = handler
+    return api
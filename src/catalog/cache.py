@@ -1,22 +1,505 @@
 import logging
+import threading
+import time
+from collections import OrderedDict
 
+from django.conf import settings
 from django.core.cache import cache
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from catalog.instrumentation import record_cache
 
 logger = logging.getLogger(__name__)
 
 
+# --- Redis circuit breaker ---
+#
+# With Redis down every call waits out SOCKET_CONNECT_TIMEOUT before failing,
+# and a single page touches the cache several times. After
+# CATALOG_REDIS_BREAKER_THRESHOLD consecutive connection failures the breaker
+# opens and every cache call takes the miss/no-op path without touching
+# Redis. Once CATALOG_REDIS_BREAKER_COOLDOWN has passed, the next call starts
+# one background probe (half-open); the breaker closes when the probe
+# succeeds and re-opens for another cooldown when it fails.
+
+REDIS_FAILURES = (RedisConnectionError, RedisTimeoutError, ConnectionInterrupted, OSError)
+BREAKER_PROBE_KEY = "breaker_probe"
+
+
+class CacheUnavailable(Exception):
+    """Raised instead of calling Redis while the circuit breaker is open."""
+
+
+class _CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._short_circuited = 0
+
+    def allow(self):
+        """Return True if a Redis call may go ahead; starts the probe once the cooldown is over."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            self._short_circuited += 1
+            cooldown = getattr(settings, "CATALOG_REDIS_BREAKER_COOLDOWN", 30)
+            if self._state == self.HALF_OPEN or time.monotonic() - self._opened_at < cooldown:
+                return False
+            self._state = self.HALF_OPEN
+        threading.Thread(target=self._probe, name="redis-breaker-probe", daemon=True).start()
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self, exc):
+        """Count *exc* if it means Redis is unreachable; other errors don't trip the breaker."""
+        if not isinstance(exc, REDIS_FAILURES):
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state != self.CLOSED or self._failures < getattr(settings, "CATALOG_REDIS_BREAKER_THRESHOLD", 3):
+                return
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        logger.warning("Redis circuit breaker opened after %d consecutive failures: %s", self._failures, exc)
+
+    def _probe(self):
+        try:
+            cache.get(BREAKER_PROBE_KEY)
+        except Exception as exc:
+            with self._lock:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            logger.warning("Redis circuit breaker probe failed, staying open: %s", exc)
+            return
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+        logger.info("Redis circuit breaker closed; Redis is reachable again")
+
+    def state(self):
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "open_for": None if self._opened_at is None or self._state == self.CLOSED
+                else round(time.monotonic() - self._opened_at, 3),
+                "short_circuited": self._short_circuited,
+            }
+
+
+redis_breaker = _CircuitBreaker()
+
+
+def redis_circuit_state():
+    """Return the Redis circuit breaker's state for monitoring.
+
+    {"state": "closed" | "open" | "half_open", "consecutive_failures": int,
+    "open_for": seconds since it opened (None when closed),
+    "short_circuited": calls skipped since start-up or the last reset}
+    """
+    return redis_breaker.state()
+
+
+def _redis(method, *args):
+    """Call cache.<method>(*args) through the circuit breaker."""
+    if not redis_breaker.allow():
+        raise CacheUnavailable("Redis circuit breaker is open")
+    try:
+        result = getattr(cache, method)(*args)
+    except Exception as exc:
+        redis_breaker.record_failure(exc)
+        raise
+    redis_breaker.record_success()
+    return result
+
+
+def _log_failure(message, *args):
+    """Log a failed cache call; calls skipped by the open breaker are only debug-logged."""
+    exc = args[-1]
+    logger.log(logging.DEBUG if isinstance(exc, CacheUnavailable) else logging.WARNING, message, *args)
+
+
+# --- In-process L1 ---
+#
+# Keys matching CATALOG_L1_CACHE_PREFIXES (the shared seller/event lists) are
+# also kept in a small per-process LRU for CATALOG_L1_CACHE_TTL seconds, so
+# hot reads skip the Redis round-trip. Every write or delete of such a key
+# bumps a generation counter in Redis; each process re-reads that counter at
+# most once per CATALOG_L1_SYNC_INTERVAL and drops its L1 when it changed.
+# Values in L1 are shared between threads, so callers must not mutate them.
+
+L1_GENERATION_KEY = "l1_generation"
+
+
+class _LocalCache:
+    """Bounded LRU of {key: (expires_at, value)}, safe across threads."""
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (found, value)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, key, value, ttl, max_entries):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_l1 = _LocalCache()
+_l1_sync = {"generation": None, "checked_at": 0.0}
+_stats_lock = threading.Lock()
+_stats = {"l1": {"hits": 0, "misses": 0}, "redis": {"hits": 0, "misses": 0}}
+
+
+def _count(tier, hits=0, misses=0):
+    with _stats_lock:
+        _stats[tier]["hits"] += hits
+        _stats[tier]["misses"] += misses
+
+
+def cache_stats():
+    """Return hit/miss counters per tier since start-up (or the last reset)."""
+    with _stats_lock:
+        return {tier: dict(counts) for tier, counts in _stats.items()}
+
+
+def reset_local_cache():
+    """Drop every L1 entry, zero the hit/miss counters and close the Redis breaker."""
+    _l1.clear()
+    redis_breaker.reset()
+    _l1_sync.update(generation=None, checked_at=0.0)
+    with _stats_lock:
+        for counts in _stats.values():
+            counts.update(hits=0, misses=0)
+
+
+def _l1_ttl():
+    return getattr(settings, "CATALOG_L1_CACHE_TTL", 5)
+
+
+def _in_l1(key):
+    prefixes = tuple(getattr(settings, "CATALOG_L1_CACHE_PREFIXES", ()))
+    return _l1_ttl() > 0 and bool(prefixes) and key.startswith(prefixes)
+
+
+def _l1_check_generation():
+    """Clear L1 if another process has written an L1 key since the last check."""
+    now = time.monotonic()
+    if now - _l1_sync["checked_at"] < getattr(settings, "CATALOG_L1_SYNC_INTERVAL", 1.0):
+        return
+    _l1_sync["checked_at"] = now
+    try:
+        generation = _redis("get", L1_GENERATION_KEY)
+    except Exception as exc:
+        # Without Redis nobody else can write either; keep serving L1 until it expires.
+        _log_failure("Cache read failed for key=%s: %s", L1_GENERATION_KEY, exc)
+        return
+    if generation != _l1_sync["generation"]:
+        _l1.clear()
+        _l1_sync["generation"] = generation
+
+
+def _l1_bump_generation():
+    """Tell other processes their L1 copies are out of date."""
+    try:
+        try:
+            generation = _redis("incr", L1_GENERATION_KEY)
+        except ValueError:
+            _redis("add", L1_GENERATION_KEY, 1, None)
+            generation = _redis("get", L1_GENERATION_KEY)
+    except Exception as exc:
+        _log_failure("Cache write failed for key=%s: %s", L1_GENERATION_KEY, exc)
+        return
+    previous = _l1_sync["generation"]
+    if not (isinstance(previous, int) and generation == previous + 1):
+        # Missed someone else's bump in between; our other L1 entries may be stale.
+        _l1.clear()
+    _l1_sync["generation"] = generation
+
+
+def _l1_get(key):
+    _l1_check_generation()
+    found, value = _l1.get(key)
+    _count("l1", hits=int(found), misses=int(not found))
+    return found, value
+
+
+def _l1_set(key, value):
+    _l1.set(key, value, _l1_ttl(), getattr(settings, "CATALOG_L1_CACHE_SIZE", 256))
+
+
 def safe_cache_get(key, default=None):
     """Retrieve from cache. Returns *default* when key is missing or Redis is down."""
+    use_l1 = _in_l1(key)
+    if use_l1:
+        found, value = _l1_get(key)
+        if found:
+            record_cache(hits=1)
+            return value
+    started = time.monotonic()
     try:
-        return cache.get(key, default)
+        value = _redis("get", key, default)
     except Exception as exc:
-        logger.warning("Cache read failed for key=%s: %s", key, exc)
+        record_cache(misses=1, seconds=time.monotonic() - started)
+        _log_failure("Cache read failed for key=%s: %s", key, exc)
         return default
+    hit = value is not default
+    record_cache(hits=int(hit), misses=int(not hit), seconds=time.monotonic() - started)
+    _count("redis", hits=int(hit), misses=int(not hit))
+    if use_l1 and hit:
+        _l1_set(key, value)
+    return value
 
 
 def safe_cache_set(key, value, timeout=None):
     """Store in cache. No-op when Redis is down."""
+    started = time.monotonic()
+    try:
+        _redis("set", key, value, timeout)
+    except Exception as exc:
+        _log_failure("Cache write failed for key=%s: %s", key, exc)
+        return
+    finally:
+        record_cache(sets=1, seconds=time.monotonic() - started)
+    if _in_l1(key):
+        _l1_bump_generation()
+        _l1_set(key, value)
+
+
+def safe_cache_delete(key):
+    """Remove a key from cache. No-op when Redis is down."""
+    if _in_l1(key):
+        _l1.delete(key)
+    started = time.monotonic()
+    try:
+        _redis("delete", key)
+    except Exception as exc:
+        _log_failure("Cache delete failed for key=%s: %s", key, exc)
+        return
+    finally:
+        record_cache(deletes=1, seconds=time.monotonic() - started)
+    if _in_l1(key):
+        _l1_bump_generation()
+
+
+def safe_cache_get_many(keys):
+    """Retrieve several keys in one round-trip (Redis MGET).
+
+    Returns a dict of the keys that were found. Returns {} when Redis is down.
+    Keys held in L1 are answered locally and left out of the MGET.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    result = {}
+    remote = []
+    for key in keys:
+        if _in_l1(key):
+            found, value = _l1_get(key)
+            if found:
+                result[key] = value
+                continue
+        remote.append(key)
+    record_cache(hits=len(result))
+    if not remote:
+        return result
+    started = time.monotonic()
+    try:
+        found = _redis("get_many", remote)
+    except Exception as exc:
+        record_cache(misses=len(remote), seconds=time.monotonic() - started)
+        _log_failure("Cache read failed for %d keys (first=%s): %s", len(remote), remote[0], exc)
+        return result
+    record_cache(hits=len(found), misses=len(remote) - len(found), seconds=time.monotonic() - started)
+    _count("redis", hits=len(found), misses=len(remote) - len(found))
+    for key, value in found.items():
+        if _in_l1(key):
+            _l1_set(key, value)
+    result.update(found)
+    return result
+
+
+def safe_cache_set_many(mapping, timeout=None):
+    """Store several keys in one pipelined round-trip. No-op when Redis is down."""
+    if not mapping:
+        return
+    started = time.monotonic()
+    try:
+        _redis("set_many", mapping, timeout)
+    except Exception as exc:
+        _log_failure("Cache write failed for %d keys: %s", len(mapping), exc)
+        return
+    finally:
+        record_cache(sets=len(mapping), seconds=time.monotonic() - started)
+    local = {key: value for key, value in mapping.items() if _in_l1(key)}
+    if local:
+        _l1_bump_generation()
+        for key, value in local.items():
+            _l1_set(key, value)
+
+
+# --- Stale-while-revalidate entries ---
+#
+# SWR entries are stored as {"__swr__": 1, "value": ..., "fresh_until": ts,
+# "expires_at": ts}. Redis evicts the key at the hard TTL; between the soft
+# and hard TTL the value is still served but callers kick off a background
+# refresh. Only the worker that wins the refresh lock refetches, and on a
+# hard miss the other workers wait for its result (swr_fill) instead of all
+# calling the Catalog API at once.
+
+SWR_LOCK_KEY_PREFIX = "swr_lock_"
+SWR_FILL_POLL_INTERVAL = 0.05  # seconds between checks while another worker fills a key
+
+
+def _swr_ttls(soft_ttl, hard_ttl):
+    if soft_ttl is None:
+        soft_ttl = getattr(settings, "CATALOG_CACHE_SOFT_TTL", 300)
+    if hard_ttl is None:
+        hard_ttl = getattr(settings, "CATALOG_CACHE_HARD_TTL", 86400)
+    return soft_ttl, max(hard_ttl, soft_ttl)
+
+
+def swr_wrap(value, soft_ttl=None, hard_ttl=None):
+    """Wrap *value* in an SWR entry that is fresh for *soft_ttl* seconds."""
+    soft_ttl, hard_ttl = _swr_ttls(soft_ttl, hard_ttl)
+    now = time.time()
+    return {
+        "__swr__": 1,
+        "value": value,
+        "fresh_until": now + soft_ttl,
+        "expires_at": now + hard_ttl,
+    }
+
+
+def swr_unwrap(entry):
+    """Return (value, is_stale) for a cached SWR entry.
+
+    A missing entry returns (None, False). Values written before SWR entries
+    existed are served but reported stale so they get refreshed.
+    """
+    if entry is None:
+        return None, False
+    if not (isinstance(entry, dict) and entry.get("__swr__")):
+        return entry, True
+    return entry["value"], time.time() >= entry["fresh_until"]
+
+
+def swr_version(entry):
+    """Return a value that changes whenever *entry* is rewritten (its fresh_until), or None.
+
+    Lets callers reuse work derived from a cached value across requests,
+    where the value itself is a new object after every cache read.
+    """
+    if isinstance(entry, dict) and entry.get("__swr__"):
+        return entry["fresh_until"]
+    return None
+
+
+def swr_set(key, value, soft_ttl=None, hard_ttl=None):
+    """Store *value* under *key* as an SWR entry expiring at the hard TTL."""
+    soft_ttl, hard_ttl = _swr_ttls(soft_ttl, hard_ttl)
+    safe_cache_set(key, swr_wrap(value, soft_ttl, hard_ttl), hard_ttl)
+
+
+def _acquire_refresh_lock(lock_key):
+    """Take the per-key refresh lock. Returns True, False (held elsewhere), or None (Redis down)."""
+    lock_ttl = getattr(settings, "CATALOG_CACHE_REFRESH_LOCK_TTL", 60)
     try:
-        cache.set(key, value, timeout)
+        return bool(_redis("add", lock_key, 1, lock_ttl))
     except Exception as exc:
-        logger.warning("Cache write failed for key=%s: %s", key, exc)
+        _log_failure("Cache lock failed for key=%s: %s", lock_key, exc)
+        return None
+
+
+def swr_fill(key, loader, soft_ttl=None, hard_ttl=None, wait=None):
+    """Load a missing SWR entry once across the cluster and return its value.
+
+    The worker that takes the refresh lock runs *loader* and stores the
+    result; the others poll until the lock is released (at most *wait*
+    seconds) and then read what it stored. A waiter that times out, or finds
+    nothing once the lock is gone, runs *loader* itself. When Redis is down
+    there is nothing to coordinate through, so *loader* just runs.
+    """
+    lock_key = f"{SWR_LOCK_KEY_PREFIX}{key}"
+    acquired = _acquire_refresh_lock(lock_key)
+    if acquired is None:
+        return loader()
+    if acquired:
+        try:
+            value = loader()
+            swr_set(key, value, soft_ttl, hard_ttl)
+            return value
+        finally:
+            safe_cache_delete(lock_key)
+
+    if wait is None:
+        wait = getattr(settings, "CATALOG_CACHE_FILL_WAIT", 5.0)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(SWR_FILL_POLL_INTERVAL)
+        if safe_cache_get(lock_key) is None:
+            value, _ = swr_unwrap(safe_cache_get(key))
+            if value is not None:
+                return value
+            break
+    logger.info("No shared result for key=%s after waiting; loading it here", key)
+    value = loader()
+    swr_set(key, value, soft_ttl, hard_ttl)
+    return value
+
+
+def swr_refresh(key, loader, soft_ttl=None, hard_ttl=None):
+    """Refetch *key* with *loader* in a background thread (single-flight).
+
+    Takes a short-lived lock with an atomic cache.add so only one worker across
+    the cluster refreshes a given key. Returns True if this call started the
+    refresh, False if another worker holds the lock or Redis is unavailable.
+    """
+    lock_key = f"{SWR_LOCK_KEY_PREFIX}{key}"
+    if not _acquire_refresh_lock(lock_key):
+        return False
+
+    def run():
+        try:
+            swr_set(key, loader(), soft_ttl, hard_ttl)
+        except Exception:
+            logger.exception("Background refresh failed for key=%s", key)
+        finally:
+            safe_cache_delete(lock_key)
+
+    threading.Thread(target=run, name=f"swr-refresh-{key}", daemon=True).start()
+    return True
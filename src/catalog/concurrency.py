@@ -0,0 +1,277 @@
+"""Bounded-concurrency helpers for fanning out Catalog API calls.
+
+The Catalog API has no batch endpoints, so a view that needs N records
+issues N calls. fan_out() runs them on a small thread pool with a
+concurrency limit and an overall deadline, and returns results in input
+order so callers can treat it as a drop-in for a list comprehension.
+call_with_retry() wraps a single call with exponential backoff for
+transient failures. fetch_all_pages() uses fan_out() to read every page of
+a paginated listing once the first page has reported the page count.
+run_graph() runs calls that depend on each other's results, starting each
+one as soon as its inputs are available. hedged_call() re-issues a slow
+idempotent read and takes whichever copy answers first, with the hedge
+delay taken from the latency percentiles LatencyTracker keeps per call type.
+Pool threads run in a copy of the caller's context, so per-request metrics
+(catalog.instrumentation) follow the work onto them.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+from catalog.instrumentation import in_context
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a fan-out does not finish inside its deadline."""
+
+
+def _default_max_workers():
+    return getattr(settings, "CATALOG_API_MAX_WORKERS", 8)
+
+
+def _default_timeout():
+    return getattr(settings, "CATALOG_API_FANOUT_TIMEOUT", 20.0)
+
+
+def fan_out(func, items, max_workers=None, timeout=None):
+    """Call ``func(item)`` for every item and return the results in input order.
+
+    At most *max_workers* calls run at once. If the whole batch has not
+    finished after *timeout* seconds, pending calls are cancelled and
+    DeadlineExceeded is raised. If any call raises, the first failure (in
+    input order) is re-raised and the remaining work is cancelled.
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    if timeout is None:
+        timeout = _default_timeout()
+
+    if len(items) <= 1 or max_workers <= 1:
+        deadline = time.monotonic() + timeout
+        results = []
+        for item in items:
+            if time.monotonic() > deadline:
+                raise DeadlineExceeded(
+                    f"Fan-out exceeded {timeout}s after {len(results)} of {len(items)} calls"
+                )
+            results.append(func(item))
+        return results
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)),
+        thread_name_prefix="catalog-fanout",
+    )
+    try:
+        futures = [executor.submit(in_context(func), item) for item in items]
+        done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            if future in done and future.exception() is not None:
+                raise future.exception()
+        if not_done:
+            raise DeadlineExceeded(
+                f"Fan-out exceeded {timeout}s with {len(not_done)} of {len(items)} calls pending"
+            )
+        return [future.result() for future in futures]
+    finally:
+        # Don't block the caller on stragglers once we have an answer or gave up.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def call_with_retry(func, attempts=3, backoff=0.5, retry_on=lambda exc: True):
+    """Call ``func()`` and retry it when it raises a retryable exception.
+
+    Makes up to *attempts* calls in total, sleeping *backoff* seconds before
+    the first retry and doubling the delay each time. Exceptions for which
+    ``retry_on(exc)`` is false, and the final failure, propagate unchanged.
+    """
+    delay = backoff
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except Exception as exc:
+            if attempt >= attempts or not retry_on(exc):
+                raise
+            logger.info("Retrying after attempt %d/%d failed: %s", attempt, attempts, exc)
+            time.sleep(delay)
+            delay *= 2
+
+
+def fetch_all_pages(fetch_page, max_workers=None, timeout=None, max_pages=None):
+    """Return the items of every page of a paginated listing, in page order.
+
+    ``fetch_page(page_number)`` must return a *PaginatedList (``items``,
+    ``total_pages``, ``has_next_page``). Page 1 is fetched first; once it
+    reports ``total_pages`` the remaining pages are fetched concurrently with
+    fan_out(). Listings that do not report a page count are followed
+    sequentially via ``has_next_page``. With *max_pages*, pages after that
+    one are not read.
+    """
+    first = fetch_page(1)
+    items = list(first.items)
+    total_pages = getattr(first, "total_pages", None)
+
+    if isinstance(total_pages, int):
+        if max_pages is not None:
+            total_pages = min(total_pages, max_pages)
+        for page in fan_out(fetch_page, range(2, total_pages + 1), max_workers, timeout):
+            items.extend(page.items)
+        return items
+
+    page, result = 1, first
+    while getattr(result, "has_next_page", False) and (max_pages is None or page < max_pages):
+        page += 1
+        result = fetch_page(page)
+        items.extend(result.items)
+    return items
+
+
+def run_graph(tasks, max_workers=None, timeout=None):
+    """Run a dependency graph of calls, each as soon as its inputs are ready.
+
+    *tasks* maps a name to ``(func, deps)``; ``func`` is called with the
+    results of *deps* as positional arguments, in order. Independent tasks run
+    concurrently (at most *max_workers* at once). A task whose dependency
+    failed is skipped, and one still pending after *timeout* seconds fails
+    with DeadlineExceeded.
+
+    Returns ``(results, errors, timings)``: results and exceptions by task
+    name, and each task's wall time in seconds. Skipped tasks appear in none
+    of them.
+    """
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    if timeout is None:
+        timeout = _default_timeout()
+    for name, (_, deps) in tasks.items():
+        unknown = [dep for dep in deps if dep not in tasks]
+        if unknown:
+            raise ValueError(f"Task {name!r} depends on unknown tasks {unknown}")
+
+    results, errors, timings = {}, {}, {}
+    waiting = dict(tasks)
+    running = {}
+    deadline = time.monotonic() + timeout
+
+    def timed(name, func, args):
+        start = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            timings[name] = time.monotonic() - start
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="catalog-graph")
+    try:
+        while waiting or running:
+            pending = set(waiting) | set(running.values())
+            for name, (func, deps) in list(waiting.items()):
+                if all(dep in results for dep in deps):
+                    del waiting[name]
+                    args = [results[dep] for dep in deps]
+                    running[executor.submit(in_context(timed), name, func, args)] = name
+                elif any(dep not in results and dep not in pending for dep in deps):
+                    del waiting[name]  # a dependency failed or was skipped
+                    pending.discard(name)
+            if not running:
+                break
+            done, _ = wait(running, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                for future, name in running.items():
+                    future.cancel()
+                    errors[name] = DeadlineExceeded(f"Task {name!r} did not finish within {timeout}s")
+                running.clear()
+                continue
+            for future in done:
+                name = running.pop(future)
+                if future.exception() is not None:
+                    errors[name] = future.exception()
+                else:
+                    results[name] = future.result()
+        return results, errors, timings
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LatencyTracker:
+    """Recent latencies per call type, for choosing hedge delays.
+
+    Keeps the last *window* successful latencies of each call type and
+    reports a percentile once at least *min_samples* are in.
+    """
+
+    def __init__(self, window=200, min_samples=20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, name, q=0.95):
+        """Return the *q* latency percentile of *name* in seconds, or None if too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+def hedged_call(func, hedge_after=None, timeout=None, on_latency=None):
+    """Call ``func()``, sending a second copy if the first is still running after *hedge_after* seconds.
+
+    Returns the first successful result. A failure is only raised once both
+    copies have failed (or the first failed before the hedge was sent). If
+    no copy succeeds within *timeout* seconds, DeadlineExceeded is raised
+    and the caller stops waiting. *on_latency* is called with the duration
+    of every copy that succeeds, including one that lost the race, so slow
+    answers still count towards the next hedge delay. *func* must be safe to
+    run twice. Without *hedge_after* it runs once on the calling thread.
+    """
+    def attempt():
+        start = time.monotonic()
+        result = func()
+        if on_latency is not None:
+            on_latency(time.monotonic() - start)
+        return result
+
+    if hedge_after is None:
+        return attempt()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def left():
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="catalog-hedge")
+    try:
+        pending = {executor.submit(in_context(attempt))}
+        first_wait = hedge_after if deadline is None else min(hedge_after, left())
+        done, _ = wait(pending, timeout=first_wait)
+        if not done and (deadline is None or left() > 0):
+            logger.debug("Hedging call after %.3fs without an answer", hedge_after)
+            pending.add(executor.submit(in_context(attempt)))
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=left(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"Hedged call did not finish within {timeout}s")
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        raise error
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def uploads(request):
+    """Upload limits the dropzone script in base.html enforces client-side."""
+    max_size = settings.CATALOG_MAX_UPLOAD_SIZE
+    return {
+        "upload_max_size": max_size,
+        "upload_max_size_mb": max_size // 1048576,
+        "upload_max_poll_seconds": getattr(settings, "UPLOAD_JOB_MAX_POLL", 3600),
+    }
@@ -2,13 +2,20 @@
 
 Adapted from ABConnectTools examples/catalog.py.
 Transforms flat spreadsheet rows into nested BulkInsertRequest for the Catalog API.
+
+Files are read one row at a time (csv.DictReader, openpyxl read-only mode,
+incremental JSON array decoding) so memory stays flat regardless of file
+size; iter_bulk_requests() additionally emits the result in lot-count chunks.
 """
 
+import csv
+import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
+from collections.abc import Iterator
 
-from ABConnect import FileLoader
+import openpyxl
 from ABConnect.api.models.catalog import (
     BulkInsertRequest,
     BulkInsertCatalogRequest,
@@ -28,6 +35,10 @@ DEFAULT_AGENT = "DLC"
 IMAGE_URL_TEMPLATE = "https://s3.amazonaws.com/static2.liveauctioneers.com/{house_id}/{catalog_id}/{lot_id}_1_m.jpg"
 
 SUPPORTED_EXTENSIONS = {".xlsx", ".csv", ".json"}
+DEFAULT_CHUNK_LOTS = 500
+
+_ENCODING_SAMPLE_SIZE = 1 << 16
+_JSON_READ_SIZE = 1 << 16
 
 
 # =============================================================================
@@ -117,6 +128,12 @@ class CatalogDataBuilder:
         self.catalogs_data: dict[int, dict] = {}
         self.catalog_sellers: dict[int, dict[int, dict]] = defaultdict(dict)
         self.catalog_lots: dict[int, list] = defaultdict(list)
+        self.lot_counts: dict[int, int] = defaultdict(int)
+
+    @property
+    def pending_lots(self) -> int:
+        """Number of lots added since the last flush()."""
+        return sum(len(lots) for lots in self.catalog_lots.values())
 
     def add_row(self, row: dict) -> None:
         """Process a single spreadsheet row."""
@@ -196,12 +213,31 @@ class CatalogDataBuilder:
         )
 
         self.catalog_lots[catalog_id].append(lot)
+        self.lot_counts[catalog_id] += 1
 
     def build(self) -> BulkInsertRequest:
         """Build final BulkInsertRequest."""
+        return self._build(self.catalogs_data)
+
+    def flush(self) -> BulkInsertRequest | None:
+        """Build a request from the lots added since the last flush and drop them.
+
+        Catalog and seller metadata is kept, so every chunk carries its
+        catalog header and the sellers seen so far. Returns None if no lots
+        are pending.
+        """
+        pending = [cid for cid in self.catalogs_data if self.catalog_lots.get(cid)]
+        if not pending:
+            return None
+        request = self._build(pending)
+        self.catalog_lots.clear()
+        return request
+
+    def _build(self, catalog_ids) -> BulkInsertRequest:
         catalogs = []
 
-        for catalog_id, cat_data in self.catalogs_data.items():
+        for catalog_id in catalog_ids:
+            cat_data = self.catalogs_data[catalog_id]
             sellers = [
                 BulkInsertSellerRequest(**s)
                 for s in self.catalog_sellers[catalog_id].values()
@@ -225,12 +261,124 @@ class CatalogDataBuilder:
         lines = [f"Catalogs: {len(self.catalogs_data)}"]
         for catalog_id, cat_data in self.catalogs_data.items():
             sellers = len(self.catalog_sellers[catalog_id])
-            lots = len(self.catalog_lots[catalog_id])
+            lots = self.lot_counts[catalog_id]
             lines.append(f"  {catalog_id}: {cat_data['title'][:40]}")
             lines.append(f"    Sellers: {sellers}, Lots: {lots}")
         return "\n".join(lines)
 
 
+# =============================================================================
+# Row Readers
+# =============================================================================
+
+
+def _detect_encoding(path: Path) -> str:
+    """Pick utf-8 (BOM-tolerant) if the head of the file decodes, else cp1252."""
+    with open(path, "rb") as f:
+        sample = f.read(_ENCODING_SAMPLE_SIZE)
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is still utf-8
+        if e.start < len(sample) - 3:
+            return "cp1252"
+    return "utf-8-sig"
+
+
+def _iter_csv_rows(path: Path) -> Iterator[dict]:
+    with open(path, newline="", encoding=_detect_encoding(path), errors="replace") as f:
+        yield from csv.DictReader(f)
+
+
+def _iter_xlsx_rows(path: Path) -> Iterator[dict]:
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        for row in rows:
+            # Read-only mode yields formatted-but-empty trailing rows
+            if all(value is None for value in row):
+                continue
+            yield dict(zip(headers, row))
+    finally:
+        workbook.close()
+
+
+def _iter_json_rows(path: Path) -> Iterator[dict]:
+    """Yield the objects of a top-level JSON array without loading the whole document."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8-sig") as f:
+        buf = f.read(_JSON_READ_SIZE).lstrip()
+        if not buf.startswith("["):
+            raise ValueError("JSON file must contain a top-level array of rows")
+        pos = 1
+        expect_value = True
+        after_comma = False
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos == len(buf):
+                buf, pos = f.read(_JSON_READ_SIZE), 0
+                if not buf:
+                    raise ValueError("Unexpected end of JSON file")
+                continue
+
+            char = buf[pos]
+            if char == "]":
+                if after_comma:
+                    raise ValueError("Trailing ',' before ']' in JSON array")
+                rest = buf[pos + 1:]
+                while not rest.strip():
+                    rest = f.read(_JSON_READ_SIZE)
+                    if not rest:
+                        return
+                raise ValueError(f"Unexpected data after JSON array: {rest.strip()[:20]!r}")
+            if not expect_value:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                pos += 1
+                expect_value = True
+                after_comma = True
+                continue
+
+            read_size = _JSON_READ_SIZE
+            while True:
+                try:
+                    row, pos = decoder.raw_decode(buf, pos)
+                    break
+                except json.JSONDecodeError:
+                    # Value spans the buffer boundary; read more (doubling, so a
+                    # malformed file costs linear rather than quadratic time)
+                    more = f.read(read_size)
+                    if not more:
+                        raise
+                    buf, pos = buf[pos:] + more, 0
+                    read_size *= 2
+            if not isinstance(row, dict):
+                raise ValueError(f"JSON rows must be objects, got {type(row).__name__}")
+            yield row
+            expect_value = False
+            after_comma = False
+
+
+_ROW_READERS = {
+    ".csv": _iter_csv_rows,
+    ".xlsx": _iter_xlsx_rows,
+    ".json": _iter_json_rows,
+}
+
+
+def iter_rows(path: str | Path) -> Iterator[dict]:
+    """Yield spreadsheet rows as dicts keyed by header, one at a time."""
+    path = Path(path)
+    reader = _ROW_READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f"Unsupported file type: {path.suffix.lower()}")
+    return reader(path)
+
+
 # =============================================================================
 # Public API
 # =============================================================================
@@ -247,17 +395,37 @@ def load_file(path: str | Path, agent: str = DEFAULT_AGENT) -> tuple[BulkInsertR
         Tuple of (BulkInsertRequest, human-readable summary)
     """
     path = Path(path)
-    data = FileLoader(path.as_posix()).data
-
     builder = CatalogDataBuilder(agent=agent)
-    for row in data:
+    rows = 0
+    for row in iter_rows(path):
         builder.add_row(row)
+        rows += 1
 
     request = builder.build()
-    summary = f"File: {path.name} ({len(data)} rows)\n{builder.summary()}"
+    summary = f"File: {path.name} ({rows} rows)\n{builder.summary()}"
     return request, summary
 
 
+def iter_bulk_requests(
+    path: str | Path,
+    agent: str = DEFAULT_AGENT,
+    chunk_lots: int = DEFAULT_CHUNK_LOTS,
+) -> Iterator[BulkInsertRequest]:
+    """Stream a spreadsheet as BulkInsertRequests of at most *chunk_lots* lots each.
+
+    Only one chunk of lot models is held in memory at a time. Every chunk
+    repeats the header of each catalog it contains lots for.
+    """
+    builder = CatalogDataBuilder(agent=agent)
+    for row in iter_rows(path):
+        builder.add_row(row)
+        if builder.pending_lots >= chunk_lots:
+            yield builder.flush()
+    request = builder.flush()
+    if request is not None:
+        yield request
+
+
 def list_import_files(directory: str | Path) -> list[Path]:
     """List importable files in a directory."""
     directory = Path(directory)
@@ -0,0 +1,157 @@
+"""Per-request counters for Catalog API calls and cache traffic.
+
+RequestMetricsMiddleware binds a RequestMetrics to the current context for
+the length of each request. The API client records every call it sends
+(endpoint, duration, status) and catalog.cache records every get/set with
+its hit/miss outcome and duration; MeasuringPickleSerializer adds the bytes
+that actually went over the wire to Redis. When the response goes out, the
+totals are added to its Server-Timing header and logged as one JSON line.
+
+Work started on the fan-out, graph and hedge thread pools in
+catalog.concurrency runs in a copy of the submitting context, so calls made
+there are counted against the request that started them. Outside a request
+(the upload worker, management commands, background SWR refreshes) nothing
+is bound and recording is a no-op.
+"""
+
+import contextvars
+import re
+import threading
+from collections import defaultdict
+
+from django_redis.serializers.pickle import PickleSerializer
+
+_current = contextvars.ContextVar("catalog_request_metrics", default=None)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(method, path):
+    """Return "GET /Lot/{id}" for ("get", "/Lot/123?x=1"), so calls group by endpoint."""
+    path = "/" + path.split("?", 1)[0].lstrip("/")
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+class RequestMetrics:
+    """API calls and cache operations made while serving one request. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.api = defaultdict(lambda: {"calls": 0, "errors": 0, "seconds": 0.0, "statuses": defaultdict(int)})
+        self.cache = {
+            "gets": 0, "hits": 0, "misses": 0, "sets": 0, "deletes": 0,
+            "seconds": 0.0, "bytes_read": 0, "bytes_written": 0,
+        }
+
+    def record_api_call(self, endpoint, seconds, status):
+        """Count one API call. *status* is the HTTP status code or an exception class name."""
+        failed = not isinstance(status, int) or status >= 400
+        with self._lock:
+            entry = self.api[endpoint]
+            entry["calls"] += 1
+            entry["errors"] += int(failed)
+            entry["seconds"] += seconds
+            entry["statuses"][str(status)] += 1
+
+    def record_cache(self, hits=0, misses=0, sets=0, deletes=0, seconds=0.0, bytes_read=0, bytes_written=0):
+        """Count cache operations; a get is recorded as its hit or miss."""
+        with self._lock:
+            self.cache["gets"] += hits + misses
+            self.cache["hits"] += hits
+            self.cache["misses"] += misses
+            self.cache["sets"] += sets
+            self.cache["deletes"] += deletes
+            self.cache["seconds"] += seconds
+            self.cache["bytes_read"] += bytes_read
+            self.cache["bytes_written"] += bytes_written
+
+    def summary(self):
+        """Return the totals as a JSON-serialisable dict."""
+        with self._lock:
+            endpoints = {
+                name: {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "ms": round(entry["seconds"] * 1000, 1),
+                    "statuses": dict(entry["statuses"]),
+                }
+                for name, entry in sorted(self.api.items())
+            }
+            cache = dict(self.cache)
+        return {
+            "api": {
+                "calls": sum(e["calls"] for e in endpoints.values()),
+                "errors": sum(e["errors"] for e in endpoints.values()),
+                "ms": round(sum(e["ms"] for e in endpoints.values()), 1),
+                "endpoints": endpoints,
+            },
+            "cache": {
+                "gets": cache["gets"],
+                "hits": cache["hits"],
+                "misses": cache["misses"],
+                "sets": cache["sets"],
+                "deletes": cache["deletes"],
+                "ms": round(cache["seconds"] * 1000, 1),
+                "bytes_read": cache["bytes_read"],
+                "bytes_written": cache["bytes_written"],
+            },
+        }
+
+    def server_timing(self):
+        """Return Server-Timing entries for the API and cache totals."""
+        totals = self.summary()
+        api, cache = totals["api"], totals["cache"]
+        return [
+            f'api;dur={api["ms"]};desc="{api["calls"]} calls, {api["errors"]} errors"',
+            f'cache;dur={cache["ms"]};desc="{cache["hits"]} hits, {cache["misses"]} misses, '
+            f'{cache["sets"]} sets, {cache["bytes_read"] + cache["bytes_written"]} bytes"',
+        ]
+
+
+def current():
+    """Return the RequestMetrics bound to this context, or None outside a request."""
+    return _current.get()
+
+
+def bind(metrics):
+    """Make *metrics* the current RequestMetrics; returns a token for unbind()."""
+    return _current.set(metrics)
+
+
+def unbind(token):
+    _current.reset(token)
+
+
+def record_api_call(method, path, seconds, status):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_api_call(endpoint_name(method, path), seconds, status)
+
+
+def record_cache(**counts):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_cache(**counts)
+
+
+def in_context(func):
+    """Wrap *func* to run in a copy of the caller's context (for thread pool submissions)."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+
+    return run
+
+
+class MeasuringPickleSerializer(PickleSerializer):
+    """django-redis pickle serializer that counts payload bytes against the current request."""
+
+    def dumps(self, value):
+        data = super().dumps(value)
+        record_cache(bytes_written=len(data))
+        return data
+
+    def loads(self, value):
+        record_cache(bytes_read=len(value))
+        return super().loads(value)
@@ -0,0 +1,347 @@
+"""Background catalog upload jobs.
+
+upload_catalog saves the uploaded file, records a job in Redis and pushes the
+job id onto a Redis list, then returns immediately. The run_upload_worker
+management command pops job ids and runs process_upload() on behalf of the
+uploader's session, publishing progress counters that the dropzone polls via
+the upload_job_status view.
+
+While a job runs, the worker refreshes its ``heartbeat_at`` every
+UPLOAD_JOB_HEARTBEAT_INTERVAL seconds. upload_job_status reports a job as
+failed once it has waited UPLOAD_JOB_QUEUE_TIMEOUT seconds without a worker
+picking it up, or its worker has missed heartbeats for
+UPLOAD_JOB_STALL_TIMEOUT seconds (it crashed or was killed mid-job).
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from importlib import import_module
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.urls import reverse
+
+from catalog import rate_limit, services
+from catalog.cache import safe_cache_get, safe_cache_set
+from catalog.importers import DEFAULT_CHUNK_LOTS, iter_bulk_requests, load_file
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_JOB_KEY_PREFIX = "upload_job_"
+UPLOAD_JOB_QUEUE_KEY = "cat_upload_jobs_queue"  # raw Redis list, outside Django's key prefixing
+UPLOAD_JOB_TTL = 86400  # 24 hours
+PROGRESS_FLUSH_INTERVAL = 1.0  # seconds between progress writes to Redis
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+def _job_key(job_id):
+    return f"{UPLOAD_JOB_KEY_PREFIX}{job_id}"
+
+
+def _now():
+    return datetime.now(tz=timezone.utc).isoformat()
+
+
+def _empty_progress():
+    return {"added": 0, "updated": 0, "unchanged": 0, "failed": 0, "total": 0}
+
+
+def _queue_connection():
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def get_job(job_id):
+    """Return the stored job dict, or None if unknown/expired or Redis is down."""
+    return safe_cache_get(_job_key(job_id))
+
+
+def _save_job(job):
+    safe_cache_set(_job_key(job["id"]), job, UPLOAD_JOB_TTL)
+
+
+def _seconds_since(timestamp):
+    if not timestamp:
+        return None
+    return (datetime.now(tz=timezone.utc) - datetime.fromisoformat(timestamp)).total_seconds()
+
+
+def expire_stalled(job):
+    """Mark *job* failed if no worker picked it up in time or its worker stopped heartbeating.
+
+    Returns the (possibly updated) job.
+    """
+    if job["status"] == JOB_QUEUED:
+        age = _seconds_since(job.get("created_at"))
+        limit = getattr(settings, "UPLOAD_JOB_QUEUE_TIMEOUT", 300)
+        error = "No upload worker picked up the job. Please try again later."
+    elif job["status"] == JOB_RUNNING:
+        age = _seconds_since(job.get("heartbeat_at") or job.get("started_at"))
+        limit = getattr(settings, "UPLOAD_JOB_STALL_TIMEOUT", 120)
+        error = "The upload worker stopped responding. Check the catalog before uploading again."
+    else:
+        return job
+    if age is None or age < limit:
+        return job
+    logger.warning("Upload job %s %s for %.0fs; marking it failed", job["id"], job["status"], age)
+    job = {**job, "status": JOB_FAILED, "result": {"success": False, "error": error}, "finished_at": _now()}
+    _save_job(job)
+    return job
+
+
+def public_job(job):
+    """Project a job dict to the fields exposed by the polling endpoint."""
+    data = {
+        "job_id": job["id"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "progress": job["progress"],
+    }
+    if job["status"] in FINISHED_STATUSES:
+        data["result"] = job.get("result")
+    return data
+
+
+def enqueue_upload(request, file_path, filename):
+    """Record a queued job for *file_path* and push it onto the worker queue.
+
+    Unlike the safe_cache_* helpers this raises when Redis is unavailable —
+    a job that cannot be recorded must not be acknowledged to the user.
+    """
+    job = {
+        "id": uuid.uuid4().hex,
+        "status": JOB_QUEUED,
+        "filename": filename,
+        "file_path": str(file_path),
+        "username": request.session.get("abc_username"),
+        "session_key": request.session.session_key,
+        "progress": _empty_progress(),
+        "result": None,
+        "created_at": _now(),
+    }
+    cache.set(_job_key(job["id"]), job, UPLOAD_JOB_TTL)
+    _queue_connection().lpush(UPLOAD_JOB_QUEUE_KEY, job["id"])
+    return job
+
+
+def next_job_id(timeout=5):
+    """Block up to *timeout* seconds for the next queued job id. Returns None on timeout."""
+    item = _queue_connection().brpop(UPLOAD_JOB_QUEUE_KEY, timeout=timeout)
+    if item is None:
+        return None
+    _, job_id = item
+    return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+
+def _job_request(job):
+    """Build a request-like object carrying the uploader's session and user.
+
+    services.* only needs ``request.session`` (API token, username) and
+    ``request.user``; token refreshes are written back to the same session.
+    Its Catalog API calls queue as background work behind interactive ones.
+    """
+    store_cls = import_module(settings.SESSION_ENGINE).SessionStore
+    session = store_cls(session_key=job["session_key"])
+    user = User.objects.filter(username=job["username"]).first() or AnonymousUser()
+    return SimpleNamespace(
+        session=session, user=user, GET={}, POST={}, META={},
+        catalog_api_priority=rate_limit.BACKGROUND,
+    )
+
+
+class _ProgressTracker:
+    """Thread-safe progress sink that flushes to Redis at most once per interval."""
+
+    def __init__(self, job):
+        self.job = job
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def update(self, progress):
+        with self._lock:
+            self.job["progress"] = dict(progress)
+            now = time.monotonic()
+            if now - self._last_flush < PROGRESS_FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+            self.job["heartbeat_at"] = _now()
+            _save_job(self.job)
+
+    def heartbeat(self):
+        """Record that the worker is still alive, even if progress has not moved."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            self.job["heartbeat_at"] = _now()
+            _save_job(self.job)
+
+
+def _run_heartbeat(tracker, stop):
+    interval = getattr(settings, "UPLOAD_JOB_HEARTBEAT_INTERVAL", 15)
+    while not stop.wait(interval):
+        tracker.heartbeat()
+
+
+def run_upload_job(job_id):
+    """Execute one queued upload job and store its final result."""
+    job = get_job(job_id)
+    if job is None:
+        logger.warning("Upload job %s not found (expired or Redis down)", job_id)
+        return None
+    if job["status"] in FINISHED_STATUSES:
+        # Already reported failed to the uploader (nobody picked it up in time).
+        logger.warning("Upload job %s was already %s; skipping", job_id, job["status"])
+        Path(job["file_path"]).unlink(missing_ok=True)
+        return job
+
+    job["status"] = JOB_RUNNING
+    job["started_at"] = job["heartbeat_at"] = _now()
+    _save_job(job)
+
+    tracker = _ProgressTracker(job)
+    file_path = Path(job["file_path"])
+    request = _job_request(job)
+    stop_heartbeat = threading.Event()
+    heartbeat = threading.Thread(
+        target=_run_heartbeat, args=(tracker, stop_heartbeat), name=f"upload-heartbeat-{job_id}", daemon=True,
+    )
+    heartbeat.start()
+    try:
+        payload, status = process_upload(request, file_path, on_progress=tracker.update)
+    except Exception as e:
+        logger.exception("Upload job %s crashed", job_id)
+        payload, status = {"success": False, "error": f"Upload failed: {e}"}, 500
+    finally:
+        stop_heartbeat.set()
+        heartbeat.join()  # so a late heartbeat cannot overwrite the final status
+        file_path.unlink(missing_ok=True)
+        if request.session.modified:
+            request.session.save()
+
+    job = tracker.job
+    job["status"] = JOB_SUCCEEDED if payload.get("success") else JOB_FAILED
+    job["result"] = payload
+    job["http_status"] = status
+    job["finished_at"] = _now()
+    _save_job(job)
+    return job
+
+
+def _scan_upload(file_path, chunk_lots):
+    """Parse the whole file once without keeping it, so a bad row fails the
+    upload before anything is written. Returns (first customer_catalog_id, lot count).
+    """
+    customer_catalog_id = None
+    total = 0
+    for chunk in iter_bulk_requests(file_path, chunk_lots=chunk_lots):
+        if customer_catalog_id is None:
+            customer_catalog_id = chunk.catalogs[0].customer_catalog_id
+        total += sum(len(c.lots) for c in chunk.catalogs)
+    return customer_catalog_id, total
+
+
+def process_upload(request, file_path, on_progress=None):
+    """Parse an uploaded catalog file and merge or bulk-insert it.
+
+    New catalogs are streamed into the API in CATALOG_IMPORT_CHUNK_LOTS-sized
+    BulkInsertRequests; only the merge path needs the whole file in memory.
+
+    Returns ``(payload, status)`` where *payload* is the JSON body the
+    dropzone expects and *status* the HTTP status it corresponds to.
+    """
+    chunk_lots = getattr(settings, "CATALOG_IMPORT_CHUNK_LOTS", DEFAULT_CHUNK_LOTS)
+    try:
+        customer_catalog_id, total = _scan_upload(file_path, chunk_lots)
+    except Exception as e:
+        return {"success": False, "error": f"Failed to parse file: {e}"}, 400
+
+    if customer_catalog_id is None:
+        return {"success": False, "error": "File contains no catalog data"}, 400
+
+    # Check if catalog already exists — merge path
+    existing_catalog_id = services.find_catalog_by_customer_id(request, customer_catalog_id)
+    if existing_catalog_id:
+        # A merge diffs the whole file against the event: duplicates are
+        # resolved file-wide, and the server lots / fingerprint map are read
+        # once and stored back only after a clean run. Merging chunk by chunk
+        # would refetch the event per chunk and store partial maps, so this
+        # path still loads the file whole.
+        try:
+            bulk_request, _ = load_file(file_path)
+        except Exception as e:
+            return {"success": False, "error": f"Failed to parse file: {e}"}, 400
+        try:
+            result = services.merge_catalog(
+                request, bulk_request, existing_catalog_id, on_progress=on_progress,
+            )
+        except Exception as e:
+            return {"success": False, "error": f"Merge failed: {e}"}, 500
+        # Build deep-link redirect URL
+        seller_id = result.get("seller_display_id", "")
+        event_id = result.get("customer_catalog_id", customer_catalog_id)
+        redirect_url = f"/?seller={seller_id}&event={event_id}" if seller_id else "/"
+        response = {
+            "success": True,
+            "redirect": redirect_url,
+            "merge": {
+                "added": result["added"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
+                "failed": result["failed"],
+            },
+        }
+        if result.get("errors"):
+            response["warnings"] = result["errors"]
+        if result["failed"] > 0:
+            response["recovery_url"] = reverse("recovery_dashboard")
+        return response, 200
+
+    # New catalog path — bulk insert, one chunk at a time. Fingerprints left
+    # over from a deleted catalog with the same id must not seed the new one.
+    services.invalidate_lot_fingerprints(customer_catalog_id)
+    progress = {**_empty_progress(), "total": total}
+    if on_progress is not None:
+        on_progress(dict(progress))
+    errors = []
+    new_catalogs = {customer_catalog_id}  # only the first chunk may start its fingerprint map
+    try:
+        for chunk in iter_bulk_requests(file_path, chunk_lots=chunk_lots):
+            result = services.bulk_insert(request, chunk, new_catalogs=new_catalogs)
+            new_catalogs = ()
+            progress["added"] += result["inserted"]
+            progress["failed"] += result["failed"]
+            errors.extend(result["errors"])
+            if on_progress is not None:
+                on_progress(dict(progress))
+    except Exception as e:
+        return {"success": False, "error": f"Import failed: {e}"}, 500
+
+    # Resolve seller info for deep-link redirect
+    internal_id = services.find_catalog_by_customer_id(request, customer_catalog_id)
+    redirect_url = "/"
+    if internal_id:
+        try:
+            catalog_obj = services.get_catalog(request, internal_id)
+            seller_display_id = catalog_obj.sellers[0].customer_display_id if catalog_obj.sellers else ""
+            if seller_display_id:
+                redirect_url = f"/?seller={seller_display_id}&event={customer_catalog_id}"
+        except Exception:
+            pass
+
+    response = {"success": True, "redirect": redirect_url}
+    if progress["failed"] > 0:
+        response["import"] = {"added": progress["added"], "failed": progress["failed"]}
+        response["warnings"] = errors
+        response["recovery_url"] = reverse("recovery_dashboard")
+    return response, 200
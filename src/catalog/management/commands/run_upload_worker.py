@@ -0,0 +1,49 @@
+"""Management command: process queued catalog upload jobs."""
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from catalog import jobs
+
+
+class Command(BaseCommand):
+    help = "Run the background worker that processes queued catalog uploads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst", action="store_true",
+            help="Exit once the queue is empty instead of waiting for new jobs",
+        )
+        parser.add_argument(
+            "--poll-timeout", type=int, default=5,
+            help="Seconds to block waiting for a job before polling again (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        burst = options["burst"]
+        poll_timeout = options["poll_timeout"]
+
+        self.stdout.write("Waiting for upload jobs...")
+        while True:
+            job_id = jobs.next_job_id(timeout=poll_timeout)
+            if job_id is None:
+                if burst:
+                    break
+                continue
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\nJob {job_id}"))
+            close_old_connections()
+            try:
+                job = jobs.run_upload_job(job_id)
+            finally:
+                close_old_connections()
+
+            if job is None:
+                self.stderr.write(self.style.WARNING("Job not found — skipped"))
+            elif job["status"] == jobs.JOB_SUCCEEDED:
+                self.stdout.write(self.style.SUCCESS(f"Done: {job['progress']}"))
+            else:
+                error = (job.get("result") or {}).get("error", "unknown error")
+                self.stderr.write(self.style.ERROR(f"Failed: {error}"))
+
+        self.stdout.write(self.style.SUCCESS("\nQueue empty."))
@@ -1,15 +1,22 @@
+import json
 import logging
+import time
 
+from django.conf import settings
 from django.contrib.auth import login as django_login
 from django.contrib.auth.models import User
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
 
+from catalog.api_client import CatalogAPIUnavailable
 from catalog.authorization import is_authorized
+from catalog.instrumentation import RequestMetrics, bind, unbind
+from catalog.monitoring import log_status_periodically
 from catalog.services import is_authenticated
 
 logger = logging.getLogger(__name__)
+metrics_logger = logging.getLogger("catalog.metrics")
 
 EXEMPT_PATHS = ("/login/", "/static/", "/no-access/")
 
@@ -64,9 +71,55 @@ class CatalogAPIErrorMiddleware:
     def process_exception(self, request, exception):
         from requests.exceptions import RequestException
 
+        if isinstance(exception, CatalogAPIUnavailable):
+            logger.warning("Catalog API circuit open; failing %s fast", request.path)
+            return render(request, "catalog/error.html", {
+                "message": "The Catalog API is temporarily unavailable. Please try again shortly.",
+            }, status=503)
         if isinstance(exception, RequestException):
             logger.exception("Catalog API request failed")
             return render(request, "catalog/error.html", {
                 "message": f"Unable to reach the Catalog API: {str(exception)}",
             }, status=502)
         return None
+
+
+class RequestMetricsMiddleware:
+    """Count each request's Catalog API calls and cache traffic.
+
+    The totals are appended to the response's Server-Timing header (after any
+    entries the view set itself) and logged as one JSON line on the
+    ``catalog.metrics`` logger, followed now and then by the process's
+    cache and breaker state (catalog.monitoring).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "CATALOG_REQUEST_METRICS", True) or request.path.startswith("/static/"):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = bind(metrics)
+        started = time.monotonic()
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            unbind(token)
+            elapsed = time.monotonic() - started
+            summary = metrics.summary()
+            metrics_logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": getattr(response, "status_code", 500),
+                "ms": round(elapsed * 1000, 1),
+                **summary,
+            }, sort_keys=True))
+            log_status_periodically()
+        entries = [response["Server-Timing"]] if response.has_header("Server-Timing") else []
+        entries += metrics.server_timing()
+        entries.append(f"total;dur={elapsed * 1000:.1f}")
+        response["Server-Timing"] = ", ".join(entries)
+        return response
@@ -0,0 +1,51 @@
+"""Cache, circuit breaker and limiter state for monitoring.
+
+The cache tier counters and both circuit breakers are kept per worker
+process; the Catalog API concurrency limiter is shared through Redis.
+status() gathers all of them. The status view serves it as JSON (the state
+of whichever worker answered, tagged with its pid), and every process also
+logs it on the catalog.metrics logger at most once per
+CATALOG_STATUS_LOG_INTERVAL seconds, next to the per-request metrics lines,
+so each gunicorn worker shows up in the logs.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from catalog import rate_limit
+from catalog.api_client import api_circuit_state
+from catalog.cache import cache_stats, redis_circuit_state
+
+logger = logging.getLogger("catalog.metrics")
+
+_last_logged = {"at": None}
+_log_lock = threading.Lock()
+
+
+def status():
+    """Return this process's cache/breaker state and the cluster-wide limiter state."""
+    return {
+        "pid": os.getpid(),
+        "cache": cache_stats(),
+        "redis_breaker": redis_circuit_state(),
+        "api_breaker": api_circuit_state(),
+        "api_limiter": rate_limit.limiter_state(),
+    }
+
+
+def log_status_periodically():
+    """Log status() if this process has not done so in the last CATALOG_STATUS_LOG_INTERVAL seconds."""
+    interval = getattr(settings, "CATALOG_STATUS_LOG_INTERVAL", 60)
+    if interval <= 0:
+        return
+    now = time.monotonic()
+    with _log_lock:
+        if _last_logged["at"] is not None and now - _last_logged["at"] < interval:
+            return
+        _last_logged["at"] = now
+    logger.info(json.dumps({"status": status()}, sort_keys=True))
@@ -0,0 +1,202 @@
+"""Cluster-wide adaptive concurrency limit for outbound Catalog API calls.
+
+Every gunicorn worker and the upload worker share one limit on in-flight
+Catalog API calls, kept in Redis. A call takes a permit (a member of a Redis
+sorted set scored by its lease expiry) before it is sent and gives it back
+when it returns. The limit adapts AIMD-style: each fast, successful call
+raises it by 1/limit (about +1 per limit's worth of calls), while a 429, a
+5xx, a transport error or a call slower than CATALOG_API_TARGET_LATENCY cuts
+it multiplicatively, at most once per CATALOG_API_LIMIT_CUT_INTERVAL across
+the cluster so one burst of errors is one cut.
+
+Background work (merges and bulk imports run by the upload worker) may only
+use CATALOG_API_BACKGROUND_SHARE of the limit and polls for a free permit
+more slowly, so interactive panel loads get through first.
+
+Permits are leased: a worker that dies holding one frees it after
+CATALOG_API_PERMIT_LEASE seconds. Interactive calls wait at most
+CATALOG_API_INTERACTIVE_PERMIT_WAIT (a fraction of a second) for a permit so
+a saturated limit never holds up a page load for long; background calls wait
+up to CATALOG_API_PERMIT_WAIT. A call that runs out of wait takes a permit
+over the limit, so it still counts as in flight (holding back other callers
+until it returns) and its outcome still adapts the limit. Only when Redis is
+unavailable do calls go ahead unthrottled.
+
+Cost: each call makes at least two Redis round trips (an EVAL to take the
+permit and one to give it back), plus one more EVAL per poll while it waits
+for a permit and one to take a permit over the limit if the wait runs out.
+"""
+
+import logging
+import random
+import time
+import uuid
+
+from django.conf import settings
+
+from catalog.cache import redis_breaker
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Raw Redis keys, outside Django's key prefixing
+LIMIT_KEY = "cat_api_limit"
+INFLIGHT_KEY = "cat_api_inflight"
+LIMIT_CUT_KEY = "cat_api_limit_cut"
+
+OVERLOAD_CUT = 0.5  # limit multiplier after a 429, 5xx or transport error
+SLOW_CUT = 0.9  # limit multiplier after a call slower than the target latency
+_POLL_INTERVAL = {INTERACTIVE: 0.01, BACKGROUND: 0.05}  # seconds between permit attempts
+
+# KEYS: inflight set, limit.
+# ARGV: now, lease, token, initial limit, share of the limit usable, 1 to take a permit over the limit.
+_ACQUIRE = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local limit = tonumber(redis.call('GET', KEYS[2]) or ARGV[4])
+local allowed = math.max(1, math.floor(limit * tonumber(ARGV[5])))
+if ARGV[6] ~= '1' and redis.call('ZCARD', KEYS[1]) >= allowed then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])))
+return 1
+"""
+
+# KEYS: inflight set. ARGV: token.
+_RETURN = "redis.call('ZREM', KEYS[1], ARGV[1])"
+
+# KEYS: inflight set, limit, cut marker. ARGV: token, initial, min, max, factor (0 = increase), cut interval ms.
+_RELEASE = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+local limit = tonumber(redis.call('GET', KEYS[2]) or ARGV[2])
+local factor = tonumber(ARGV[5])
+if factor == 0 then
+    limit = math.min(tonumber(ARGV[4]), limit + 1 / limit)
+elseif redis.call('SET', KEYS[3], 1, 'NX', 'PX', ARGV[6]) then
+    limit = math.max(tonumber(ARGV[3]), limit * factor)
+else
+    return false
+end
+redis.call('SET', KEYS[2], tostring(limit))
+return tostring(limit)
+"""
+
+
+def _connection():
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def _enabled():
+    return getattr(settings, "CATALOG_API_THROTTLE", True)
+
+
+def _limits():
+    return (
+        getattr(settings, "CATALOG_API_CONCURRENCY_INITIAL", 16),
+        getattr(settings, "CATALOG_API_CONCURRENCY_MIN", 2),
+        getattr(settings, "CATALOG_API_CONCURRENCY_MAX", 64),
+    )
+
+
+def _run(script, keys, args):
+    """Run a Lua *script* through the Redis breaker. Returns None when Redis is unavailable."""
+    if not redis_breaker.allow():
+        return None
+    try:
+        result = _connection().eval(script, len(keys), *keys, *args)
+    except Exception as exc:
+        redis_breaker.record_failure(exc)
+        logger.warning("Catalog API limiter unavailable: %s", exc)
+        return None
+    redis_breaker.record_success()
+    return result
+
+
+def acquire(priority=INTERACTIVE, wait=None):
+    """Wait for a permit to call the Catalog API and return its token.
+
+    If no permit frees up within the priority's wait
+    (CATALOG_API_INTERACTIVE_PERMIT_WAIT or CATALOG_API_PERMIT_WAIT, or
+    *wait* seconds, if that is shorter), one is taken over the limit. Returns
+    None (call unthrottled) only when the limiter is disabled or Redis is
+    unavailable.
+    """
+    if not _enabled():
+        return None
+    initial, _, _ = _limits()
+    share = 1.0 if priority == INTERACTIVE else getattr(settings, "CATALOG_API_BACKGROUND_SHARE", 0.5)
+    lease = getattr(settings, "CATALOG_API_PERMIT_LEASE", 60)
+    poll = _POLL_INTERVAL.get(priority, _POLL_INTERVAL[BACKGROUND])
+    token = uuid.uuid4().hex
+    if priority == INTERACTIVE:
+        max_wait = getattr(settings, "CATALOG_API_INTERACTIVE_PERMIT_WAIT", 0.25)
+    else:
+        max_wait = getattr(settings, "CATALOG_API_PERMIT_WAIT", 10)
+    if wait is not None:
+        max_wait = min(max_wait, max(0.0, wait))
+    deadline = time.monotonic() + max_wait
+    while True:
+        granted = _run(_ACQUIRE, [INFLIGHT_KEY, LIMIT_KEY], [time.time(), lease, token, initial, share, 0])
+        if granted is None:
+            return None
+        if granted:
+            return token
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(poll * random.uniform(0.5, 1.5))
+    logger.warning("No Catalog API permit free for %s call; taking one over the limit", priority)
+    if _run(_ACQUIRE, [INFLIGHT_KEY, LIMIT_KEY], [time.time(), lease, token, initial, share, 1]) is None:
+        return None
+    return token
+
+
+def release(token, overloaded=False, latency=None, adapt=True):
+    """Give back *token* and adapt the shared limit to how the call went.
+
+    *overloaded* marks a 429, 5xx or transport error; *latency* is the call's
+    duration in seconds. With *adapt* false (a call abandoned for reasons of
+    its own, e.g. its request's time budget ran out) the limit is left as is.
+    """
+    if token is None:
+        return
+    if not adapt:
+        _run(_RETURN, [INFLIGHT_KEY], [token])
+        return
+    initial, minimum, maximum = _limits()
+    if overloaded:
+        factor = OVERLOAD_CUT
+    elif latency is not None and latency > getattr(settings, "CATALOG_API_TARGET_LATENCY", 2.0):
+        factor = SLOW_CUT
+    else:
+        factor = 0
+    interval_ms = int(getattr(settings, "CATALOG_API_LIMIT_CUT_INTERVAL", 1.0) * 1000)
+    limit = _run(
+        _RELEASE,
+        [INFLIGHT_KEY, LIMIT_KEY, LIMIT_CUT_KEY],
+        [token, initial, minimum, maximum, factor, interval_ms],
+    )
+    if limit and factor:
+        logger.info("Catalog API concurrency limit cut to %s", limit.decode() if isinstance(limit, bytes) else limit)
+
+
+def limiter_state():
+    """Return {"limit": float, "in_flight": int} for monitoring, or None if Redis is unavailable."""
+    if not redis_breaker.allow():
+        return None
+    try:
+        conn = _connection()
+        pipe = conn.pipeline()
+        pipe.get(LIMIT_KEY)
+        pipe.zcount(INFLIGHT_KEY, time.time(), "+inf")
+        limit, in_flight = pipe.execute()
+    except Exception as exc:
+        redis_breaker.record_failure(exc)
+        logger.warning("Catalog API limiter state unavailable: %s", exc)
+        return None
+    redis_breaker.record_success()
+    return {"limit": float(limit) if limit is not None else float(_limits()[0]), "in_flight": in_flight}
@@ -0,0 +1,107 @@
+"""Compact records for the cached seller and event lists.
+
+The lists cached under SELLERS_CACHE_KEY and CATALOGS_CACHE_KEY_PREFIX hold
+these slotted records rather than dicts with ISO date strings, so a cache hit
+is served as-is: no per-item fromisoformat(), no SimpleNamespace rebuild and
+no re-sort. Event lists are stored newest first, which makes the future-only
+filter a binary search on the precomputed epoch start time.
+
+Records are shared between requests (and threads, via the L1 cache), so
+treat them as read-only.
+"""
+
+import math
+from bisect import bisect_right
+from datetime import datetime, time
+
+
+class SellerRecord:
+    __slots__ = ("id", "name", "customer_display_id")
+
+    def __init__(self, id, name, customer_display_id):
+        self.id = id
+        self.name = name
+        self.customer_display_id = customer_display_id
+
+    @classmethod
+    def from_seller(cls, seller):
+        return cls(seller.id, seller.name, seller.customer_display_id)
+
+    def __reduce__(self):
+        return (SellerRecord, (self.id, self.name, self.customer_display_id))
+
+    def __eq__(self, other):
+        return isinstance(other, SellerRecord) and self.__reduce__() == other.__reduce__()
+
+    def __repr__(self):
+        return f"SellerRecord(id={self.id!r}, name={self.name!r}, customer_display_id={self.customer_display_id!r})"
+
+
+class EventRecord:
+    __slots__ = ("id", "title", "customer_catalog_id", "start_date", "start_ts")
+
+    def __init__(self, id, title, customer_catalog_id, start_date):
+        self.id = id
+        self.title = title
+        self.customer_catalog_id = customer_catalog_id
+        self.start_date = start_date
+        self.start_ts = start_date.timestamp() if start_date else None
+
+    @classmethod
+    def from_event(cls, event):
+        return cls(event.id, event.title, event.customer_catalog_id, event.start_date)
+
+    def __reduce__(self):
+        return (EventRecord, (self.id, self.title, self.customer_catalog_id, self.start_date))
+
+    def __eq__(self, other):
+        return isinstance(other, EventRecord) and self.__reduce__() == other.__reduce__()
+
+    def __repr__(self):
+        return f"EventRecord(id={self.id!r}, title={self.title!r}, start_date={self.start_date!r})"
+
+
+def _newest_first_key(event):
+    # Ascending in this key means newest first; undated events sort last.
+    return -event.start_ts if event.start_ts is not None else math.inf
+
+
+def seller_records(items):
+    """Return *items* as SellerRecords; dicts from older cache entries are converted."""
+    if all(isinstance(item, SellerRecord) for item in items):
+        return items
+    return [
+        SellerRecord(**item) if isinstance(item, dict) else item
+        for item in items
+    ]
+
+
+def event_records(items):
+    """Return *items* as EventRecords sorted newest first.
+
+    Lists that already hold records were sorted when they were cached and are
+    returned unchanged. Dicts (older cache entries, ISO start dates) are
+    converted and sorted.
+    """
+    if all(isinstance(item, EventRecord) for item in items):
+        return items
+    records = []
+    for item in items:
+        if isinstance(item, dict):
+            start_date = item.get("start_date")
+            if isinstance(start_date, str):
+                start_date = datetime.fromisoformat(start_date)
+            item = EventRecord(item["id"], item.get("title"), item.get("customer_catalog_id"), start_date)
+        records.append(item)
+    return sort_events(records)
+
+
+def sort_events(records):
+    """Sort EventRecords newest first, undated last."""
+    return sorted(records, key=_newest_first_key)
+
+
+def upcoming_events(records, today):
+    """Return the leading run of *records* (newest first) starting on or after *today*."""
+    boundary = datetime.combine(today, time.min).timestamp()
+    return records[:bisect_right(records, -boundary, key=_newest_first_key)]
@@ -0,0 +1,91 @@
+"""In-memory substring search over cached seller records.
+
+Names are normalized (accents stripped, case-folded, punctuation collapsed to
+single spaces) and indexed by trigram. A query is matched by intersecting the
+posting lists of its trigrams and confirming the substring on the few
+candidates left, so filtering a few thousand sellers takes microseconds
+instead of a Catalog API call per keystroke.
+"""
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """Lower-case, accent-free, single-spaced form of *text* for matching."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", stripped.casefold()).strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TextIndex:
+    """Trigram index over the *field* attribute of *records*.
+
+    search() returns matching records in their original order.
+    """
+
+    def __init__(self, records, field):
+        self.records = records
+        self._texts = [normalize(getattr(r, field, None)) for r in records]
+        self._postings = {}
+        for position, text in enumerate(self._texts):
+            for gram in _trigrams(text):
+                self._postings.setdefault(gram, []).append(position)
+
+    def search(self, query):
+        query = normalize(query)
+        if not query:
+            return list(self.records)
+        if len(query) < 3:
+            candidates = range(len(self._texts))
+        else:
+            postings = []
+            for gram in _trigrams(query):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+            candidates = sorted(candidates)
+        return [self.records[i] for i in candidates if query in self._texts[i]]
+
+
+MAX_INDEXES = 64  # per process; one per cached list being filtered
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def index_for(name, records, field, version):
+    """Return a TextIndex over *records*, reusing the last one built for *name*.
+
+    *version* identifies the cache write *records* came from (see
+    catalog.cache.swr_version); the index is rebuilt only when it changes, so
+    every request filtering the same cached list in this process shares one
+    build. A None version is never reused.
+    """
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if version is not None and cached is not None and cached[0] == version:
+            _indexes.move_to_end(name)
+            return cached[1]
+    index = TextIndex(records, field)
+    with _indexes_lock:
+        _indexes[name] = (version, index)
+        _indexes.move_to_end(name)
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
@@ -1,20 +1,71 @@
+import hashlib
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import date, datetime
 from types import SimpleNamespace
 
 from ABConnect import ABConnectAPI
+from ABConnect.exceptions import ABConnectError
+from django.conf import settings
 from django.contrib.auth import login as django_login
 from django.contrib.auth.models import User
 from django.core.cache import cache as django_cache
 
-from catalog.cache import safe_cache_get, safe_cache_set
+from catalog.api_client import (
+    CatalogAPIUnavailable,
+    api_circuit_state,
+    build_catalog_api,
+    detached_request,
+    remaining_time,
+    set_deadline,
+)
+from catalog.cache import (
+    redis_breaker,
+    safe_cache_delete,
+    safe_cache_get,
+    safe_cache_get_many,
+    safe_cache_set,
+    safe_cache_set_many,
+    swr_fill,
+    swr_refresh,
+    swr_unwrap,
+    swr_version,
+)
+from catalog.concurrency import (
+    DeadlineExceeded,
+    LatencyTracker,
+    call_with_retry,
+    fan_out,
+    fetch_all_pages,
+    hedged_call,
+)
+from catalog.instrumentation import record_cache
+from catalog.records import (
+    EventRecord,
+    SellerRecord,
+    event_records,
+    seller_records,
+    sort_events,
+    upcoming_events,
+)
+from catalog.search_index import index_for
 
 logger = logging.getLogger(__name__)
 
 SELLERS_CACHE_KEY = "sellers_all"
 CATALOGS_CACHE_KEY_PREFIX = "catalogs_seller_"
 RECOVERY_CACHE_TTL = 86400  # 24 hours
+LOT_CACHE_KEY_PREFIX = "lot_"
+LOT_CACHE_VERSION = 1  # bump when the cached LotDto shape changes
+LOT_CACHE_TTL = 86400  # 24 hours — safety net for edits made outside LotsDB
+LOT_FINGERPRINTS_KEY_PREFIX = "lot_fp_"
+LOT_FINGERPRINTS_VERSION = 1  # bump when lot_fingerprint() changes
+LOT_SEARCH_CACHE_KEY_PREFIX = "lot_search_v2_"
+CATALOG_SNAPSHOT_KEY_PREFIX = "catalog_snapshot_"
+CATALOG_SNAPSHOT_VERSION = 1  # bump when the cached CatalogExpandedDto shape changes
 
 
 def login(request, username, password):
@@ -36,11 +87,12 @@ def login(request, username, password):
 def get_catalog_api(request):
     """Return a CatalogAPI instance backed by the session token.
 
-    Caches on the request object so only one ABConnectAPI (and one
-    _load_token) is created per HTTP request.
+    Caches on the request object so only one CatalogAPI (and one
+    _load_token) is created per HTTP request. HTTP calls share the
+    process-wide connection pool in catalog.api_client.
     """
     if not hasattr(request, "_catalog_api"):
-        request._catalog_api = ABConnectAPI(request=request).catalog
+        request._catalog_api = build_catalog_api(request)
     return request._catalog_api
 
 
@@ -49,6 +101,154 @@ def is_authenticated(request):
     return bool(request.session.get("abc_token"))
 
 
+def prefetch_cache(request, keys):
+    """Load several cache keys in one MGET and remember them on the request.
+
+    Returns {key: value} for the keys that were found. Later _cache_get()
+    calls for any of *keys* in the same request are answered from this
+    result (hit or miss) instead of another Redis round-trip.
+    """
+    keys = list(keys)
+    found = safe_cache_get_many(keys)
+    memo = request.__dict__.setdefault("_cache_prefetch", {})
+    for key in keys:
+        memo[key] = found.get(key)
+    return found
+
+
+def _cache_get(request, key):
+    """Read *key*, preferring a value already prefetched for this request."""
+    memo = getattr(request, "_cache_prefetch", None)
+    if memo is not None and key in memo:
+        return memo.pop(key)
+    return safe_cache_get(key)
+
+
+# --- Hedged reads ---
+#
+# Single-record reads (get_lot, get_catalog, get_seller) are idempotent, so
+# when one is slower than CATALOG_API_HEDGE_PERCENTILE of recent calls of its
+# kind, a second copy is sent and the first answer wins. Calls stop waiting
+# once the request's time budget (set_deadline) has run out.
+
+api_latency = LatencyTracker()
+
+
+def _read(request, name, func):
+    """Run the idempotent Catalog API read *func*, hedged after the p95 latency of *name* calls."""
+    hedge_after = None
+    if getattr(settings, "CATALOG_API_HEDGE", True):
+        hedge_after = api_latency.percentile(name, getattr(settings, "CATALOG_API_HEDGE_PERCENTILE", 0.95))
+        if hedge_after is not None:
+            hedge_after = max(hedge_after, getattr(settings, "CATALOG_API_HEDGE_MIN_DELAY", 0.05))
+    remaining = remaining_time(request)
+    try:
+        return hedged_call(
+            func,
+            hedge_after=hedge_after,
+            timeout=None if remaining is None else max(0.0, remaining),
+            on_latency=lambda seconds: api_latency.record(name, seconds),
+        )
+    except DeadlineExceeded as exc:
+        raise ABConnectError(str(exc), code="DEADLINE_EXCEEDED") from exc
+
+
+# --- Catalog API outage fallback ---
+#
+# While the Catalog API is failing (its circuit breaker is open, or a call
+# fails with a connection error, 429 or 5xx), reads fall back to the
+# last-known cached sellers, events and event details instead of erroring.
+# Anything served that way marks the request, and views pass
+# served_stale(request) to their templates as the "stale data" flag.
+
+
+def _is_api_outage(exc):
+    return isinstance(exc, CatalogAPIUnavailable) or _is_transient_api_error(exc)
+
+
+def _api_down():
+    return api_circuit_state()["state"] != "closed"
+
+
+def _mark_stale(request, what, exc=None):
+    logger.warning("Catalog API unavailable; serving cached %s%s", what, f": {exc}" if exc else "")
+    request.catalog_stale = True
+
+
+def served_stale(request):
+    """True if part of this request was answered from cache because the Catalog API is down."""
+    return getattr(request, "catalog_stale", False)
+
+
+# --- Id mapping cache ---
+#
+# Sellers and catalogs are addressed by display ids in URLs and import files
+# (customer_display_id, customer_catalog_id) but by internal ids in the API.
+# The mappings never change once assigned, so every seller and catalog the
+# services layer sees is remembered in both directions, and lookups that find
+# nothing are remembered briefly so repeated bad deep links don't hit the API.
+
+# No prefix may be a prefix of another, or an id could land on the other map's key
+SELLER_BY_DISPLAY_ID_KEY_PREFIX = "idmap_seller_by_display_"  # customer_display_id → SellerRecord
+SELLER_DISPLAY_ID_KEY_PREFIX = "idmap_seller_display_of_"  # seller id → customer_display_id
+CATALOG_ID_KEY_PREFIX = "idmap_catalog_"  # customer_catalog_id → catalog id
+CUSTOMER_CATALOG_ID_KEY_PREFIX = "idmap_customer_catalog_"  # catalog id → customer_catalog_id
+ID_MAP_MISS = "__missing__"  # cached "no such seller/catalog"
+
+
+def _id_map_ttl():
+    return getattr(settings, "CATALOG_ID_MAP_TTL", 604800)
+
+
+def remember_sellers(sellers):
+    """Record the display id ↔ id mapping of *sellers* (SellerDtos or SellerRecords)."""
+    entries = {}
+    for seller in sellers:
+        if seller is None or seller.customer_display_id in (None, ""):
+            continue
+        entries[f"{SELLER_BY_DISPLAY_ID_KEY_PREFIX}{seller.customer_display_id}"] = SellerRecord.from_seller(seller)
+        entries[f"{SELLER_DISPLAY_ID_KEY_PREFIX}{seller.id}"] = seller.customer_display_id
+    if entries:
+        safe_cache_set_many(entries, _id_map_ttl())
+
+
+def remember_catalogs(catalogs):
+    """Record the customer_catalog_id ↔ id mapping of *catalogs* (any catalog DTO or EventRecord)."""
+    entries = {}
+    for catalog in catalogs:
+        if catalog is None or not catalog.customer_catalog_id:
+            continue
+        entries[f"{CATALOG_ID_KEY_PREFIX}{catalog.customer_catalog_id}"] = catalog.id
+        entries[f"{CUSTOMER_CATALOG_ID_KEY_PREFIX}{catalog.id}"] = catalog.customer_catalog_id
+    if entries:
+        safe_cache_set_many(entries, _id_map_ttl())
+
+
+def _remember_miss(key):
+    safe_cache_set(key, ID_MAP_MISS, getattr(settings, "CATALOG_ID_MAP_MISS_TTL", 60))
+
+
+def forget_id_misses(seller_display_ids=(), customer_catalog_ids=()):
+    """Drop cached misses for ids that may have just been created."""
+    keys = [f"{SELLER_BY_DISPLAY_ID_KEY_PREFIX}{display_id}" for display_id in seller_display_ids]
+    keys += [f"{CATALOG_ID_KEY_PREFIX}{customer_catalog_id}" for customer_catalog_id in customer_catalog_ids]
+    if not keys:
+        return
+    for key, value in safe_cache_get_many(keys).items():
+        if value == ID_MAP_MISS:
+            safe_cache_delete(key)
+
+
+def lookup_seller_display_id(seller_id):
+    """Return the cached customer_display_id of *seller_id*, or None if not seen yet."""
+    return safe_cache_get(f"{SELLER_DISPLAY_ID_KEY_PREFIX}{seller_id}")
+
+
+def lookup_customer_catalog_id(catalog_id):
+    """Return the cached customer_catalog_id of *catalog_id*, or None if not seen yet."""
+    return safe_cache_get(f"{CUSTOMER_CATALOG_ID_KEY_PREFIX}{catalog_id}")
+
+
 # --- Seller service methods ---
 
 
@@ -68,44 +268,165 @@ def _make_paginated(items, page, page_size):
     )
 
 
+def _listing_timeout(request=None):
+    """Deadline for reading every page of a listing.
+
+    Inside a request with a time budget (set_deadline) that is what is left
+    of it; otherwise (upload worker, background refreshes) it is
+    CATALOG_API_BACKGROUND_TIMEOUT.
+    """
+    remaining = remaining_time(request)
+    if remaining is None:
+        return getattr(settings, "CATALOG_API_BACKGROUND_TIMEOUT", 900.0)
+    return max(0.0, remaining)
+
+
+def _fetch_all_pages(fetch_page, timeout, max_pages=None):
+    """fetch_all_pages() with a running-out deadline reported as an ABConnectError."""
+    try:
+        return fetch_all_pages(fetch_page, timeout=timeout, max_pages=max_pages)
+    except DeadlineExceeded as exc:
+        raise ABConnectError(str(exc), code="DEADLINE_EXCEEDED") from exc
+
+
+def _load_all_sellers(api, timeout=None):
+    """Fetch every seller as SellerRecords (the cached shape).
+
+    *timeout* defaults to the background listing deadline (_listing_timeout()).
+    """
+    sellers = _fetch_all_pages(
+        lambda p: api.sellers.list(page_number=p, page_size=500),
+        _listing_timeout() if timeout is None else timeout,
+    )
+    records = [SellerRecord.from_seller(s) for s in sellers]
+    remember_sellers(records)
+    return records
+
+
+def _cached_sellers_versioned(request):
+    """Return (cached SellerRecords, swr_version) or (None, None), refreshing stale entries in the background."""
+    entry = _cache_get(request, SELLERS_CACHE_KEY)
+    cached, stale = swr_unwrap(entry)
+    if cached is None:
+        return None, None
+    if stale:
+        if _api_down():
+            _mark_stale(request, "sellers")
+        detached = detached_request(request)
+        swr_refresh(SELLERS_CACHE_KEY, lambda: _load_all_sellers(build_catalog_api(detached)))
+    return seller_records(cached), swr_version(entry)
+
+
+def _cached_sellers(request):
+    """Return the cached SellerRecords (refreshing them in the background if stale), or None."""
+    return _cached_sellers_versioned(request)[0]
+
+
 def list_sellers(request, page=1, page_size=25, **filters):
     if filters:
+        # A name filter is answered from the cached list when it is warm
+        sellers, version = _cached_sellers_versioned(request) if set(filters) == {"Name"} else (None, None)
+        if sellers is not None:
+            matches = index_for(SELLERS_CACHE_KEY, sellers, "name", version).search(filters["Name"])
+            return _make_paginated(matches, page, page_size)
         api = get_catalog_api(request)
-        return api.sellers.list(page_number=page, page_size=page_size, **filters)
-
-    cached = safe_cache_get(SELLERS_CACHE_KEY)
-    if cached is not None:
-        items = [SimpleNamespace(**d) for d in cached]
-        return _make_paginated(items, page, page_size)
-
-    api = get_catalog_api(request)
-    result = api.sellers.list(page_number=1, page_size=500)
-    projected = [
-        {"id": s.id, "name": s.name, "customer_display_id": s.customer_display_id}
-        for s in result.items
-    ]
-    safe_cache_set(SELLERS_CACHE_KEY, projected)
-    items = [SimpleNamespace(**d) for d in projected]
-    return _make_paginated(items, page, page_size)
+        result = api.sellers.list(page_number=page, page_size=page_size, **filters)
+        remember_sellers(result.items)
+        return result
+
+    sellers = _cached_sellers(request)
+    if sellers is None:
+        sellers = swr_fill(
+            SELLERS_CACHE_KEY,
+            lambda: _load_all_sellers(get_catalog_api(request), _listing_timeout(request)),
+        )
+    return _make_paginated(sellers, page, page_size)
 
 
 def get_seller(request, seller_id):
+    """Return the seller; while the API is down, its cached SellerRecord if known."""
     api = get_catalog_api(request)
-    return api.sellers.get(seller_id)
+    try:
+        seller = _read(request, "sellers.get", lambda: api.sellers.get(seller_id))
+    except Exception as exc:
+        display_id = lookup_seller_display_id(seller_id) if _is_api_outage(exc) else None
+        record = safe_cache_get(f"{SELLER_BY_DISPLAY_ID_KEY_PREFIX}{display_id}") if display_id is not None else None
+        if not isinstance(record, SellerRecord):
+            raise
+        _mark_stale(request, f"seller {seller_id}", exc)
+        return record
+    remember_sellers([seller])
+    return seller
 
 
 def find_seller_by_display_id(request, display_id):
-    """Look up a seller by customer_display_id and return the seller object, or None."""
+    """Look up a seller by customer_display_id and return the seller object, or None.
+
+    Answered from the id mapping cache when the seller (or its absence) is
+    known; the cached object is a SellerRecord (id, name, customer_display_id).
+    """
+    key = f"{SELLER_BY_DISPLAY_ID_KEY_PREFIX}{display_id}"
+    cached = _cache_get(request, key)
+    if cached == ID_MAP_MISS:
+        return None
+    if isinstance(cached, SellerRecord):
+        return cached
     api = get_catalog_api(request)
     result = api.sellers.list(page_number=1, page_size=1, CustomerDisplayId=display_id)
     if result.items:
+        remember_sellers(result.items[:1])
         return result.items[0]
+    _remember_miss(key)
     return None
 
 
 # --- Catalog (Event) service methods ---
 
 
+def _load_seller_catalogs(api, seller_id, timeout=None):
+    """Fetch every event for *seller_id* as EventRecords, newest first (the cached shape).
+
+    *timeout* defaults to the background listing deadline (_listing_timeout()).
+    """
+    events = _fetch_all_pages(
+        lambda p: api.catalogs.list(page_number=p, page_size=200, SellerIds=seller_id),
+        _listing_timeout() if timeout is None else timeout,
+    )
+    records = sort_events(EventRecord.from_event(c) for c in events)
+    remember_catalogs(records)
+    return records
+
+
+def _cached_events_versioned(request, seller_id):
+    """Return (*seller_id*'s cached EventRecords, swr_version) or (None, None); see cached_events()."""
+    cache_key = f"{CATALOGS_CACHE_KEY_PREFIX}{seller_id}"
+    entry = _cache_get(request, cache_key)
+    cached, stale = swr_unwrap(entry)
+    if cached is None:
+        return None, None
+    if stale:
+        if _api_down():
+            _mark_stale(request, f"events of seller {seller_id}")
+        detached = detached_request(request)
+        swr_refresh(cache_key, lambda: _load_seller_catalogs(build_catalog_api(detached), seller_id))
+    return event_records(cached), swr_version(entry)
+
+
+def cached_events(request, seller_id):
+    """Return *seller_id*'s cached EventRecords (refreshing them in the background if stale), or None."""
+    return _cached_events_versioned(request, seller_id)[0]
+
+
+def _cached_events_fallback(request, seller_id, exc):
+    """Return *seller_id*'s cached events after *exc* if it means the API is down, else None."""
+    if not _is_api_outage(exc):
+        return None
+    events = cached_events(request, seller_id)
+    if events is not None:
+        _mark_stale(request, f"events of seller {seller_id}", exc)
+    return events
+
+
 def list_catalogs(
     request,
     page=1,
@@ -116,57 +437,119 @@ def list_catalogs(
     **filters,
 ):
     if seller_id is not None and not filters:
-        cache_key = f"{CATALOGS_CACHE_KEY_PREFIX}{seller_id}"
-        if use_cache:
-            cached = safe_cache_get(cache_key)
-        else:
-            cached = None
-        if cached is not None:
-            today = date.today()
-            items = []
-            for d in cached:
-                if d.get("start_date"):
-                    d["start_date"] = datetime.fromisoformat(d["start_date"])
-                items.append(SimpleNamespace(**d))
-            if future_only:
-                items = [
-                    i for i in items if i.start_date and i.start_date.date() >= today
-                ]
-            return _make_paginated(items, page, page_size)
+        events = cached_events(request, seller_id) if use_cache else None
+        if events is None:
+            # Cache ALL events so future_only=False hits also benefit from cache
+            try:
+                events = swr_fill(
+                    f"{CATALOGS_CACHE_KEY_PREFIX}{seller_id}",
+                    lambda: _load_seller_catalogs(get_catalog_api(request), seller_id, _listing_timeout(request)),
+                )
+            except Exception as exc:
+                events = _cached_events_fallback(request, seller_id, exc)
+                if events is None:
+                    raise
+        if future_only:
+            events = upcoming_events(events, date.today())
+        return _make_paginated(events, page, page_size)
 
-        api = get_catalog_api(request)
-        result = api.catalogs.list(page_number=1, page_size=200, SellerIds=seller_id)
-        # Cache ALL events so future_only=False hits also benefit from cache
-        projected_all = [
-            {
-                "id": c.id,
-                "title": c.title,
-                "customer_catalog_id": c.customer_catalog_id,
-                "start_date": c.start_date.isoformat() if c.start_date else None,
-            }
-            for c in result.items
-        ]
-        safe_cache_set(cache_key, projected_all)
-
-        today = date.today()
-        items = []
-        for d in projected_all:
-            if d.get("start_date"):
-                d["start_date"] = datetime.fromisoformat(d["start_date"])
-            items.append(SimpleNamespace(**d))
+    title_only = seller_id is not None and set(filters) == {"Title"}
+
+    def search_cached(events, version=None):
+        index = index_for(f"{CATALOGS_CACHE_KEY_PREFIX}{seller_id}", events, "title", version)
+        matches = index.search(filters["Title"])
         if future_only:
-            items = [i for i in items if i.start_date and i.start_date.date() >= today]
-        return _make_paginated(items, page, page_size)
+            matches = upcoming_events(matches, date.today())
+        return _make_paginated(matches, page, page_size)
+
+    if title_only and use_cache:
+        # A title filter is answered from the seller's cached events when warm
+        events, version = _cached_events_versioned(request, seller_id)
+        if events is not None:
+            return search_cached(events, version)
 
     api = get_catalog_api(request)
     if seller_id is not None:
         filters["SellerIds"] = seller_id
-    return api.catalogs.list(page_number=page, page_size=page_size, **filters)
+    try:
+        result = api.catalogs.list(page_number=page, page_size=page_size, **filters)
+    except Exception as exc:
+        events = _cached_events_fallback(request, seller_id, exc) if title_only else None
+        if events is None:
+            raise
+        return search_cached(events)
+    remember_catalogs(result.items)
+    return result
+
+
+def _catalog_snapshot_key(catalog_id):
+    return f"{CATALOG_SNAPSHOT_KEY_PREFIX}v{CATALOG_SNAPSHOT_VERSION}_{catalog_id}"
+
+
+class _SnapshotWrites:
+    """Which event snapshots this process has written, by content digest.
+
+    get_catalog() runs on every panel render; the outage snapshot and id-map
+    entries are only rewritten when the event changed, this process has not
+    written it yet, or its last write is REWRITE_INTERVAL seconds old (so a
+    snapshot evicted from Redis comes back and the TTL keeps being pushed out).
+    """
+
+    MAX_ENTRIES = 4096
+    REWRITE_INTERVAL = 3600
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._written = OrderedDict()  # catalog id → (digest, monotonic write time)
+
+    def needs_write(self, catalog_id, digest):
+        """Return True (and note the write) if the snapshot with *digest* should be written now."""
+        now = time.monotonic()
+        with self._lock:
+            previous = self._written.get(catalog_id)
+            if previous is not None and previous[0] == digest and now - previous[1] < self.REWRITE_INTERVAL:
+                self._written.move_to_end(catalog_id)
+                return False
+            self._written[catalog_id] = (digest, now)
+            self._written.move_to_end(catalog_id)
+            while len(self._written) > self.MAX_ENTRIES:
+                self._written.popitem(last=False)
+            return True
+
+    def reset(self):
+        with self._lock:
+            self._written.clear()
+
+
+catalog_snapshot_writes = _SnapshotWrites()
 
 
 def get_catalog(request, catalog_id):
+    """Return the CatalogExpandedDto; while the API is down, the last one fetched if cached."""
+    from ABConnect.api.models.catalog import CatalogExpandedDto
+
     api = get_catalog_api(request)
-    return api.catalogs.get(catalog_id)
+    try:
+        catalog = _read(request, "catalogs.get", lambda: api.catalogs.get(catalog_id))
+    except Exception as exc:
+        snapshot = safe_cache_get(_catalog_snapshot_key(catalog_id)) if _is_api_outage(exc) else None
+        if snapshot is None:
+            raise
+        _mark_stale(request, f"event {catalog_id}", exc)
+        return CatalogExpandedDto.model_validate(snapshot)
+    if hasattr(catalog, "model_dump"):
+        snapshot = catalog.model_dump(by_alias=True, mode="json")
+        digest = hashlib.sha1(json.dumps(snapshot, sort_keys=True).encode("utf-8")).hexdigest()
+        if not catalog_snapshot_writes.needs_write(catalog_id, digest):
+            return catalog
+        safe_cache_set(
+            _catalog_snapshot_key(catalog_id),
+            snapshot,
+            getattr(settings, "CATALOG_API_FALLBACK_TTL", 604800),
+        )
+    remember_catalogs([catalog])
+    remember_sellers(catalog.sellers or [])
+    return catalog
 
 
 # --- Lot service methods ---
@@ -181,17 +564,95 @@ def list_lots_by_catalog(request, customer_catalog_id, page=1, page_size=25):
     )
 
 
+def _lot_cache_key(lot_id):
+    return f"{LOT_CACHE_KEY_PREFIX}v{LOT_CACHE_VERSION}_{lot_id}"
+
+
+def _cache_lot(lot):
+    """Write a LotDto through to the lot cache. Skips non-Pydantic objects."""
+    if hasattr(lot, "model_dump"):
+        safe_cache_set(
+            _lot_cache_key(lot.id),
+            lot.model_dump(by_alias=True, mode="json"),
+            LOT_CACHE_TTL,
+        )
+
+
+def _cache_lots(lots):
+    """Write several LotDtos through to the lot cache in one pipelined call."""
+    safe_cache_set_many(
+        {
+            _lot_cache_key(lot.id): lot.model_dump(by_alias=True, mode="json")
+            for lot in lots
+            if hasattr(lot, "model_dump")
+        },
+        LOT_CACHE_TTL,
+    )
+
+
+def invalidate_lot(lot_id):
+    """Drop a lot from the lot cache so the next read goes to the API."""
+    safe_cache_delete(_lot_cache_key(lot_id))
+
+
 def get_lot(request, lot_id):
+    """Return a LotDto, served from the lot cache when possible."""
+    from ABConnect.api.models.catalog import LotDto
+
+    cached = safe_cache_get(_lot_cache_key(lot_id))
+    if cached is not None:
+        return LotDto.model_validate(cached)
+
     api = get_catalog_api(request)
-    return api.lots.get(lot_id)
+    lot = _read(request, "lots.get", lambda: api.lots.get(lot_id))
+    _cache_lot(lot)
+    return lot
 
 
 def get_lots_for_event(request, lot_ids):
-    """Fetch full LotDto for each lot ID. No batch API available."""
-    results = []
-    for lot_id in lot_ids:
-        results.append(get_lot(request, lot_id))
-    return results
+    """Fetch full LotDto for each lot ID. No batch API available.
+
+    Cached lots are read with a single MGET; only the misses hit the API.
+    Those calls run concurrently (bounded by settings.CATALOG_API_MAX_WORKERS),
+    each hedged like get_lot(), under an overall deadline
+    (settings.CATALOG_API_FANOUT_TIMEOUT, or less if the request's time budget
+    runs out first). Results keep the order of *lot_ids*. A missed deadline
+    surfaces as ABConnectError so panels render their normal error fragment.
+    """
+    from ABConnect.api.models.catalog import LotDto
+
+    if not lot_ids:
+        return []
+
+    # One MGET for the whole page; only misses go to the API.
+    keys = {lot_id: _lot_cache_key(lot_id) for lot_id in lot_ids}
+    cached = safe_cache_get_many(keys.values())
+    lots = {
+        lot_id: LotDto.model_validate(cached[key])
+        for lot_id, key in keys.items()
+        if key in cached
+    }
+    missing = [lot_id for lot_id in keys if lot_id not in lots]
+
+    if missing:
+        # Build the per-request client up front so worker threads share one instance.
+        api = get_catalog_api(request)
+        remaining = remaining_time(request)
+        timeout = None
+        if remaining is not None:
+            timeout = max(0.0, min(remaining, getattr(settings, "CATALOG_API_FANOUT_TIMEOUT", 20.0)))
+        try:
+            fetched = fan_out(
+                lambda lot_id: _read(request, "lots.get", lambda: api.lots.get(lot_id)),
+                missing,
+                timeout=timeout,
+            )
+        except DeadlineExceeded as exc:
+            raise ABConnectError(str(exc), code="DEADLINE_EXCEEDED") from exc
+        _cache_lots(fetched)
+        lots.update(zip(missing, fetched))
+
+    return [lots[lot_id] for lot_id in lot_ids]
 
 
 def save_lot_override(request, lot_id, override_data):
@@ -199,6 +660,7 @@ def save_lot_override(request, lot_id, override_data):
     from ABConnect.api.models.catalog import UpdateLotRequest, LotDataDto
 
     api = get_catalog_api(request)
+    # Merge base comes from the API, not the lot cache, so we never overlay stale overrides.
     lot = api.lots.get(lot_id)
 
     # Merge: start with existing override values, then overlay new values on top.
@@ -236,51 +698,264 @@ def save_lot_override(request, lot_id, override_data):
         catalogs=lot.catalogs,
     )
     result = api.lots.update(lot_id, update_req)
+    _cache_lot(result)
     return result
 
 
-def bulk_insert(request, data):
-    """Insert catalog data via the bulk endpoint."""
+def split_bulk_request(data, max_lots=None, max_bytes=None):
+    """Split a BulkInsertRequest into single-catalog batches.
+
+    Each batch repeats its catalog's header and sellers and carries at most
+    *max_lots* lots and roughly *max_bytes* of lot JSON (a single oversized
+    lot still gets a batch of its own). Defaults come from
+    settings.CATALOG_BULK_BATCH_LOTS / CATALOG_BULK_BATCH_BYTES.
+    """
+    from ABConnect.api.models.catalog import BulkInsertRequest
+
+    if max_lots is None:
+        max_lots = getattr(settings, "CATALOG_BULK_BATCH_LOTS", 100)
+    if max_bytes is None:
+        max_bytes = getattr(settings, "CATALOG_BULK_BATCH_BYTES", 1_000_000)
+
+    batches = []
+    for catalog in data.catalogs:
+        header = catalog.model_copy(update={"lots": []})
+        header_bytes = len(header.model_dump_json(by_alias=True))
+        lots, size = [], header_bytes
+        for lot in catalog.lots:
+            lot_bytes = len(lot.model_dump_json(by_alias=True)) + 1
+            if lots and (len(lots) >= max_lots or size + lot_bytes > max_bytes):
+                batches.append(BulkInsertRequest(catalogs=[header.model_copy(update={"lots": lots})]))
+                lots, size = [], header_bytes
+            lots.append(lot)
+            size += lot_bytes
+        if lots or not catalog.lots:
+            batches.append(BulkInsertRequest(catalogs=[header.model_copy(update={"lots": lots})]))
+    return batches
+
+
+def bulk_insert(request, data, new_catalogs=()):
+    """Insert catalog data via the bulk endpoint in size-bounded batches.
+
+    The first batch of each catalog is sent on its own so the catalog and its
+    sellers are created exactly once (if it fails, the next batch takes its
+    place); the remaining batches run on a worker pool
+    (settings.CATALOG_BULK_MAX_WORKERS). Each batch is retried on
+    transient API errors, and the lots of batches that still fail are written
+    to the recovery cache as "create" entries.
+
+    Inserted lots are added to their catalog's stored fingerprints. A catalog
+    without a stored map only gets one if it is in *new_catalogs* (ids that
+    did not exist on the server before this import started); anywhere else a
+    fresh map would miss the lots already on the server.
+
+    Returns dict with {inserted, failed, errors}. Raises RuntimeError if every
+    batch failed.
+    """
     api = get_catalog_api(request)
-    return api.bulk.insert(data)
+    batches = split_bulk_request(data)
+
+    def insert(batch):
+        try:
+            _retry_api_call(lambda: api.bulk.insert(batch))
+        except Exception as e:
+            return e
+        return None
+
+    by_catalog = {}
+    for index, batch in enumerate(batches):
+        by_catalog.setdefault(batch.catalogs[0].customer_catalog_id, []).append(index)
+
+    # Until one of a catalog's batches has gone through, the catalog may not
+    # exist yet, so its batches are sent one at a time; the first to succeed
+    # leads and the rest follow in parallel.
+    outcomes = [None] * len(batches)
+    followers = []
+    for indices in by_catalog.values():
+        for position, index in enumerate(indices):
+            outcomes[index] = insert(batches[index])
+            if outcomes[index] is None:
+                followers.extend(indices[position + 1:])
+                break
+    follower_outcomes = fan_out(
+        insert,
+        [batches[index] for index in followers],
+        max_workers=getattr(settings, "CATALOG_BULK_MAX_WORKERS", 2),
+        timeout=getattr(settings, "CATALOG_BULK_TIMEOUT", 900),
+    )
+    for index, error in zip(followers, follower_outcomes):
+        outcomes[index] = error
+    # The catalogs and sellers may exist now even where a batch failed
+    forget_id_misses(
+        {s.customer_display_id for batch in batches for c in batch.catalogs for s in c.sellers or []},
+        {c.customer_catalog_id for batch in batches for c in batch.catalogs},
+    )
+
+    inserted = 0
+    failed = 0
+    errors = []
+    catalog_ids = {}
+    inserted_lots = {}
+    failed_catalogs = set()
+    for batch, error in zip(batches, outcomes):
+        catalog = batch.catalogs[0]
+        if error is None:
+            inserted += len(catalog.lots)
+            inserted_lots.setdefault(catalog.customer_catalog_id, []).extend(catalog.lots)
+            continue
+
+        failed += len(catalog.lots)
+        failed_catalogs.add(catalog.customer_catalog_id)
+        errors.append(
+            f"Failed to insert {len(catalog.lots)} lots into catalog {catalog.customer_catalog_id}: {error}"
+        )
+        logger.warning(
+            "Bulk insert: batch of %d lots for catalog %s failed: %s",
+            len(catalog.lots), catalog.customer_catalog_id, error,
+        )
+        _cache_failed_bulk_lots(request, catalog, error, catalog_ids)
+
+    _record_inserted_fingerprints(inserted_lots, failed_catalogs, new_catalogs)
+    record_item_locations({
+        lot.customer_item_id: {
+            "lot_id": None,
+            "customer_catalog_id": catalog.customer_catalog_id,
+            "seller_display_id": catalog.sellers[0].customer_display_id if catalog.sellers else None,
+            "lot_position": None,
+        }
+        for batch, error in zip(batches, outcomes)
+        if error is None
+        for catalog in batch.catalogs
+        for lot in catalog.lots
+    })
+
+    if batches and inserted == 0 and failed > 0:
+        raise RuntimeError(
+            f"All {failed} lots failed during bulk insert. First error: {errors[0]}"
+        )
+
+    return {"inserted": inserted, "failed": failed, "errors": errors}
+
+
+def _record_inserted_fingerprints(inserted_lots, failed_catalogs, new_catalogs=()):
+    """Add bulk-inserted lots to their catalogs' stored fingerprints.
+
+    Catalogs with any failed batch lose their fingerprints instead, since a
+    failed batch may have been partially applied. Only catalogs in
+    *new_catalogs* may start a map; for the others a missing map (never
+    built, or dropped by an earlier failed chunk of this import) stays
+    missing, so the next merge does a full fetch.
+    """
+    for customer_catalog_id in failed_catalogs:
+        invalidate_lot_fingerprints(customer_catalog_id)
+    for customer_catalog_id, lots in inserted_lots.items():
+        if customer_catalog_id in failed_catalogs:
+            continue
+        fingerprints = load_lot_fingerprints(customer_catalog_id)
+        if fingerprints is None:
+            if customer_catalog_id not in new_catalogs:
+                continue
+            fingerprints = {}
+        for lot in lots:
+            fingerprints[lot.customer_item_id] = [None, lot_fingerprint(lot.initial_data)]
+        store_lot_fingerprints(customer_catalog_id, fingerprints)
+
+
+def _cache_failed_bulk_lots(request, catalog, error, catalog_ids):
+    """Write recovery entries for the lots of a failed bulk batch.
+
+    *catalog_ids* memoizes customer_catalog_id → internal id across batches;
+    the id is None when the catalog itself was never created, in which case
+    the entry is recorded without an AddLotRequest.
+    """
+    from ABConnect.api.models.catalog import LotDataDto
+
+    customer_catalog_id = catalog.customer_catalog_id
+    if customer_catalog_id not in catalog_ids:
+        try:
+            catalog_ids[customer_catalog_id] = find_catalog_by_customer_id(request, customer_catalog_id)
+        except Exception:
+            catalog_ids[customer_catalog_id] = None
+    catalog_id = catalog_ids[customer_catalog_id]
+    seller_display_id = catalog.sellers[0].customer_display_id if catalog.sellers else ""
+    timestamp = datetime.now(tz=datetime.now().astimezone().tzinfo).isoformat()
+
+    for file_lot in catalog.lots:
+        add_lot_request = None
+        if catalog_id is not None:
+            add_lot_request = _build_add_lot_request(
+                file_lot,
+                catalog_id,
+                [LotDataDto(**_to_dict(o)) for o in file_lot.overriden_data or []],
+            ).model_dump(by_alias=True)
+        cache_recovery_entry(
+            request,
+            {
+                "customer_item_id": file_lot.customer_item_id,
+                "lot_number": file_lot.lot_number,
+                "catalog_id": catalog_id,
+                "customer_catalog_id": customer_catalog_id,
+                "seller_display_id": seller_display_id,
+                "operation": "create",
+                "add_lot_request": add_lot_request,
+                "error_message": str(error),
+                "timestamp": timestamp,
+            },
+        )
 
 
 def find_catalog_by_customer_id(request, customer_catalog_id):
-    """Look up a catalog by its customer_catalog_id and return its internal id, or None."""
+    """Look up a catalog by its customer_catalog_id and return its internal id, or None.
+
+    Answered from the id mapping cache when the catalog (or its absence) is known.
+    """
+    key = f"{CATALOG_ID_KEY_PREFIX}{customer_catalog_id}"
+    cached = _cache_get(request, key)
+    if cached is not None:
+        return None if cached == ID_MAP_MISS else cached
     api = get_catalog_api(request)
     result = api.catalogs.list(
         page_number=1, page_size=1, CustomerCatalogId=customer_catalog_id
     )
     if result.items:
+        remember_catalogs(result.items[:1])
         return result.items[0].id
+    _remember_miss(key)
     return None
 
 
 def fetch_all_lots(request, customer_catalog_id):
-    """Paginate through all lots for a catalog and return the complete list."""
-    all_lots = []
-    page = 1
-    while True:
-        result = list_lots_by_catalog(
-            request, customer_catalog_id, page=page, page_size=100
-        )
-        all_lots.extend(result.items)
-        if not result.has_next_page:
-            break
-        page += 1
-    return all_lots
+    """Fetch every page of lots for a catalog (pages 2+ in parallel) and return the complete list.
+
+    Bounded by the request's remaining budget, or CATALOG_API_BACKGROUND_TIMEOUT
+    in the upload worker.
+    """
+    # Page 1 runs on this thread, so the per-request API client exists before workers share it
+    return _fetch_all_pages(
+        lambda page: list_lots_by_catalog(request, customer_catalog_id, page=page, page_size=100),
+        _listing_timeout(request),
+    )
 
 
 def create_lot(request, add_lot_request):
-    """Create a single lot via the API."""
+    """Create a single lot via the API and write it through to the lot cache."""
     api = get_catalog_api(request)
-    return api.lots.create(add_lot_request)
+    lot = api.lots.create(add_lot_request)
+    _cache_lot(lot)
+    return lot
 
 
-def delete_lot(request, lot_id):
-    """Delete a single lot via the API."""
+def delete_lot(request, lot_id, customer_item_id=None):
+    """Delete a single lot via the API and drop it from the lot cache.
+
+    Pass the lot's *customer_item_id* to drop it from the item location
+    index too.
+    """
     api = get_catalog_api(request)
     api.lots.delete(lot_id)
+    invalidate_lot(lot_id)
+    if customer_item_id:
+        forget_item_locations([customer_item_id])
 
 
 # --- Merge comparison fields ---
@@ -313,6 +988,49 @@ def lots_differ(file_data, server_data):
     return False
 
 
+def lot_fingerprint(data):
+    """Hash the merge comparison fields of a lot's initial_data.
+
+    Fields are normalized exactly as in lots_differ(), so two lots share a
+    fingerprint iff lots_differ() considers them equal.
+    """
+    parts = [repr(float(getattr(data, f, None) or 0) + 0.0) for f in _COMPARE_FIELDS_NUMERIC]
+    parts += [str(getattr(data, f, None) or "") for f in _COMPARE_FIELDS_STR]
+    parts += [str(bool(getattr(data, f, None) or False)) for f in _COMPARE_FIELDS_BOOL]
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+# --- Lot fingerprints (delta merge) ---
+#
+# After each import/merge we store {customer_item_id: [lot_id, fingerprint]}
+# for the catalog, so the next re-upload can classify lots without
+# downloading every server lot. lot_id is None for lots created by bulk
+# insert (the endpoint does not return ids). Any failed lot drops the whole
+# map, and so does a recovery retry, so the next merge falls back to a full
+# fetch; edits made outside LotsDB are bounded by the TTL.
+
+
+def _lot_fingerprints_key(customer_catalog_id):
+    return f"{LOT_FINGERPRINTS_KEY_PREFIX}v{LOT_FINGERPRINTS_VERSION}_{customer_catalog_id}"
+
+
+def load_lot_fingerprints(customer_catalog_id):
+    """Return the stored {customer_item_id: [lot_id, fingerprint]} map, or None if absent/stale."""
+    return safe_cache_get(_lot_fingerprints_key(customer_catalog_id))
+
+
+def store_lot_fingerprints(customer_catalog_id, fingerprints):
+    safe_cache_set(
+        _lot_fingerprints_key(customer_catalog_id),
+        fingerprints,
+        getattr(settings, "CATALOG_MERGE_FINGERPRINT_TTL", 21600),
+    )
+
+
+def invalidate_lot_fingerprints(customer_catalog_id):
+    safe_cache_delete(_lot_fingerprints_key(customer_catalog_id))
+
+
 def _to_dict(obj):
     """Convert a LotDataDto or SimpleNamespace to a dict for Pydantic model construction."""
     if hasattr(obj, "model_dump"):
@@ -320,7 +1038,96 @@ def _to_dict(obj):
     return {k: v for k, v in vars(obj).items() if v is not None}
 
 
-def merge_catalog(request, bulk_request, catalog_id):
+def _is_transient_api_error(exc):
+    """True for failures worth retrying: connection errors, 429 and 5xx responses."""
+    from requests.exceptions import RequestException
+
+    if isinstance(exc, RequestException):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status == 429 or (status is not None and status >= 500)
+
+
+def _retry_api_call(func):
+    """Run a single Catalog API call with the retry policy from settings (CATALOG_MERGE_RETRY_*)."""
+    return call_with_retry(
+        func,
+        attempts=getattr(settings, "CATALOG_MERGE_RETRY_ATTEMPTS", 3),
+        backoff=getattr(settings, "CATALOG_MERGE_RETRY_BACKOFF", 0.5),
+        retry_on=_is_transient_api_error,
+    )
+
+
+def _build_add_lot_request(file_lot, catalog_id, overriden_data):
+    """Build the AddLotRequest used to (re-)create a file lot in *catalog_id*."""
+    from ABConnect.api.models.catalog import AddLotRequest, LotDataDto, LotCatalogDto
+
+    return AddLotRequest(
+        customer_item_id=file_lot.customer_item_id,
+        image_links=file_lot.image_links if hasattr(file_lot, "image_links") else [],
+        initial_data=LotDataDto(**_to_dict(file_lot.initial_data)),
+        overriden_data=overriden_data,
+        catalogs=[
+            LotCatalogDto(
+                catalog_id=catalog_id,
+                lot_number=file_lot.lot_number if hasattr(file_lot, "lot_number") else "",
+            )
+        ],
+    )
+
+
+def _apply_merge_op(request, op):
+    """Execute one planned merge operation. Returns the exception on failure, else None.
+
+    Each API call is retried on its own, so a lot whose delete succeeded is
+    never deleted twice when its create needs a retry.
+    """
+    try:
+        if op["error"] is not None:
+            raise op["error"]
+        if op["operation"] == "update":
+            _retry_api_call(lambda: delete_lot(request, op["server_lot_id"], op["item_id"]))
+        created = _retry_api_call(lambda: create_lot(request, op["add_req"]))
+        op["new_lot_id"] = getattr(created, "id", None)
+    except Exception as e:
+        return e
+    return None
+
+
+def _fetch_changed_server_lots(request, file_fingerprints, fingerprints):
+    """Fetch server copies of the file lots whose fingerprint changed.
+
+    Lots are read by their stored id (through the lot cache), or looked up by
+    customer_item_id when the id is unknown. Raises LookupError if a lot is
+    gone or no longer matches its stored fingerprint, i.e. the fingerprints
+    are stale. Returns {customer_item_id: LotDto}.
+    """
+    changed = [
+        item_id
+        for item_id, fingerprint in file_fingerprints.items()
+        if item_id in fingerprints and fingerprints[item_id][1] != fingerprint
+    ]
+    by_id = [item_id for item_id in changed if fingerprints[item_id][0] is not None]
+    by_item = [item_id for item_id in changed if fingerprints[item_id][0] is None]
+
+    server_map = {}
+    for lot in get_lots_for_event(request, [fingerprints[item_id][0] for item_id in by_id]):
+        server_map[lot.customer_item_id] = lot
+    if by_item:
+        api = get_catalog_api(request)
+        pages = fan_out(lambda item_id: api.lots.list(CustomerItemId=item_id, page_size=1), by_item)
+        for page in pages:
+            if page.items:
+                server_map[page.items[0].customer_item_id] = page.items[0]
+
+    for item_id in changed:
+        lot = server_map.get(item_id)
+        if lot is None or lot_fingerprint(lot.initial_data) != fingerprints[item_id][1]:
+            raise LookupError(f"server lot {item_id} no longer matches its stored fingerprint")
+    return server_map
+
+
+def merge_catalog(request, bulk_request, catalog_id, on_progress=None):
     """Merge file lots into an existing catalog.
 
     Compares file lots against server lots by customer_item_id:
@@ -329,13 +1136,22 @@ def merge_catalog(request, bulk_request, catalog_id):
     - Unchanged lots: skipped
     - Server-only lots: left untouched
 
+    Lots are classified by lot_fingerprint(). When fingerprints stored by the
+    previous import/merge are available only changed lots are fetched from the
+    server; otherwise every server lot is downloaded (fetch_all_lots).
+
+    Creates/updates run on a worker pool (settings.CATALOG_MERGE_MAX_WORKERS)
+    with per-call retry on transient API errors. Recovery entries for failed
+    lots are written afterwards, in file order, from the calling thread.
+
+    If *on_progress* is given it is called (possibly from worker threads) with
+    a {added, updated, unchanged, failed, total} snapshot after each lot.
+
     Returns dict with {added, updated, unchanged, failed, errors, catalog_id}.
     """
-    from ABConnect.api.models.catalog import AddLotRequest, LotDataDto, LotCatalogDto
+    from ABConnect.api.models.catalog import LotDataDto
 
-    # Fetch all server lots for this catalog
     customer_catalog_id = bulk_request.catalogs[0].customer_catalog_id
-    server_lots = fetch_all_lots(request, customer_catalog_id)
 
     # Resolve seller display ID for recovery entries and redirect
     catalog_obj = get_catalog(request, catalog_id)
@@ -343,126 +1159,184 @@ def merge_catalog(request, bulk_request, catalog_id):
         catalog_obj.sellers[0].customer_display_id if catalog_obj.sellers else ""
     )
 
-    # Build lookup: customer_item_id → LotDto
-    server_map = {}
-    for lot in server_lots:
-        if lot.customer_item_id:
-            server_map[lot.customer_item_id] = lot
-
     # Build file lots lookup — deduplicate, keep first occurrence only
     file_map = {}
     for catalog in bulk_request.catalogs:
         for lot in catalog.lots:
             if lot.customer_item_id not in file_map:
                 file_map[lot.customer_item_id] = lot
+    file_fingerprints = {
+        item_id: lot_fingerprint(file_lot.initial_data) for item_id, file_lot in file_map.items()
+    }
 
-    added = 0
-    updated = 0
+    # Fingerprints stored by the last import/merge let us classify lots without
+    # downloading the whole catalog; only changed lots are fetched. Otherwise
+    # fetch every server lot and fingerprint the server side.
+    server_map = None
+    fingerprints = load_lot_fingerprints(customer_catalog_id)
+    server_lots = getattr(catalog_obj, "lots", None)
+    if fingerprints is not None and server_lots is not None and len(server_lots) != len(fingerprints):
+        # Lots were added or removed outside the map (another tool, a lost write)
+        logger.info(
+            "Merge: stored fingerprints for catalog %s cover %d lots but the server has %d; fetching all lots",
+            customer_catalog_id, len(fingerprints), len(server_lots),
+        )
+        fingerprints = None
+    if fingerprints is not None:
+        try:
+            server_map = _fetch_changed_server_lots(request, file_fingerprints, fingerprints)
+        except Exception as e:
+            logger.info(
+                "Merge: stored fingerprints for catalog %s are stale (%s); fetching all lots",
+                customer_catalog_id, e,
+            )
+    if server_map is None:
+        server_map = {}
+        for lot in fetch_all_lots(request, customer_catalog_id):
+            if lot.customer_item_id:
+                server_map[lot.customer_item_id] = lot
+        fingerprints = {
+            item_id: [lot.id, lot_fingerprint(lot.initial_data)]
+            for item_id, lot in server_map.items()
+        }
+
+    # Plan: classify every file lot before touching the API
     unchanged = 0
-    failed = 0
-    errors = []
-
+    ops = []
     for item_id, file_lot in file_map.items():
-        server_lot = server_map.get(item_id)
-
-        if server_lot is None:
+        known = fingerprints.get(item_id)
+        if known is None:
             # New lot — create individually
-            try:
-                add_req = AddLotRequest(
-                    customer_item_id=file_lot.customer_item_id,
-                    image_links=file_lot.image_links
-                    if hasattr(file_lot, "image_links")
-                    else [],
-                    initial_data=LotDataDto(**_to_dict(file_lot.initial_data)),
-                    overriden_data=[
-                        LotDataDto(**_to_dict(o))
-                        for o in (file_lot.overriden_data or [])
-                    ],
-                    catalogs=[
-                        LotCatalogDto(
-                            catalog_id=catalog_id,
-                            lot_number=file_lot.lot_number
-                            if hasattr(file_lot, "lot_number")
-                            else "",
-                        )
-                    ],
-                )
-                create_lot(request, add_req)
-                added += 1
-            except Exception as e:
-                failed += 1
-                errors.append(f"Failed to add lot {item_id}: {e}")
-                logger.warning("Merge: failed to create lot %s: %s", item_id, e)
-                cache_recovery_entry(
-                    request,
-                    {
-                        "customer_item_id": item_id,
-                        "lot_number": file_lot.lot_number
-                        if hasattr(file_lot, "lot_number")
-                        else "",
-                        "catalog_id": catalog_id,
-                        "customer_catalog_id": customer_catalog_id,
-                        "seller_display_id": seller_display_id,
-                        "operation": "create",
-                        "add_lot_request": add_req.model_dump(by_alias=True),
-                        "error_message": str(e),
-                        "timestamp": datetime.now(
-                            tz=datetime.now().astimezone().tzinfo
-                        ).isoformat(),
-                    },
-                )
-
-        elif lots_differ(file_lot.initial_data, server_lot.initial_data):
+            operation = "create"
+            server_lot = None
+            overrides_source = file_lot.overriden_data or []
+        elif known[1] != file_fingerprints[item_id]:
             # Changed lot — delete and re-create, preserving overrides
-            try:
-                saved_overrides = [
-                    LotDataDto(**_to_dict(o)) for o in (server_lot.overriden_data or [])
-                ]
-                delete_lot(request, server_lot.id)
-                add_req = AddLotRequest(
-                    customer_item_id=file_lot.customer_item_id,
-                    image_links=file_lot.image_links
-                    if hasattr(file_lot, "image_links")
-                    else [],
-                    initial_data=LotDataDto(**_to_dict(file_lot.initial_data)),
-                    overriden_data=saved_overrides,
-                    catalogs=[
-                        LotCatalogDto(
-                            catalog_id=catalog_id,
-                            lot_number=file_lot.lot_number
-                            if hasattr(file_lot, "lot_number")
-                            else "",
-                        )
-                    ],
-                )
-                create_lot(request, add_req)
-                updated += 1
-            except Exception as e:
-                failed += 1
-                errors.append(f"Failed to update lot {item_id}: {e}")
-                logger.warning("Merge: failed to update lot %s: %s", item_id, e)
-                cache_recovery_entry(
-                    request,
-                    {
-                        "customer_item_id": item_id,
-                        "lot_number": file_lot.lot_number
-                        if hasattr(file_lot, "lot_number")
-                        else "",
-                        "catalog_id": catalog_id,
-                        "customer_catalog_id": customer_catalog_id,
-                        "seller_display_id": seller_display_id,
-                        "operation": "update",
-                        "add_lot_request": add_req.model_dump(by_alias=True),
-                        "error_message": str(e),
-                        "timestamp": datetime.now(
-                            tz=datetime.now().astimezone().tzinfo
-                        ).isoformat(),
-                    },
-                )
-
+            operation = "update"
+            server_lot = server_map[item_id]
+            overrides_source = server_lot.overriden_data or []
         else:
             # Identical — skip
             unchanged += 1
+            continue
+
+        op = {
+            "item_id": item_id,
+            "file_lot": file_lot,
+            "operation": operation,
+            "server_lot_id": server_lot.id if server_lot is not None else None,
+            "add_req": None,
+            "error": None,
+            "new_lot_id": None,
+        }
+        try:
+            op["add_req"] = _build_add_lot_request(
+                file_lot,
+                catalog_id,
+                [LotDataDto(**_to_dict(o)) for o in overrides_source],
+            )
+        except Exception as e:
+            op["error"] = e
+        ops.append(op)
+
+    tally = {"added": 0, "updated": 0, "unchanged": unchanged, "failed": 0, "total": len(file_map)}
+    tally_lock = threading.Lock()
+    if on_progress is not None:
+        on_progress(dict(tally))
+
+    def run_op(op):
+        error = _apply_merge_op(request, op)
+        if on_progress is not None:
+            if error is not None:
+                outcome = "failed"
+            else:
+                outcome = "added" if op["operation"] == "create" else "updated"
+            with tally_lock:
+                tally[outcome] += 1
+                snapshot = dict(tally)
+            on_progress(snapshot)
+        return error
+
+    # Execute: creates/updates in parallel, results in file order. The per-request
+    # API client already exists (fetch_all_lots/get_catalog above), so workers share it.
+    outcomes = fan_out(
+        run_op,
+        ops,
+        max_workers=getattr(settings, "CATALOG_MERGE_MAX_WORKERS", 4),
+        timeout=getattr(settings, "CATALOG_MERGE_TIMEOUT", 900),
+    )
+
+    added = 0
+    updated = 0
+    failed = 0
+    errors = []
+    for op, error in zip(ops, outcomes):
+        item_id = op["item_id"]
+        if error is None:
+            if op["operation"] == "create":
+                added += 1
+            else:
+                updated += 1
+            continue
+
+        failed += 1
+        verb = "add" if op["operation"] == "create" else "update"
+        errors.append(f"Failed to {verb} lot {item_id}: {error}")
+        logger.warning("Merge: failed to %s lot %s: %s", op["operation"], item_id, error)
+        file_lot = op["file_lot"]
+        cache_recovery_entry(
+            request,
+            {
+                "customer_item_id": item_id,
+                "lot_number": file_lot.lot_number
+                if hasattr(file_lot, "lot_number")
+                else "",
+                "catalog_id": catalog_id,
+                "customer_catalog_id": customer_catalog_id,
+                "seller_display_id": seller_display_id,
+                "operation": op["operation"],
+                "add_lot_request": op["add_req"].model_dump(by_alias=True)
+                if op["add_req"] is not None
+                else None,
+                "error_message": str(error),
+                "timestamp": datetime.now(
+                    tz=datetime.now().astimezone().tzinfo
+                ).isoformat(),
+            },
+        )
+
+    # Failed lots are left out: a failed update already dropped its entry if
+    # its delete went through (delete_lot), and otherwise the old one holds.
+    # Positions are not known here, so indexed ones are kept.
+    failed_ids = {op["item_id"] for op, error in zip(ops, outcomes) if error is not None}
+    record_item_locations({
+        item_id: {
+            "lot_id": known[0],
+            "catalog_id": catalog_id,
+            "customer_catalog_id": customer_catalog_id,
+            "seller_display_id": seller_display_id,
+        }
+        for item_id, known in fingerprints.items()
+        if item_id in file_map and item_id not in failed_ids
+    } | {
+        op["item_id"]: {
+            "lot_id": op["new_lot_id"],
+            "catalog_id": catalog_id,
+            "customer_catalog_id": customer_catalog_id,
+            "seller_display_id": seller_display_id,
+        }
+        for op, error in zip(ops, outcomes)
+        if error is None
+    })
+
+    # A failed lot may be half-applied (deleted but not re-created), so only a
+    # clean merge leaves fingerprints the next upload can trust.
+    if failed:
+        invalidate_lot_fingerprints(customer_catalog_id)
+    else:
+        for op in ops:
+            fingerprints[op["item_id"]] = [op["new_lot_id"], file_fingerprints[op["item_id"]]]
+        store_lot_fingerprints(customer_catalog_id, fingerprints)
 
     # If every lot failed, this is a systemic failure — re-raise so the view returns 500
     if failed > 0 and added == 0 and updated == 0 and unchanged == 0:
@@ -482,24 +1356,75 @@ def merge_catalog(request, bulk_request, catalog_id):
     }
 
 
-def search_lots(request, query, page=1, page_size=25):
-    """Search lots by customer item ID and lot number, combining results."""
+def _lot_search_cache_key(query):
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    return f"{LOT_SEARCH_CACHE_KEY_PREFIX}{digest}"
+
+
+_LOT_SEARCH_PAGE_SIZE = 100
+
+
+def _search_lot_ids(request, query):
+    """Return ({"ids": lot ids, "truncated": bool}, {id: LotDto} or None if served from cache).
+
+    Runs the CustomerItemId and LotNumber searches concurrently and merges
+    them by lot id (item-id matches first). Each search reads at most
+    settings.CATALOG_SEARCH_MAX_RESULTS matches, so a broad query costs a few
+    pages instead of the whole listing; "truncated" says some were left out.
+    The merged ids are cached for settings.CATALOG_SEARCH_CACHE_TTL seconds and
+    the lots go through to the lot cache, so later pages are one MGET.
+    """
+    cache_key = _lot_search_cache_key(query)
+    cached = safe_cache_get(cache_key)
+    if cached is not None:
+        return cached, None
+
     api = get_catalog_api(request)
+    max_results = getattr(settings, "CATALOG_SEARCH_MAX_RESULTS", 500)
+    max_pages = max(1, -(-max_results // _LOT_SEARCH_PAGE_SIZE))
+    capped = []  # searches that had more matches than were read
+
+    def search(filters):
+        def fetch_page(page_number):
+            page = api.lots.list(page_number=page_number, page_size=_LOT_SEARCH_PAGE_SIZE, **filters)
+            if page_number == max_pages and getattr(page, "has_next_page", False):
+                capped.append(filters)
+            return page
+
+        items = _fetch_all_pages(fetch_page, _listing_timeout(request), max_pages)
+        if len(items) > max_results:
+            capped.append(filters)
+        return items[:max_results]
+
+    try:
+        by_item, by_lot_num = fan_out(search, [{"CustomerItemId": query}, {"LotNumber": query}])
+    except DeadlineExceeded as exc:
+        raise ABConnectError(str(exc), code="DEADLINE_EXCEEDED") from exc
+
+    lots = {}
+    for lot in list(by_item) + list(by_lot_num):
+        lots.setdefault(lot.id, lot)
+    result = {"ids": list(lots), "truncated": bool(capped)}
+    _cache_lots(lots.values())
+    safe_cache_set(cache_key, result, getattr(settings, "CATALOG_SEARCH_CACHE_TTL", 60))
+    return result, lots
 
-    by_item = api.lots.list(page_number=page, page_size=page_size, CustomerItemId=query)
-    by_lot_num = api.lots.list(page_number=page, page_size=page_size, LotNumber=query)
 
-    # Merge and deduplicate by lot id
-    seen = set()
-    merged = []
-    for lot in list(by_item.items) + list(by_lot_num.items):
-        if lot.id not in seen:
-            seen.add(lot.id)
-            merged.append(lot)
+def search_lots(request, query, page=1, page_size=25):
+    """Search lots by customer item ID and lot number, combining results.
 
-    by_item.items = merged
-    by_item.total_items = len(merged)
-    return by_item
+    Pages over the merged match set, so total_items and the page count
+    cover both searches; ``truncated`` is set when the match cap
+    (CATALOG_SEARCH_MAX_RESULTS) left some out.
+    """
+    result, lots = _search_lot_ids(request, query)
+    paginated = _make_paginated(result["ids"], page, page_size)
+    paginated.truncated = result["truncated"]
+    if lots is not None:
+        paginated.items = [lots[lot_id] for lot_id in paginated.items]
+    else:
+        paginated.items = get_lots_for_event(request, paginated.items)
+    return paginated
 
 
 # --- Recovery cache helpers ---
@@ -558,13 +1483,132 @@ def clear_recovery_entries(request):
         logger.warning("Failed to clear recovery cache")
 
 
+# --- Item location index ---
+#
+# A Redis hash mapping customer_item_id → where the lot lives (lot_id,
+# catalog_id, customer_catalog_id, seller_display_id, lot_position), filled
+# in by imports, merges and event lot loads, so item search can usually skip
+# the Catalog API. Writers record what they know. A field a writer leaves out
+# keeps its indexed value while the item stays in the same event, and is None
+# otherwise; an explicit None (e.g. the lot id right after a bulk insert)
+# clears it. Deleted lots are dropped with forget_item_locations().
+
+ITEM_INDEX_KEY = "cat_item_locations"  # raw Redis hash, outside Django's key prefixing
+_ITEM_LOCATION_FIELDS = ("lot_id", "catalog_id", "customer_catalog_id", "seller_display_id", "lot_position")
+
+
+def _item_index_connection():
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def record_item_locations(locations):
+    """Upsert {customer_item_id: location dict} into the item index. No-op when Redis is down."""
+    locations = {str(item_id): location for item_id, location in locations.items() if item_id}
+    if not locations or not redis_breaker.allow():
+        return
+    try:
+        started = time.monotonic()
+        conn = _item_index_connection()
+        # Writers that leave fields out keep the indexed values (same event only)
+        partial = [item_id for item_id, location in locations.items() if set(_ITEM_LOCATION_FIELDS) - set(location)]
+        indexed = dict(zip(partial, conn.hmget(ITEM_INDEX_KEY, partial))) if partial else {}
+        mapping = {}
+        for item_id, location in locations.items():
+            previous = json.loads(indexed[item_id]) if indexed.get(item_id) else {}
+            if previous.get("customer_catalog_id") != location.get("customer_catalog_id"):
+                previous = {}
+            mapping[item_id] = json.dumps({
+                field: location.get(field, previous.get(field)) for field in _ITEM_LOCATION_FIELDS
+            })
+        pipe = conn.pipeline()
+        pipe.hset(ITEM_INDEX_KEY, mapping=mapping)
+        pipe.expire(ITEM_INDEX_KEY, getattr(settings, "CATALOG_ITEM_INDEX_TTL", 2592000))
+        pipe.execute()
+    except Exception as exc:
+        redis_breaker.record_failure(exc)
+        logger.warning("Item index write failed for %d items: %s", len(locations), exc)
+        return
+    redis_breaker.record_success()
+    record_cache(
+        sets=len(mapping),
+        seconds=time.monotonic() - started,
+        bytes_written=sum(len(value) for value in mapping.values()),
+    )
+
+
+def forget_item_locations(customer_item_ids):
+    """Drop *customer_item_ids* from the item index. No-op when Redis is down."""
+    item_ids = [str(item_id) for item_id in customer_item_ids if item_id]
+    if not item_ids or not redis_breaker.allow():
+        return
+    started = time.monotonic()
+    try:
+        _item_index_connection().hdel(ITEM_INDEX_KEY, *item_ids)
+    except Exception as exc:
+        redis_breaker.record_failure(exc)
+        logger.warning("Item index delete failed for %d items: %s", len(item_ids), exc)
+        return
+    redis_breaker.record_success()
+    record_cache(deletes=len(item_ids), seconds=time.monotonic() - started)
+
+
+def lookup_item_location(customer_item_id):
+    """Return the indexed location dict for *customer_item_id*, or None."""
+    if not redis_breaker.allow():
+        return None
+    started = time.monotonic()
+    try:
+        raw = _item_index_connection().hget(ITEM_INDEX_KEY, str(customer_item_id))
+    except Exception as exc:
+        redis_breaker.record_failure(exc)
+        logger.warning("Item index read failed for %s: %s", customer_item_id, exc)
+        return None
+    redis_breaker.record_success()
+    record_cache(
+        hits=int(bool(raw)),
+        misses=int(not raw),
+        seconds=time.monotonic() - started,
+        bytes_read=len(raw or b""),
+    )
+    return json.loads(raw) if raw else None
+
+
+def record_event_item_locations(event, lots):
+    """Index the loaded *lots* of *event* (a CatalogExpandedDto) with their positions."""
+    if not lots:
+        return
+    positions = {ref.id: i for i, ref in enumerate(event.lots or [])}
+    seller_display_id = event.sellers[0].customer_display_id if event.sellers else None
+    record_item_locations({
+        lot.customer_item_id: {
+            "lot_id": lot.id,
+            "catalog_id": event.id,
+            "customer_catalog_id": event.customer_catalog_id,
+            "seller_display_id": seller_display_id,
+            "lot_position": positions.get(lot.id),
+        }
+        for lot in lots
+        if lot is not None and getattr(lot, "customer_item_id", None)
+    })
+
+
 def resolve_item(request, customer_item_id):
     """Resolve a customer_item_id to its seller, event, and lot position.
 
     Returns a dict with keys: customer_item_id, lot_id, catalog_id,
     customer_catalog_id, seller_display_id, lot_position.
     Returns None if not found.
+
+    Answered from the item location index when it knows the item's event and
+    seller (lot_id, catalog_id and lot_position may then be None if the item
+    was indexed by a bulk import); otherwise looked up via the API and indexed.
     """
+    location = lookup_item_location(customer_item_id)
+    if location and location.get("customer_catalog_id") and location.get("seller_display_id"):
+        return {"customer_item_id": customer_item_id, **location}
+
     api = get_catalog_api(request)
     result = api.lots.list(CustomerItemId=customer_item_id, page_size=1)
     if not result.items:
@@ -587,11 +1631,12 @@ def resolve_item(request, customer_item_id):
                 lot_position = i
                 break
 
-    return {
-        "customer_item_id": customer_item_id,
+    location = {
         "lot_id": lot.id,
         "catalog_id": catalog_id,
         "customer_catalog_id": customer_catalog_id,
         "seller_display_id": seller_display_id,
         "lot_position": lot_position,
     }
+    record_item_locations({customer_item_id: location})
+    return {"customer_item_id": customer_item_id, **location}
@@ -1,10 +1,11 @@
 from django.urls import path
 
 from catalog.views.auth import login_view, logout_view, no_access
-from catalog.views.imports import upload_catalog, search_item
+from catalog.views.imports import upload_catalog, upload_job_status, search_item
 from catalog.views.sellers import seller_list
 from catalog.views.panels import sellers_panel, seller_events_panel, event_lots_panel, lot_override_panel, lot_detail_panel, lot_text_save
 from catalog.views.recovery import recovery_dashboard, recovery_check, recovery_retry, recovery_skip
+from catalog.views.status import status
 
 urlpatterns = [
     path("login/", login_view, name="login"),
@@ -18,9 +19,11 @@ urlpatterns = [
     path("panels/lots/<int:lot_id>/override/", lot_override_panel, name="lot_override_panel"),
     path("panels/lots/<int:lot_id>/text-save/", lot_text_save, name="lot_text_save"),
     path("imports/upload/", upload_catalog, name="upload_catalog"),
+    path("imports/jobs/<str:job_id>/", upload_job_status, name="upload_job_status"),
     path("search/item/", search_item, name="search_item"),
     path("imports/recovery/", recovery_dashboard, name="recovery_dashboard"),
     path("imports/recovery/check/<str:customer_item_id>/", recovery_check, name="recovery_check"),
     path("imports/recovery/retry/<str:customer_item_id>/", recovery_retry, name="recovery_retry"),
     path("imports/recovery/skip/<str:customer_item_id>/", recovery_skip, name="recovery_skip"),
+    path("status/", status, name="status"),
 ]
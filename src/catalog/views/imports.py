@@ -1,15 +1,19 @@
+import logging
 import tempfile
 from pathlib import Path
 
+from django.conf import settings
 from django.contrib import messages
 from django.http import HttpResponseRedirect, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 
-from catalog import services
+from catalog import jobs, services
 from catalog.importers import load_file, list_import_files, SUPPORTED_EXTENSIONS
 
+logger = logging.getLogger(__name__)
+
 FILES_DIR = Path(__file__).resolve().parent.parent / "FILES"
 
 
@@ -52,26 +56,38 @@ def import_file(request):
         return HttpResponseRedirect(reverse("import_list"))
 
     try:
-        services.bulk_insert(request, bulk_request)
-        messages.success(request, f"Imported {safe_name}\n{summary}")
+        result = services.bulk_insert(request, bulk_request)
+        if result["failed"]:
+            messages.warning(
+                request,
+                f"Imported {safe_name} with {result['failed']} failed lots (see recovery)\n{summary}",
+            )
+        else:
+            messages.success(request, f"Imported {safe_name}\n{summary}")
     except Exception as e:
         messages.error(request, f"API error importing {safe_name}: {e}")
 
     return HttpResponseRedirect(reverse("import_list"))
 
 
-MAX_UPLOAD_SIZE = 1048576  # 1 MB
+MAX_UPLOAD_SIZE = settings.CATALOG_MAX_UPLOAD_SIZE
 
 
 @require_POST
 def upload_catalog(request):
+    """Validate an uploaded catalog file and queue it as a background job.
+
+    Returns 202 with the job id immediately; parsing, merge/bulk insert and
+    the redirect URL are produced by the worker (see catalog.jobs) and read
+    back through upload_job_status.
+    """
     uploaded = request.FILES.get("file")
     if not uploaded:
         return JsonResponse({"success": False, "error": "No file uploaded"}, status=400)
 
     if uploaded.size > MAX_UPLOAD_SIZE:
         return JsonResponse(
-            {"success": False, "error": "File too large. Maximum size: 1 MB"},
+            {"success": False, "error": f"File too large. Maximum size: {MAX_UPLOAD_SIZE // 1048576} MB"},
             status=400,
         )
 
@@ -83,73 +99,44 @@ def upload_catalog(request):
             status=400,
         )
 
+    upload_dir = Path(settings.UPLOAD_JOBS_DIR)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=upload_dir, delete=False) as tmp:
+        for chunk in uploaded.chunks():
+            tmp.write(chunk)
+        tmp_path = Path(tmp.name)
+
     try:
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            for chunk in uploaded.chunks():
-                tmp.write(chunk)
-            tmp_path = Path(tmp.name)
-
-        try:
-            bulk_request, summary = load_file(tmp_path)
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        job = jobs.enqueue_upload(request, tmp_path, uploaded.name)
     except Exception as e:
-        return JsonResponse({"success": False, "error": f"Failed to parse file: {e}"}, status=400)
-
-    if not bulk_request.catalogs:
-        return JsonResponse({"success": False, "error": "File contains no catalog data"}, status=400)
-
-    customer_catalog_id = bulk_request.catalogs[0].customer_catalog_id
-
-    # Check if catalog already exists — merge path
-    existing_catalog_id = services.find_catalog_by_customer_id(request, customer_catalog_id)
-    if existing_catalog_id:
-        try:
-            result = services.merge_catalog(request, bulk_request, existing_catalog_id)
-        except Exception as e:
-            return JsonResponse(
-                {"success": False, "error": f"Merge failed: {e}"},
-                status=500,
-            )
-        # Build deep-link redirect URL
-        seller_id = result.get("seller_display_id", "")
-        event_id = result.get("customer_catalog_id", customer_catalog_id)
-        redirect_url = f"/?seller={seller_id}&event={event_id}" if seller_id else "/"
-        response = {
+        tmp_path.unlink(missing_ok=True)
+        logger.exception("Failed to queue upload %s", uploaded.name)
+        return JsonResponse(
+            {"success": False, "error": f"Upload queue unavailable: {e}"},
+            status=503,
+        )
+
+    return JsonResponse(
+        {
             "success": True,
-            "redirect": redirect_url,
-            "merge": {
-                "added": result["added"],
-                "updated": result["updated"],
-                "unchanged": result["unchanged"],
-                "failed": result["failed"],
-            },
-        }
-        if result.get("errors"):
-            response["warnings"] = result["errors"]
-        if result["failed"] > 0:
-            response["recovery_url"] = reverse("recovery_dashboard")
-        return JsonResponse(response)
-
-    # New catalog path — bulk insert
-    try:
-        services.bulk_insert(request, bulk_request)
-    except Exception as e:
-        return JsonResponse({"success": False, "error": f"Import failed: {e}"}, status=500)
-
-    # Resolve seller info for deep-link redirect
-    internal_id = services.find_catalog_by_customer_id(request, customer_catalog_id)
-    redirect_url = "/"
-    if internal_id:
-        try:
-            catalog_obj = services.get_catalog(request, internal_id)
-            seller_display_id = catalog_obj.sellers[0].customer_display_id if catalog_obj.sellers else ""
-            if seller_display_id:
-                redirect_url = f"/?seller={seller_display_id}&event={customer_catalog_id}"
-        except Exception:
-            pass
-
-    return JsonResponse({"success": True, "redirect": redirect_url})
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": reverse("upload_job_status", args=[job["id"]]),
+        },
+        status=202,
+    )
+
+
+@require_GET
+def upload_job_status(request, job_id):
+    """Return status, progress counters and (when finished) the result of an upload job.
+
+    A job no worker picked up, or whose worker died, is reported as failed.
+    """
+    job = jobs.get_job(job_id)
+    if job is None or job.get("username") != request.session.get("abc_username"):
+        return JsonResponse({"success": False, "error": "Job not found"}, status=404)
+    return JsonResponse(jobs.public_job(jobs.expire_stalled(job)))
 
 
 def search_item(request):
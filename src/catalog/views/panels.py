@@ -1,13 +1,10 @@
 import json
 import logging
-from datetime import datetime
-from types import SimpleNamespace
 
 from django.shortcuts import render
 
 from ABConnect.exceptions import ABConnectError
 from catalog import services
-from catalog.cache import safe_cache_get
 from catalog.forms import OverrideForm
 
 logger = logging.getLogger(__name__)
@@ -142,11 +139,13 @@ def sellers_panel(request):
         "selected_seller_id": selected_seller_id,
         "pagination_extra_params": extra_params,
         "filter_name": filter_name,
+        "stale_data": services.served_stale(request),
     })
 
 
 def seller_events_panel(request, seller_id):
     """Return HTML fragment: events list for Left2 panel + OOB seller list with selection."""
+    services.set_deadline(request)
     page, page_size = _parse_page_params(request)
     filter_title = request.GET.get("title", "").strip()
     is_fresh = request.GET.get("fresh") == "1"
@@ -157,20 +156,18 @@ def seller_events_panel(request, seller_id):
 
     from_cache = False
 
-    # SWR: serve events from cache when available (non-fresh, non-filtered)
+    # SWR: serve events from cache when available (non-fresh, non-filtered).
+    # A stale entry is still served; cached_events() refreshes it in the background.
     if not is_fresh and not filters:
-        cache_key = f"{services.CATALOGS_CACHE_KEY_PREFIX}{seller_id}"
-        cached = safe_cache_get(cache_key)
+        # One MGET for both keys this panel reads; list_sellers() below reuses it.
+        services.prefetch_cache(
+            request, [f"{services.CATALOGS_CACHE_KEY_PREFIX}{seller_id}", services.SELLERS_CACHE_KEY],
+        )
+        cached = services.cached_events(request, seller_id)
         if cached is not None:
             from_cache = True
-            items = []
-            for d in cached:
-                d = dict(d)  # copy to avoid mutating cached data
-                if d.get("start_date"):
-                    d["start_date"] = datetime.fromisoformat(d["start_date"])
-                items.append(SimpleNamespace(**d))
-            items.sort(key=lambda e: e.start_date or "", reverse=True)
-            page_events, paginated = _paginate_locally(items, page, page_size)
+            # Cached events are already sorted newest first
+            page_events, paginated = _paginate_locally(cached, page, page_size)
 
     if not from_cache:
         try:
@@ -215,7 +212,7 @@ def seller_events_panel(request, seller_id):
         "oob_sellers_paginated": sellers_result if not is_fresh else None,
         "pagination_extra_params": extra_params,
         "filter_title": filter_title,
-        "from_cache": from_cache,
+        "stale_data": services.served_stale(request),
         "skip_main_oob": is_fresh,
     })
     if not is_fresh:
@@ -244,6 +241,7 @@ def _paginate_locally(items, page, page_size):
 
 def event_lots_panel(request, event_id):
     """Return HTML fragment: lots table for Main panel + OOB events list with selection."""
+    services.set_deadline(request)
     page, page_size = _parse_page_params(request, default_page_size=25)
 
     try:
@@ -253,6 +251,7 @@ def event_lots_panel(request, event_id):
         # Fetch full LotDto for each lot in the page
         lot_ids = [ref.id for ref in page_lot_refs]
         full_lots = services.get_lots_for_event(request, lot_ids)
+        services.record_event_item_locations(event, full_lots)
         lot_rows = build_lot_table_rows(full_lots)
         # Resolve seller from event data for OOB re-render and URL push
         seller_id = event.sellers[0].id if event.sellers else None
@@ -282,6 +281,7 @@ def event_lots_panel(request, event_id):
         "pagination_url": f"/panels/events/{event_id}/lots/",
         "pagination_extra_params": extra_params,
         "selected_event_id": event_id,
+        "stale_data": services.served_stale(request),
     }
     if events_result:
         # Sort events by start_date descending (most recent first) — FR-008
@@ -336,6 +336,7 @@ def _build_detail_rows(lot):
 
 def lot_detail_panel(request, lot_id):
     """Return HTML fragment for the lot detail/edit modal."""
+    services.set_deadline(request)
     try:
         lot = services.get_lot(request, lot_id)
     except ABConnectError:
@@ -49,12 +49,21 @@ def recovery_retry(request, customer_item_id):
         api = services.get_catalog_api(request)
         existing = api.lots.list(CustomerItemId=customer_item_id, page_size=1)
         if existing.items:
-            services.delete_lot(request, existing.items[0].id)
+            services.delete_lot(request, existing.items[0].id, customer_item_id)
+
+    # Lots are about to change outside a merge, so the next upload must not trust stored fingerprints
+    services.invalidate_lot_fingerprints(entry.get("customer_catalog_id"))
 
     # Retry create
     try:
         add_req = AddLotRequest.model_validate(entry["add_lot_request"])
-        services.create_lot(request, add_req)
+        lot = services.create_lot(request, add_req)
+        services.record_item_locations({customer_item_id: {
+            "lot_id": getattr(lot, "id", None),
+            "catalog_id": entry.get("catalog_id"),
+            "customer_catalog_id": entry.get("customer_catalog_id"),
+            "seller_display_id": entry.get("seller_display_id"),
+        }})
         services.remove_recovery_entry(request, customer_item_id)
         remaining = services.get_recovery_entries(request)
         return render(request, "catalog/partials/recovery_row.html", {
@@ -4,6 +4,7 @@ from django.shortcuts import render
 
 from ABConnect.exceptions import ABConnectError
 from catalog import services
+from catalog.concurrency import DeadlineExceeded, run_graph
 from catalog.views.panels import build_lot_table_rows
 
 logger = logging.getLogger(__name__)
@@ -32,15 +33,95 @@ def _parse_page_params(request, default_page_size=25):
     return page, page_size
 
 
+HYDRATE_LOT_PAGE_SIZE = 25
+
+
+def _hydrate_lots(request, event, seller, item_location, item_id):
+    """Load the lot page to show for a deep-linked event, or None if it isn't the seller's."""
+    event_seller_ids = [s.id for s in (event.sellers or [])]
+    if seller is None or seller.id not in event_seller_ids:
+        return None
+    all_lot_refs = event.lots or []
+
+    # If ?item= present, open the page holding it (located via the item index)
+    lot_page = 1
+    if item_id:
+        item_lot_id = (item_location or {}).get("lot_id")
+        for i, ref in enumerate(all_lot_refs):
+            if ref.id == item_lot_id or getattr(ref, "customer_item_id", None) == item_id:
+                lot_page = (i // HYDRATE_LOT_PAGE_SIZE) + 1
+                break
+
+    start = (lot_page - 1) * HYDRATE_LOT_PAGE_SIZE
+    page_lot_refs = all_lot_refs[start:start + HYDRATE_LOT_PAGE_SIZE]
+    full_lots = services.get_lots_for_event(request, [ref.id for ref in page_lot_refs])
+    services.record_event_item_locations(event, full_lots)
+    return lot_page, page_lot_refs, full_lots
+
+
+def _hydration_graph(request, page, page_size, seller_display_id, event_catalog_id, item_id):
+    """Build the run_graph() tasks for the shell and its ?seller=&event=&item= deep link.
+
+    Lookups that only need the URL (seller, event id, item location) start
+    together; the seller's events and the event itself follow as soon as
+    their ids are known, and the lot page once both are in.
+    """
+    tasks = {"sellers": (lambda: services.list_sellers(request, page=page, page_size=page_size), ())}
+    if not seller_display_id:
+        return tasks
+
+    tasks["seller"] = (lambda: services.find_seller_by_display_id(request, seller_display_id), ())
+    tasks["events"] = (
+        lambda seller: seller and services.list_catalogs(
+            request, page=1, page_size=50, seller_id=seller.id, future_only=False,
+        ),
+        ("seller",),
+    )
+    if event_catalog_id:
+        tasks["event_id"] = (lambda: services.find_catalog_by_customer_id(request, event_catalog_id), ())
+        tasks["event"] = (lambda event_id: event_id and services.get_catalog(request, event_id), ("event_id",))
+        tasks["item"] = (lambda: item_id and services.lookup_item_location(item_id), ())
+        tasks["lots"] = (
+            lambda event, seller, item: event and _hydrate_lots(request, event, seller, item, item_id),
+            ("event", "seller", "item"),
+        )
+    return tasks
+
+
+def _raise_unexpected(errors):
+    """Re-raise the first error that isn't a Catalog API failure or a stage past the deadline."""
+    for error in errors.values():
+        if not isinstance(error, (ABConnectError, DeadlineExceeded)):
+            raise error
+
+
 def seller_list(request):
     """Render the SPA shell (always — only served at /)."""
+    services.set_deadline(request)
     page, page_size = _parse_page_params(request)
 
-    result = services.list_sellers(request, page=page, page_size=page_size)
+    # URL hydration: read ?seller=<display_id>&event=<catalog_id>&item=<item_id> for deep-link support
+    seller_display_id = request.GET.get("seller", "").strip()
+    event_catalog_id = request.GET.get("event", "").strip()
+    item_id = request.GET.get("item", "").strip()
 
+    # Load the session here, not in a worker thread; the API client reads its token from it.
+    request.session.get("abc_token")
+    results, errors, timings = run_graph(
+        _hydration_graph(request, page, page_size, seller_display_id, event_catalog_id, item_id),
+        timeout=max(0.0, services.remaining_time(request)),
+    )
+    _raise_unexpected(errors)
+    if isinstance(errors.get("sellers"), DeadlineExceeded):
+        raise ABConnectError(str(errors["sellers"]), code="DEADLINE_EXCEEDED") from errors["sellers"]
+    if "sellers" in errors:
+        raise errors["sellers"]
+
+    result = results["sellers"]
     context = {
         "sellers": result.items,
         "paginated": result,
+        "stale_data": services.served_stale(request),
     }
 
     # Consume server-side pending toast (from search redirect)
@@ -49,72 +130,49 @@ def seller_list(request):
         import json
         context["pending_toast"] = json.dumps(pending_toast)
 
-    # URL hydration: read ?seller=<display_id>&event=<catalog_id>&item=<item_id> for deep-link support
-    seller_display_id = request.GET.get("seller", "").strip()
-    event_catalog_id = request.GET.get("event", "").strip()
-    item_id = request.GET.get("item", "").strip()
+    seller = results.get("seller")
+    if "seller" in errors or "events" in errors:
+        logger.error("Failed to hydrate seller %s", seller_display_id, exc_info=errors.get("seller") or errors["events"])
+    if seller:
+        context["selected_seller_id"] = seller.id
+    if seller and results.get("events"):
+        events_result = results["events"]
+        context["hydrate_seller"] = seller
+        context["hydrate_events"] = events_result.items
+        context["hydrate_events_paginated"] = events_result
+        context["hydrate_events_pagination_url"] = f"/panels/sellers/{seller.id}/events/"
+
+        event_errors = [errors[name] for name in ("event_id", "event", "item", "lots") if name in errors]
+        if event_errors:
+            logger.error("Failed to hydrate event %s", event_catalog_id, exc_info=event_errors[0])
+        if results.get("lots"):
+            event, event_internal_id = results["event"], results["event_id"]
+            lot_page, page_lot_refs, full_lots = results["lots"]
+            if item_id:
+                context["selected_item_id"] = item_id
+            total = len(event.lots or [])
+            total_pages = max(1, (total + HYDRATE_LOT_PAGE_SIZE - 1) // HYDRATE_LOT_PAGE_SIZE)
+            context["selected_event_id"] = event_internal_id
+            context["hydrate_event"] = event
+            context["hydrate_lots"] = page_lot_refs
+            context["hydrate_lot_rows"] = build_lot_table_rows(full_lots)
+            context["hydrate_lots_paginated"] = {
+                "page_number": lot_page,
+                "total_pages": total_pages,
+                "total_items": total,
+                "has_previous_page": lot_page > 1,
+                "has_next_page": lot_page < total_pages,
+            }
+            context["hydrate_lots_pagination_url"] = f"/panels/events/{event_internal_id}/lots/"
 
     if seller_display_id:
-        try:
-            seller = services.find_seller_by_display_id(request, seller_display_id)
-            if seller:
-                selected_seller_id = seller.id
-                context["selected_seller_id"] = selected_seller_id
-                events_result = services.list_catalogs(
-                    request, page=1, page_size=50, seller_id=selected_seller_id,
-                    future_only=False,
-                )
-                context["hydrate_seller"] = seller
-                context["hydrate_events"] = events_result.items
-                context["hydrate_events_paginated"] = events_result
-                context["hydrate_events_pagination_url"] = f"/panels/sellers/{selected_seller_id}/events/"
-
-                if event_catalog_id:
-                    try:
-                        event_internal_id = services.find_catalog_by_customer_id(request, event_catalog_id)
-                        if event_internal_id:
-                            event = services.get_catalog(request, event_internal_id)
-                            # Validate event belongs to the selected seller
-                            event_seller_ids = [s.id for s in (event.sellers or [])]
-                            if selected_seller_id in event_seller_ids:
-                                context["selected_event_id"] = event_internal_id
-                                # Paginate embedded lots and fetch full LotDto
-                                all_lot_refs = event.lots or []
-                                lot_page_size = 25
-
-                                # If ?item= present, find the correct page
-                                lot_page = 1
-                                if item_id:
-                                    context["selected_item_id"] = item_id
-                                    for i, ref in enumerate(all_lot_refs):
-                                        if hasattr(ref, "customer_item_id") and ref.customer_item_id == item_id:
-                                            lot_page = (i // lot_page_size) + 1
-                                            break
-                                        if hasattr(ref, "id"):
-                                            # Fallback: look up lot by ID to check item_id
-                                            pass
-
-                                start = (lot_page - 1) * lot_page_size
-                                page_lot_refs = all_lot_refs[start:start + lot_page_size]
-                                total = len(all_lot_refs)
-                                total_pages = max(1, (total + lot_page_size - 1) // lot_page_size)
-                                lot_ids = [ref.id for ref in page_lot_refs]
-                                full_lots = services.get_lots_for_event(request, lot_ids)
-                                lot_rows = build_lot_table_rows(full_lots)
-                                context["hydrate_event"] = event
-                                context["hydrate_lots"] = page_lot_refs
-                                context["hydrate_lot_rows"] = lot_rows
-                                context["hydrate_lots_paginated"] = {
-                                    "page_number": lot_page,
-                                    "total_pages": total_pages,
-                                    "total_items": total,
-                                    "has_previous_page": lot_page > 1,
-                                    "has_next_page": lot_page < total_pages,
-                                }
-                                context["hydrate_lots_pagination_url"] = f"/panels/events/{event_internal_id}/lots/"
-                    except ABConnectError:
-                        logger.exception("Failed to hydrate event %s", event_catalog_id)
-        except ABConnectError:
-            logger.exception("Failed to hydrate seller %s", seller_display_id)
-
-    return render(request, "catalog/shell.html", context)
+        logger.info(
+            "Deep-link hydration stages (ms): %s",
+            ", ".join(f"{name}={seconds * 1000:.1f}" for name, seconds in sorted(timings.items())),
+        )
+    response = render(request, "catalog/shell.html", context)
+    if timings:
+        response["Server-Timing"] = ", ".join(
+            f"hydrate-{name.replace('_', '-')};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+        )
+    return response
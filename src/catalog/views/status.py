@@ -0,0 +1,14 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from catalog import monitoring
+
+
+@require_GET
+def status(request):
+    """Return cache hit rates, circuit breaker and limiter state as JSON.
+
+    Breakers and cache counters are per process; the response covers the
+    worker that served it (see "pid").
+    """
+    return JsonResponse(monitoring.status())
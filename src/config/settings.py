@@ -32,6 +32,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "catalog.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -51,6 +52,7 @@ TEMPLATES = [
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.template.context_processors.csrf",
+                "catalog.context_processors.uploads",
             ],
         },
     },
@@ -76,12 +78,167 @@ CACHES = {
         "TIMEOUT": None,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Pickle, counting payload bytes per request for RequestMetricsMiddleware
+            "SERIALIZER": "catalog.instrumentation.MeasuringPickleSerializer",
             "SOCKET_CONNECT_TIMEOUT": 5,
             "SOCKET_TIMEOUT": 5,
         },
     }
 }
 
+# --- Request metrics ---
+# Count Catalog API calls and cache traffic per request, reported in the
+# Server-Timing header and one JSON log line per request (catalog.metrics logger).
+CATALOG_REQUEST_METRICS = os.environ.get("CATALOG_REQUEST_METRICS", "true").lower() in ("true", "1", "yes")
+# Seconds between each worker process's log of its cache hit rates, circuit
+# breaker and limiter state (also served at /status/); 0 disables the log.
+CATALOG_STATUS_LOG_INTERVAL = int(os.environ.get("CATALOG_STATUS_LOG_INTERVAL", "60"))
+
+# --- Redis circuit breaker ---
+# Consecutive Redis connection failures before cache calls stop trying Redis.
+CATALOG_REDIS_BREAKER_THRESHOLD = int(os.environ.get("CATALOG_REDIS_BREAKER_THRESHOLD", "3"))
+# Seconds the breaker stays open before a background probe re-checks Redis.
+CATALOG_REDIS_BREAKER_COOLDOWN = float(os.environ.get("CATALOG_REDIS_BREAKER_COOLDOWN", "30"))
+
+# --- Seller / event list caching (stale-while-revalidate) ---
+# Seconds a cached list is served as fresh; after that it is still served but
+# refreshed in the background.
+CATALOG_CACHE_SOFT_TTL = int(os.environ.get("CATALOG_CACHE_SOFT_TTL", "300"))
+# Seconds before Redis evicts the entry and the next request fetches inline.
+CATALOG_CACHE_HARD_TTL = int(os.environ.get("CATALOG_CACHE_HARD_TTL", "86400"))
+# Seconds one worker holds the refresh lock for a key.
+CATALOG_CACHE_REFRESH_LOCK_TTL = int(os.environ.get("CATALOG_CACHE_REFRESH_LOCK_TTL", "60"))
+# Seconds a request waits for another worker to fill a missing list before
+# fetching it itself.
+CATALOG_CACHE_FILL_WAIT = float(os.environ.get("CATALOG_CACHE_FILL_WAIT", "5"))
+
+# --- In-process L1 cache in front of Redis ---
+# Key prefixes also kept in a per-process LRU (shared, read-mostly lists).
+CATALOG_L1_CACHE_PREFIXES = tuple(
+    p.strip()
+    for p in os.environ.get("CATALOG_L1_CACHE_PREFIXES", "sellers_all,catalogs_seller_").split(",")
+    if p.strip()
+)
+# Seconds an L1 entry is served without asking Redis; 0 disables L1.
+CATALOG_L1_CACHE_TTL = float(os.environ.get("CATALOG_L1_CACHE_TTL", "5"))
+# Max entries per process before the least recently used is dropped.
+CATALOG_L1_CACHE_SIZE = int(os.environ.get("CATALOG_L1_CACHE_SIZE", "256"))
+# Seconds between checks of the Redis generation key that invalidates L1.
+CATALOG_L1_SYNC_INTERVAL = float(os.environ.get("CATALOG_L1_SYNC_INTERVAL", "1"))
+
+# --- Item location index (item search) ---
+# Seconds the customer_item_id → location hash lives after its last write.
+CATALOG_ITEM_INDEX_TTL = int(os.environ.get("CATALOG_ITEM_INDEX_TTL", "2592000"))
+
+# --- Id mapping cache (display id ↔ internal id) ---
+# Seconds a known seller/catalog id mapping is cached.
+CATALOG_ID_MAP_TTL = int(os.environ.get("CATALOG_ID_MAP_TTL", "604800"))
+# Seconds a lookup that found no seller/catalog is cached.
+CATALOG_ID_MAP_MISS_TTL = int(os.environ.get("CATALOG_ID_MAP_MISS_TTL", "60"))
+
+# --- Lot search ---
+# Seconds a query's merged lot-id result set is cached for paging.
+CATALOG_SEARCH_CACHE_TTL = int(os.environ.get("CATALOG_SEARCH_CACHE_TTL", "60"))
+# Most matches read per lot search (item id and lot number each); broader
+# queries show the first ones and ask for a narrower search.
+CATALOG_SEARCH_MAX_RESULTS = int(os.environ.get("CATALOG_SEARCH_MAX_RESULTS", "500"))
+
+# --- Catalog API HTTP pool ---
+# Keep-alive connections kept per host by the shared requests.Session; size it
+# for (concurrent Django threads x CATALOG_API_MAX_WORKERS).
+CATALOG_API_POOL_SIZE = int(os.environ.get("CATALOG_API_POOL_SIZE", "20"))
+# Set to false to close connections after every call (e.g. behind a flaky proxy).
+CATALOG_API_KEEP_ALIVE = os.environ.get("CATALOG_API_KEEP_ALIVE", "true").lower() in ("true", "1", "yes")
+
+# --- Catalog API fan-out ---
+# Max concurrent Catalog API calls per fan-out (e.g. lots on one page).
+CATALOG_API_MAX_WORKERS = int(os.environ.get("CATALOG_API_MAX_WORKERS", "8"))
+# Overall deadline in seconds for one fan-out batch.
+CATALOG_API_FANOUT_TIMEOUT = float(os.environ.get("CATALOG_API_FANOUT_TIMEOUT", "20"))
+# Overall deadline (seconds) for paging through a whole listing outside a
+# request budget: upload-worker merges and background cache refreshes.
+CATALOG_API_BACKGROUND_TIMEOUT = float(os.environ.get("CATALOG_API_BACKGROUND_TIMEOUT", "900"))
+
+# --- Catalog API circuit breaker ---
+# Seconds of recent call outcomes the error rate is computed over.
+CATALOG_API_BREAKER_WINDOW = float(os.environ.get("CATALOG_API_BREAKER_WINDOW", "30"))
+# Calls needed in the window before the breaker may open.
+CATALOG_API_BREAKER_MIN_CALLS = int(os.environ.get("CATALOG_API_BREAKER_MIN_CALLS", "10"))
+# Share of failed calls (connection errors, timeouts, 5xx) that opens the breaker.
+CATALOG_API_BREAKER_ERROR_RATE = float(os.environ.get("CATALOG_API_BREAKER_ERROR_RATE", "0.5"))
+# Seconds calls fail fast before one trial call is let through.
+CATALOG_API_BREAKER_COOLDOWN = float(os.environ.get("CATALOG_API_BREAKER_COOLDOWN", "30"))
+# Seconds the last-fetched event details are kept for serving during outages.
+CATALOG_API_FALLBACK_TTL = int(os.environ.get("CATALOG_API_FALLBACK_TTL", "604800"))
+
+# --- Catalog API concurrency limiter (shared by all workers via Redis) ---
+# Set to false to send Catalog API calls without taking a permit.
+CATALOG_API_THROTTLE = os.environ.get("CATALOG_API_THROTTLE", "true").lower() in ("true", "1", "yes")
+# In-flight call limit to start from, and the bounds it adapts within.
+CATALOG_API_CONCURRENCY_INITIAL = int(os.environ.get("CATALOG_API_CONCURRENCY_INITIAL", "16"))
+CATALOG_API_CONCURRENCY_MIN = int(os.environ.get("CATALOG_API_CONCURRENCY_MIN", "2"))
+CATALOG_API_CONCURRENCY_MAX = int(os.environ.get("CATALOG_API_CONCURRENCY_MAX", "64"))
+# Calls slower than this many seconds shrink the limit.
+CATALOG_API_TARGET_LATENCY = float(os.environ.get("CATALOG_API_TARGET_LATENCY", "2"))
+# Minimum seconds between two cuts of the limit, cluster-wide.
+CATALOG_API_LIMIT_CUT_INTERVAL = float(os.environ.get("CATALOG_API_LIMIT_CUT_INTERVAL", "1"))
+# Share of the limit background work (upload worker merges/imports) may use.
+CATALOG_API_BACKGROUND_SHARE = float(os.environ.get("CATALOG_API_BACKGROUND_SHARE", "0.5"))
+# Seconds a panel or page load's call waits for a permit before taking one over the limit.
+CATALOG_API_INTERACTIVE_PERMIT_WAIT = float(os.environ.get("CATALOG_API_INTERACTIVE_PERMIT_WAIT", "0.25"))
+# Seconds a background (upload worker) call waits for a permit before taking one over the limit.
+CATALOG_API_PERMIT_WAIT = float(os.environ.get("CATALOG_API_PERMIT_WAIT", "10"))
+# Seconds before a permit held by a crashed worker is reclaimed.
+CATALOG_API_PERMIT_LEASE = int(os.environ.get("CATALOG_API_PERMIT_LEASE", "60"))
+
+# Per-call connect/read timeouts (seconds) for Catalog API calls.
+CATALOG_API_CONNECT_TIMEOUT = float(os.environ.get("CATALOG_API_CONNECT_TIMEOUT", "5"))
+CATALOG_API_READ_TIMEOUT = float(os.environ.get("CATALOG_API_READ_TIMEOUT", "30"))
+# Total seconds of Catalog API work one panel or page load may spend.
+CATALOG_API_REQUEST_BUDGET = float(os.environ.get("CATALOG_API_REQUEST_BUDGET", "15"))
+# Send a second copy of a single-record read that is slower than this latency percentile.
+CATALOG_API_HEDGE = os.environ.get("CATALOG_API_HEDGE", "true").lower() in ("true", "1", "yes")
+CATALOG_API_HEDGE_PERCENTILE = float(os.environ.get("CATALOG_API_HEDGE_PERCENTILE", "0.95"))
+# Never hedge sooner than this many seconds.
+CATALOG_API_HEDGE_MIN_DELAY = float(os.environ.get("CATALOG_API_HEDGE_MIN_DELAY", "0.05"))
+
+# --- Catalog merge (re-upload of an existing catalog) ---
+# Parallel create/delete workers per merge.
+CATALOG_MERGE_MAX_WORKERS = int(os.environ.get("CATALOG_MERGE_MAX_WORKERS", "4"))
+# Attempts per API call (1 = no retry); only transient errors are retried.
+CATALOG_MERGE_RETRY_ATTEMPTS = int(os.environ.get("CATALOG_MERGE_RETRY_ATTEMPTS", "3"))
+# Initial backoff in seconds, doubled after each failed attempt.
+CATALOG_MERGE_RETRY_BACKOFF = float(os.environ.get("CATALOG_MERGE_RETRY_BACKOFF", "0.5"))
+# Overall deadline in seconds for the whole merge.
+CATALOG_MERGE_TIMEOUT = float(os.environ.get("CATALOG_MERGE_TIMEOUT", "900"))
+# Seconds a catalog's stored lot fingerprints stay valid for delta merges.
+CATALOG_MERGE_FINGERPRINT_TTL = int(os.environ.get("CATALOG_MERGE_FINGERPRINT_TTL", "21600"))
+
+# --- Catalog bulk insert (new catalogs) ---
+# Max lots and approximate JSON bytes per bulk insert request.
+CATALOG_BULK_BATCH_LOTS = int(os.environ.get("CATALOG_BULK_BATCH_LOTS", "100"))
+CATALOG_BULK_BATCH_BYTES = int(os.environ.get("CATALOG_BULK_BATCH_BYTES", "1000000"))
+# Parallel bulk insert requests per catalog (after its first batch).
+CATALOG_BULK_MAX_WORKERS = int(os.environ.get("CATALOG_BULK_MAX_WORKERS", "2"))
+# Overall deadline in seconds for one bulk insert.
+CATALOG_BULK_TIMEOUT = float(os.environ.get("CATALOG_BULK_TIMEOUT", "900"))
+
+# --- Catalog upload jobs ---
+# Uploaded files wait here until `manage.py run_upload_worker` processes them.
+UPLOAD_JOBS_DIR = Path(os.environ.get("UPLOAD_JOBS_DIR", _repo_root / "var" / "upload_jobs"))
+# Largest accepted upload in bytes; files are parsed row by row so memory stays flat.
+CATALOG_MAX_UPLOAD_SIZE = int(os.environ.get("CATALOG_MAX_UPLOAD_SIZE", str(50 * 1024 * 1024)))
+# Lots per BulkInsertRequest chunk when streaming a new catalog into the API.
+CATALOG_IMPORT_CHUNK_LOTS = int(os.environ.get("CATALOG_IMPORT_CHUNK_LOTS", "500"))
+# Seconds a job may wait for a worker before it is reported failed.
+UPLOAD_JOB_QUEUE_TIMEOUT = int(os.environ.get("UPLOAD_JOB_QUEUE_TIMEOUT", "300"))
+# Seconds between worker heartbeats on a running job, and how long without one
+# before the job is reported failed (worker crashed or was killed).
+UPLOAD_JOB_HEARTBEAT_INTERVAL = int(os.environ.get("UPLOAD_JOB_HEARTBEAT_INTERVAL", "15"))
+UPLOAD_JOB_STALL_TIMEOUT = int(os.environ.get("UPLOAD_JOB_STALL_TIMEOUT", "120"))
+# Seconds the dropzone keeps polling a job before it stops waiting.
+UPLOAD_JOB_MAX_POLL = int(os.environ.get("UPLOAD_JOB_MAX_POLL", "3600"))
+
 STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
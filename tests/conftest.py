@@ -3,6 +3,9 @@ from unittest.mock import MagicMock
 
 from django.contrib.auth.models import User
 
+from catalog.cache import reset_local_cache
+from catalog.services import api_latency, catalog_snapshot_writes
+
 
 # Shared test constants — derived from spec examples and data-model.md payloads.
 AUTH_SESSION = {
@@ -11,6 +14,18 @@ AUTH_SESSION = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Keep the per-process L1 cache, its counters, API latency samples and snapshot writes from leaking between tests."""
+    reset_local_cache()
+    api_latency.reset()
+    catalog_snapshot_writes.reset()
+    yield
+    reset_local_cache()
+    api_latency.reset()
+    catalog_snapshot_writes.reset()
+
+
 @pytest.fixture
 def auth_session():
     """Session dict that passes is_authenticated — derived from spec examples."""
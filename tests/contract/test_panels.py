@@ -1,3 +1,4 @@
+import copy
 from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import patch
@@ -5,9 +6,14 @@ from unittest.mock import patch
 import pytest
 from django.test import RequestFactory
 
+from ABConnect.exceptions import ABConnectError
+
 from catalog.views.panels import sellers_panel, seller_events_panel, event_lots_panel, lot_override_panel, lot_detail_panel
 from catalog.views.sellers import seller_list
-from catalog import services as svc_module
+from catalog import search_index, services as svc_module
+from catalog.cache import swr_wrap
+from catalog.concurrency import DeadlineExceeded
+from catalog.records import SellerRecord
 from conftest import AUTH_SESSION
 
 _MOCK_STAFF_USER = SimpleNamespace(is_staff=True, is_authenticated=True, pk=1, id=1)
@@ -89,6 +95,27 @@ class TestSellersPanelContract:
         assert "<html" not in content
         assert response.status_code == 200
 
+    @patch("catalog.views.panels.services.list_sellers")
+    def test_stale_data_flagged_when_api_down(self, mock_list, factory):
+        def serve_cached(request, **kwargs):
+            request.catalog_stale = True
+            return _mock_paginated([_mock_seller()])
+
+        mock_list.side_effect = serve_cached
+        request = _make_get(factory, "/panels/sellers/")
+        response = sellers_panel(request)
+
+        content = response.content.decode()
+        assert "panel-stale" in content
+        assert "showing cached data" in content
+
+    @patch("catalog.views.panels.services.list_sellers")
+    def test_fresh_data_not_flagged(self, mock_list, factory):
+        mock_list.return_value = _mock_paginated([_mock_seller()])
+        response = sellers_panel(_make_get(factory, "/panels/sellers/"))
+
+        assert "panel-stale" not in response.content.decode()
+
     @patch("catalog.views.panels.services.list_sellers")
     def test_contains_panel_list_structure(self, mock_list, factory):
         mock_list.return_value = _mock_paginated([_mock_seller()])
@@ -683,6 +710,61 @@ class TestHydratedPaginationUrlContract:
         content = response.content.decode()
         assert "Select an event to view lots" in content
 
+    @patch("catalog.views.sellers.run_graph")
+    def test_hydration_past_deadline_renders_sellers_only(self, mock_graph, factory):
+        """A deep-link stage cut off by the request budget leaves the sellers-only shell, not a 500."""
+        sellers = _mock_paginated([_mock_seller(id=42, customer_display_id=4098, name="Still Listed")])
+        mock_graph.return_value = (
+            {"sellers": sellers},
+            {"seller": DeadlineExceeded("1 of 5 calls still pending after 0.0s")},
+            {"sellers": 0.01},
+        )
+        request = _make_get(factory, "/", {"seller": "4098", "event": "395768"})
+
+        response = seller_list(request)
+
+        assert response.status_code == 200
+        assert "Still Listed" in response.content.decode()
+
+    @patch("catalog.views.sellers.run_graph")
+    def test_seller_list_past_deadline_is_an_api_error(self, mock_graph, factory):
+        mock_graph.return_value = ({}, {"sellers": DeadlineExceeded("pending")}, {})
+        request = _make_get(factory, "/")
+
+        with pytest.raises(ABConnectError) as excinfo:
+            seller_list(request)
+
+        assert excinfo.value.code == "DEADLINE_EXCEEDED"
+
+
+    @patch("catalog.views.sellers.services.lookup_item_location")
+    @patch("catalog.views.sellers.services.get_lots_for_event")
+    @patch("catalog.views.sellers.services.get_catalog")
+    @patch("catalog.views.sellers.services.find_catalog_by_customer_id")
+    @patch("catalog.views.sellers.services.list_catalogs")
+    @patch("catalog.views.sellers.services.find_seller_by_display_id")
+    @patch("catalog.views.sellers.services.list_sellers")
+    def test_item_deep_link_opens_indexed_lot_page_and_reports_timings(
+        self, mock_list, mock_find_seller, mock_catalogs, mock_find_catalog, mock_catalog, mock_get_lots,
+        mock_lookup, factory,
+    ):
+        """?item= opens the lot page found via the item index; stage timings go in Server-Timing."""
+        mock_list.return_value = _mock_paginated([_mock_seller(id=42, customer_display_id=4098)])
+        mock_find_seller.return_value = _mock_seller(id=42, customer_display_id=4098)
+        mock_catalogs.return_value = _mock_paginated([_mock_event(id=7)])
+        mock_find_catalog.return_value = 7
+        lots = [_mock_lot(id=i, lot_number=f"L{i:03d}") for i in range(51)]
+        mock_catalog.return_value = _mock_event(id=7, sellers=[_mock_seller(id=42)], lots=lots)
+        mock_get_lots.side_effect = _lots_for_event_side_effect
+        mock_lookup.return_value = {"lot_id": 30, "customer_catalog_id": "CAT001", "seller_display_id": 4098}
+        request = _make_get(factory, "/", {"seller": "4098", "event": "CAT001", "item": "ITEM-30"})
+        response = seller_list(request)
+
+        assert [lot_id for lot_id in mock_get_lots.call_args.args[1]][0] == 25
+        timing = response["Server-Timing"]
+        for stage in ("hydrate-seller", "hydrate-event-id", "hydrate-events", "hydrate-event", "hydrate-lots"):
+            assert f"{stage};dur=" in timing
+
 
 class TestPanelFilterContract:
     """Contract tests for panel header filter inputs (US4 - T023, T024)."""
@@ -1223,15 +1305,15 @@ class TestIndicatorWiringContract:
 class TestSellerCacheContract:
     """Contract tests for seller list caching (015-redis-caching TC-001..TC-003)."""
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_cache_hit_returns_cached_sellers_no_api_call(self, mock_api, mock_get, mock_set, factory):
+    def test_cache_hit_returns_cached_sellers_no_api_call(self, mock_api, mock_get, mock_cache, factory):
         """TC-001: Cache hit returns cached data without API call."""
-        mock_get.return_value = [
+        mock_get.return_value = swr_wrap([
             {"id": 1, "name": "Seller A", "customer_display_id": "SA"},
             {"id": 2, "name": "Seller B", "customer_display_id": "SB"},
-        ]
+        ])
         request = _make_get(factory, "/panels/sellers/")
         result = svc_module.list_sellers(request)
 
@@ -1240,10 +1322,10 @@ class TestSellerCacheContract:
         assert result.items[0].name == "Seller A"
         assert result.items[1].customer_display_id == "SB"
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_cache_miss_fetches_projects_and_caches(self, mock_api, mock_get, mock_set, factory):
+    def test_cache_miss_fetches_projects_and_caches(self, mock_api, mock_get, mock_cache, factory):
         """TC-002: Cache miss fetches from API, projects to dicts, populates cache."""
         mock_get.return_value = None
         api = mock_api.return_value
@@ -1254,36 +1336,67 @@ class TestSellerCacheContract:
         result = svc_module.list_sellers(request)
 
         api.sellers.list.assert_called_once_with(page_number=1, page_size=500)
-        mock_set.assert_called_once()
-        cached_data = mock_set.call_args[0][1]
-        assert cached_data == [{"id": 1, "name": "Seller A", "customer_display_id": "SA"}]
+        mock_cache.set.assert_called_once()
+        cached_data = mock_cache.set.call_args[0][1]["value"]
+        assert cached_data == [SellerRecord(1, "Seller A", "SA")]
         assert result.items[0].name == "Seller A"
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_filter_bypasses_cache(self, mock_api, mock_get, mock_set, factory):
-        """TC-003: Seller filter bypasses cache entirely."""
+    def test_filter_falls_back_to_api_when_cache_cold(self, mock_api, mock_get, mock_cache, factory):
+        """TC-003: Seller filter goes to the API only when the seller cache is cold."""
+        mock_get.return_value = None
         api = mock_api.return_value
         api.sellers.list.return_value = _mock_paginated([_mock_seller()])
         request = _make_get(factory, "/panels/sellers/")
         svc_module.list_sellers(request, Name="foo")
 
-        mock_get.assert_not_called()
         api.sellers.list.assert_called_once_with(page_number=1, page_size=25, Name="foo")
 
+    @patch("catalog.cache.cache")
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.get_catalog_api")
+    def test_filter_served_from_warm_cache(self, mock_api, mock_get, mock_cache, factory):
+        """Seller filter is matched locally against the cached seller list."""
+        mock_get.return_value = swr_wrap([
+            {"id": 1, "name": "Maison Café", "customer_display_id": "MC"},
+            {"id": 2, "name": "Other House", "customer_display_id": "OH"},
+        ])
+        request = _make_get(factory, "/panels/sellers/")
+        result = svc_module.list_sellers(request, Name="cafe")
+
+        mock_api.assert_not_called()
+        assert [s.id for s in result.items] == [1]
+        assert result.total_items == 1
+
+    @patch("catalog.cache.cache")
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.get_catalog_api")
+    def test_filter_index_built_once_per_cache_write(self, mock_api, mock_get, mock_cache, factory):
+        """Every cache read unpickles a new list; the name index is still built once per entry."""
+        entry = swr_wrap([{"id": 1, "name": "Maison Café", "customer_display_id": "MC"}])
+        mock_get.side_effect = lambda *args, **kwargs: copy.deepcopy(entry)
+        request = _make_get(factory, "/panels/sellers/")
+
+        with patch("catalog.search_index.TextIndex", wraps=search_index.TextIndex) as build:
+            svc_module.list_sellers(request, Name="cafe")
+            svc_module.list_sellers(request, Name="maison")
+
+        assert build.call_count == 1
+
 
 class TestCatalogCacheContract:
     """Contract tests for catalog list caching (015-redis-caching TC-004..TC-005)."""
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_cache_hit_returns_cached_catalogs_no_api_call(self, mock_api, mock_get, mock_set, factory):
+    def test_cache_hit_returns_cached_catalogs_no_api_call(self, mock_api, mock_get, mock_cache, factory):
         """TC-004: Cache hit returns cached catalogs without API call."""
-        mock_get.return_value = [
+        mock_get.return_value = swr_wrap([
             {"id": 7, "title": "Spring Auction", "customer_catalog_id": "SA-2026", "start_date": "2026-03-15"},
-        ]
+        ])
         request = _make_get(factory, "/panels/sellers/42/events/")
         result = svc_module.list_catalogs(request, seller_id=42)
 
@@ -1291,10 +1404,10 @@ class TestCatalogCacheContract:
         assert len(result.items) == 1
         assert result.items[0].title == "Spring Auction"
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_cache_miss_fetches_caches_all_and_filters_future_at_return(self, mock_api, mock_get, mock_set, factory):
+    def test_cache_miss_fetches_caches_all_and_filters_future_at_return(self, mock_api, mock_get, mock_cache, factory):
         """TC-005: Cache miss fetches all events, caches all, returns only future when future_only=True."""
         mock_get.return_value = None
         api = mock_api.return_value
@@ -1306,23 +1419,51 @@ class TestCatalogCacheContract:
         result = svc_module.list_catalogs(request, seller_id=42)
 
         api.catalogs.list.assert_called_once_with(page_number=1, page_size=200, SellerIds=42)
-        mock_set.assert_called_once()
+        mock_cache.set.assert_called_once()
         # Cache stores ALL events (both future and past)
-        cached_data = mock_set.call_args[0][1]
+        cached_data = mock_cache.set.call_args[0][1]["value"]
         assert len(cached_data) == 2
-        assert {d["title"] for d in cached_data} == {"Future", "Past"}
+        assert [d.title for d in cached_data] == ["Future", "Past"]
         # But return value is filtered to future only (default future_only=True)
         assert len(result.items) == 1
         assert result.items[0].title == "Future"
 
 
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.get_catalog_api")
+    def test_title_filter_served_from_warm_cache(self, mock_api, mock_get, factory):
+        """Title filter is matched locally against the seller's cached events."""
+        mock_get.return_value = swr_wrap([
+            {"id": 1, "title": "Spring Jewelry Sale", "customer_catalog_id": "J1", "start_date": "2099-03-01T00:00:00"},
+            {"id": 2, "title": "Fall Furniture", "customer_catalog_id": "F1", "start_date": "2099-09-01T00:00:00"},
+            {"id": 3, "title": "JEWELRY Clearance", "customer_catalog_id": "J2", "start_date": "2020-01-01T00:00:00"},
+        ])
+        request = _make_get(factory, "/panels/sellers/42/events/")
+        result = svc_module.list_catalogs(request, seller_id=42, future_only=False, Title="jewelry")
+
+        mock_api.assert_not_called()
+        assert [e.id for e in result.items] == [1, 3]
+
+    @patch("catalog.cache.cache")
+    @patch("catalog.services.safe_cache_get", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_title_filter_falls_back_to_api_when_cache_cold(self, mock_api, mock_get, mock_cache, factory):
+        """Title filter goes to the API only when the seller's events are not cached."""
+        api = mock_api.return_value
+        api.catalogs.list.return_value = _mock_paginated([])
+        request = _make_get(factory, "/panels/sellers/42/events/")
+        svc_module.list_catalogs(request, seller_id=42, Title="jewelry")
+
+        api.catalogs.list.assert_called_once_with(page_number=1, page_size=25, Title="jewelry", SellerIds=42)
+
+
 class TestCacheFallbackContract:
     """Contract tests for graceful cache unavailability (015-redis-caching TC-006)."""
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_sellers_fallback_on_cache_failure(self, mock_api, mock_get, mock_set, factory):
+    def test_sellers_fallback_on_cache_failure(self, mock_api, mock_get, mock_cache, factory):
         """TC-006: Cache unavailable, sellers still fetched from API."""
         mock_get.return_value = None  # Cache miss (simulates down or empty)
         api = mock_api.return_value
@@ -1332,10 +1473,10 @@ class TestCacheFallbackContract:
 
         assert result.items[0].name == "Fallback"
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_catalogs_fallback_on_cache_failure(self, mock_api, mock_get, mock_set, factory):
+    def test_catalogs_fallback_on_cache_failure(self, mock_api, mock_get, mock_cache, factory):
         """Cache unavailable, catalogs still fetched from API."""
         mock_get.return_value = None
         api = mock_api.return_value
@@ -1351,15 +1492,15 @@ class TestCacheFallbackContract:
 class TestCachePolishContract:
     """Contract tests for cache polish fixes (016-cache-polish TC-P01..TC-P02)."""
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_start_date_survives_cache_round_trip_as_datetime(self, mock_api, mock_get, mock_set, factory):
+    def test_start_date_survives_cache_round_trip_as_datetime(self, mock_api, mock_get, mock_cache, factory):
         """TC-P01: Cached start_date ISO string is parsed back to datetime on read."""
-        mock_get.return_value = [
+        mock_get.return_value = swr_wrap([
             {"id": 7, "title": "Spring Auction", "customer_catalog_id": "SA-2026",
              "start_date": "2099-01-01T00:00:00"},
-        ]
+        ])
         request = _make_get(factory, "/panels/sellers/42/events/")
         result = svc_module.list_catalogs(request, seller_id=42)
 
@@ -1367,16 +1508,16 @@ class TestCachePolishContract:
         assert isinstance(item.start_date, datetime)
         assert item.start_date.year == 2099
 
-    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.cache.cache")
     @patch("catalog.services.safe_cache_get")
     @patch("catalog.services.get_catalog_api")
-    def test_cached_catalog_pagination_respects_page_size(self, mock_api, mock_get, mock_set, factory):
+    def test_cached_catalog_pagination_respects_page_size(self, mock_api, mock_get, mock_cache, factory):
         """TC-P02: Cached catalogs honor page/page_size args."""
-        mock_get.return_value = [
+        mock_get.return_value = swr_wrap([
             {"id": i, "title": f"Event {i}", "customer_catalog_id": f"E{i}",
              "start_date": "2099-06-01T00:00:00"}
             for i in range(30)
-        ]
+        ])
         request = _make_get(factory, "/panels/sellers/42/events/")
         result = svc_module.list_catalogs(request, page=2, page_size=25, seller_id=42)
 
@@ -1388,15 +1529,19 @@ class TestCachePolishContract:
 class TestSWRContract:
     """Contract tests for stale-while-revalidate events panel (016-cache-polish TC-SWR01..05)."""
 
+    @patch("catalog.services.swr_refresh")
+    @patch("catalog.services.safe_cache_get_many")
+    @patch("catalog.views.panels.services.list_catalogs")
     @patch("catalog.views.panels.services.list_sellers")
     @patch("catalog.views.panels.services.get_seller")
-    @patch("catalog.views.panels.safe_cache_get")
-    def test_cache_hit_includes_refresh_trigger(self, mock_cache_get, mock_seller, mock_sellers, factory):
-        """TC-SWR01: Cache hit serves HTML with fresh=1 auto-refresh trigger."""
-        mock_cache_get.return_value = [
+    def test_cache_hit_served_without_refetch(
+        self, mock_seller, mock_sellers, mock_catalogs, mock_get_many, mock_refresh, factory,
+    ):
+        """TC-SWR01: A fresh cache hit is served as-is; no background refresh, no client refetch."""
+        mock_get_many.return_value = {"catalogs_seller_1": swr_wrap([
             {"id": 1, "title": "Cached Event", "customer_catalog_id": "C1",
              "start_date": "2099-01-01T00:00:00"},
-        ]
+        ])}
         mock_seller.return_value = _mock_seller(id=1)
         mock_sellers.return_value = _mock_paginated([_mock_seller(id=1)])
         request = _make_get(factory, "/panels/sellers/1/events/")
@@ -1404,13 +1549,37 @@ class TestSWRContract:
 
         content = response.content.decode()
         assert "Cached Event" in content
-        assert "fresh=1" in content
-        assert 'hx-trigger="load"' in content
+        assert "fresh=1" not in content
+        assert "data-swr-refresh" not in content
+        mock_catalogs.assert_not_called()
+        mock_refresh.assert_not_called()
+
+    @patch("catalog.services.swr_refresh")
+    @patch("catalog.services.safe_cache_get_many")
+    @patch("catalog.views.panels.services.list_catalogs")
+    @patch("catalog.views.panels.services.list_sellers")
+    @patch("catalog.views.panels.services.get_seller")
+    def test_stale_cache_hit_refreshes_in_background(
+        self, mock_seller, mock_sellers, mock_catalogs, mock_get_many, mock_refresh, factory,
+    ):
+        """A stale cached list is still served while the refresh runs in the background."""
+        mock_get_many.return_value = {"catalogs_seller_1": swr_wrap([
+            {"id": 1, "title": "Cached Event", "customer_catalog_id": "C1",
+             "start_date": "2099-01-01T00:00:00"},
+        ], soft_ttl=-1)}
+        mock_seller.return_value = _mock_seller(id=1)
+        mock_sellers.return_value = _mock_paginated([_mock_seller(id=1)])
+        request = _make_get(factory, "/panels/sellers/1/events/")
+        response = seller_events_panel(request, seller_id=1)
+
+        assert "Cached Event" in response.content.decode()
+        mock_catalogs.assert_not_called()
+        assert mock_refresh.call_args.args[0] == "catalogs_seller_1"
 
     @patch("catalog.views.panels.services.list_sellers")
     @patch("catalog.views.panels.services.list_catalogs")
     @patch("catalog.views.panels.services.get_seller")
-    @patch("catalog.views.panels.safe_cache_get")
+    @patch("catalog.views.panels.services.prefetch_cache")
     def test_fresh_request_no_trigger(self, mock_cache_get, mock_seller, mock_catalogs, mock_sellers, factory):
         """TC-SWR02: ?fresh=1 request returns HTML without trigger div."""
         mock_seller.return_value = _mock_seller(id=1)
@@ -1433,10 +1602,10 @@ class TestSWRContract:
     @patch("catalog.views.panels.services.list_sellers")
     @patch("catalog.views.panels.services.list_catalogs")
     @patch("catalog.views.panels.services.get_seller")
-    @patch("catalog.views.panels.safe_cache_get")
+    @patch("catalog.views.panels.services.prefetch_cache")
     def test_cache_miss_no_trigger(self, mock_cache_get, mock_seller, mock_catalogs, mock_sellers, factory):
         """TC-SWR03: Cache miss returns normal HTML without refresh trigger."""
-        mock_cache_get.return_value = None
+        mock_cache_get.return_value = {}
         mock_seller.return_value = _mock_seller(id=1)
         mock_catalogs.return_value = _mock_paginated([
             _mock_event(id=1, title="API Event", start_date=datetime(2099, 1, 1)),
@@ -1456,7 +1625,7 @@ class TestSWRContract:
     @patch("catalog.views.panels.services.list_sellers")
     @patch("catalog.views.panels.services.list_catalogs")
     @patch("catalog.views.panels.services.get_seller")
-    @patch("catalog.views.panels.safe_cache_get")
+    @patch("catalog.views.panels.services.prefetch_cache")
     def test_filter_bypasses_cache_no_trigger(self, mock_cache_get, mock_seller, mock_catalogs, mock_sellers, factory):
         """TC-SWR04: Filter active bypasses cache, no trigger div."""
         mock_seller.return_value = _mock_seller(id=1)
@@ -1475,7 +1644,7 @@ class TestSWRContract:
     @patch("catalog.views.panels.services.list_sellers")
     @patch("catalog.views.panels.services.list_catalogs")
     @patch("catalog.views.panels.services.get_seller")
-    @patch("catalog.views.panels.safe_cache_get")
+    @patch("catalog.views.panels.services.prefetch_cache")
     def test_fresh_request_no_push_url(self, mock_cache_get, mock_seller, mock_catalogs, mock_sellers, factory):
         """TC-SWR05: ?fresh=1 request has no HX-Push-Url header."""
         mock_seller.return_value = _mock_seller(id=1)
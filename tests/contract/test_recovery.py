@@ -101,6 +101,27 @@ class TestRecoveryRetry:
         mock_create.assert_called_once()
         mock_remove.assert_called_once()
 
+    @patch("catalog.views.recovery.services.record_item_locations")
+    @patch("catalog.views.recovery.services.delete_lot")
+    @patch("catalog.views.recovery.services.remove_recovery_entry")
+    @patch("catalog.views.recovery.services.get_recovery_entries")
+    @patch("catalog.views.recovery.services.create_lot")
+    @patch("catalog.views.recovery.services.get_catalog_api")
+    def test_force_retry_reindexes_item(
+        self, mock_api, mock_create, mock_get_entries, mock_remove, mock_delete, mock_record, client
+    ):
+        mock_api.return_value.lots.list.return_value = SimpleNamespace(items=[SimpleNamespace(id=200)])
+        mock_get_entries.side_effect = [[SAMPLE_ENTRY], []]
+        mock_create.return_value = SimpleNamespace(id=201)
+
+        client.post("/imports/recovery/retry/2100000000/?force=true")
+
+        mock_delete.assert_called_once()
+        assert mock_delete.call_args.args[1:] == (200, "2100000000")
+        (locations,) = mock_record.call_args.args
+        assert locations["2100000000"]["lot_id"] == 201
+        assert locations["2100000000"]["catalog_id"] == 42
+
     @patch("catalog.views.recovery.services.get_recovery_entries")
     @patch("catalog.views.recovery.services.get_catalog_api")
     def test_retry_already_exists_shows_warning(self, mock_api, mock_get_entries, client):
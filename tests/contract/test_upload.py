@@ -1,15 +1,18 @@
 import json
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 import pytest
 from django.test import Client
 
+from catalog.jobs import process_upload
 from tests.conftest import AUTH_SESSION
 
 
 @pytest.fixture
-def client(staff_user):
+def client(staff_user, settings, tmp_path):
+    settings.UPLOAD_JOBS_DIR = tmp_path
     c = Client()
     c.force_login(staff_user)
     session = c.session
@@ -18,8 +21,23 @@ def client(staff_user):
     return c
 
 
-class TestUploadCatalogNewPath:
-    """Contract tests for POST /imports/upload/ — new catalog (US1)."""
+def _chunks(*catalogs):
+    """side_effect for iter_bulk_requests: a fresh single-chunk stream per call."""
+    return lambda *args, **kwargs: iter([SimpleNamespace(catalogs=list(catalogs))])
+
+
+def _catalog(customer_catalog_id="123456", lots=5):
+    return SimpleNamespace(customer_catalog_id=customer_catalog_id, lots=list(range(lots)))
+
+
+@pytest.fixture
+def job_request():
+    """Request-like object as built by the upload worker for a job."""
+    return SimpleNamespace(session=AUTH_SESSION.copy())
+
+
+class TestUploadCatalogEnqueue:
+    """Contract tests for POST /imports/upload/ — validation and job creation."""
 
     def test_no_file_returns_400(self, client):
         resp = client.post("/imports/upload/")
@@ -39,60 +57,220 @@ class TestUploadCatalogNewPath:
         assert ".txt" in data["error"]
         assert ".xlsx" in data["error"]
 
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id", return_value=None)
-    @patch("catalog.views.imports.services.bulk_insert")
-    @patch("catalog.views.imports.load_file")
-    def test_valid_file_new_catalog_returns_success(self, mock_load, mock_bulk, mock_find, client):
+    @patch("catalog.views.imports.MAX_UPLOAD_SIZE", 1048576)
+    def test_oversized_file_returns_400(self, client):
         from django.core.files.uploadedfile import SimpleUploadedFile
 
-        mock_catalog = SimpleNamespace(customer_catalog_id="123456")
-        mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
-        mock_load.return_value = (mock_bulk_req, "1 catalog, 5 lots")
+        # 1 MB + 1 byte against a 1 MB limit
+        f = SimpleUploadedFile("big.xlsx", b"x" * (1048576 + 1), content_type="application/octet-stream")
+        resp = client.post("/imports/upload/", {"file": f})
+        assert resp.status_code == 400
+        data = json.loads(resp.content)
+        assert data["success"] is False
+        assert "too large" in data["error"].lower()
 
-        # After bulk insert, find_catalog returns the new ID
-        mock_find.side_effect = [None, 42]
+    @patch("catalog.views.imports.jobs.enqueue_upload")
+    def test_valid_file_returns_202_with_job_id(self, mock_enqueue, client, tmp_path):
+        from django.core.files.uploadedfile import SimpleUploadedFile
 
+        mock_enqueue.return_value = {"id": "abc123", "status": "queued"}
         f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
         resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 200
+
+        assert resp.status_code == 202
         data = json.loads(resp.content)
         assert data["success"] is True
-        assert "redirect" in data
-        mock_bulk.assert_called_once()
-
-    @patch("catalog.views.imports.load_file", side_effect=ValueError("missing column 'Catalog ID'"))
-    def test_parse_failure_returns_400(self, mock_load, client):
+        assert data["job_id"] == "abc123"
+        assert data["status"] == "queued"
+        assert data["status_url"] == "/imports/jobs/abc123/"
+        # File is persisted for the worker, with its original extension
+        saved_path, filename = mock_enqueue.call_args[0][1:]
+        assert saved_path.parent == tmp_path
+        assert saved_path.suffix == ".xlsx"
+        assert saved_path.read_bytes() == b"fake"
+        assert filename == "catalog.xlsx"
+
+    @patch("catalog.views.imports.jobs.enqueue_upload", side_effect=ConnectionError("Redis down"))
+    def test_queue_unavailable_returns_503_and_removes_file(self, mock_enqueue, client, tmp_path):
         from django.core.files.uploadedfile import SimpleUploadedFile
 
-        f = SimpleUploadedFile("bad.xlsx", b"fake", content_type="application/octet-stream")
+        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
         resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 400
+
+        assert resp.status_code == 503
         data = json.loads(resp.content)
         assert data["success"] is False
-        assert "Failed to parse file" in data["error"]
+        assert "queue unavailable" in data["error"].lower()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestUploadJobStatus:
+    """Contract tests for GET /imports/jobs/{job_id}/ — progress polling."""
+
+    def _job(self, **overrides):
+        job = {
+            "id": "abc123",
+            "status": "running",
+            "filename": "catalog.xlsx",
+            "file_path": "/tmp/x.xlsx",
+            "username": AUTH_SESSION["abc_username"],
+            "session_key": "secret",
+            "progress": {"added": 3, "updated": 1, "unchanged": 0, "failed": 1, "total": 10},
+            "result": None,
+        }
+        job.update(overrides)
+        return job
 
-    @patch("catalog.views.imports.load_file")
-    def test_empty_file_returns_400(self, mock_load, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
+    @patch("catalog.views.imports.jobs.get_job")
+    def test_running_job_reports_progress(self, mock_get_job, client):
+        mock_get_job.return_value = self._job()
+        resp = client.get("/imports/jobs/abc123/")
+
+        assert resp.status_code == 200
+        data = json.loads(resp.content)
+        assert data["status"] == "running"
+        assert data["progress"]["added"] == 3
+        assert data["progress"]["failed"] == 1
+        assert "result" not in data
+        assert "session_key" not in data
+        assert "file_path" not in data
+
+    @patch("catalog.views.imports.jobs.get_job")
+    def test_finished_job_includes_result(self, mock_get_job, client):
+        result = {"success": True, "redirect": "/?seller=1874&event=123456"}
+        mock_get_job.return_value = self._job(status="succeeded", result=result)
+        resp = client.get("/imports/jobs/abc123/")
 
-        mock_load.return_value = (SimpleNamespace(catalogs=[]), "empty")
-        f = SimpleUploadedFile("empty.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 400
         data = json.loads(resp.content)
+        assert data["status"] == "succeeded"
+        assert data["result"] == result
+
+    @patch("catalog.views.imports.jobs.get_job", return_value=None)
+    def test_unknown_job_returns_404(self, mock_get_job, client):
+        resp = client.get("/imports/jobs/nope/")
+        assert resp.status_code == 404
+
+    @patch("catalog.views.imports.jobs.get_job")
+    def test_other_users_job_returns_404(self, mock_get_job, client):
+        mock_get_job.return_value = self._job(username="someone-else@example.com")
+        resp = client.get("/imports/jobs/abc123/")
+        assert resp.status_code == 404
+
+
+class TestUploadCatalogNewPath:
+    """Contract tests for upload processing — new catalog (US1)."""
+
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.jobs.services.bulk_insert", return_value={"inserted": 5, "failed": 0, "errors": []})
+    @patch("catalog.jobs.iter_bulk_requests", side_effect=_chunks(_catalog()))
+    def test_valid_file_new_catalog_returns_success(self, mock_iter, mock_bulk, mock_find, job_request):
+        # After bulk insert, find_catalog returns the new ID
+        mock_find.side_effect = [None, 42]
+
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
+        assert status == 200
+        assert data["success"] is True
+        assert "redirect" in data
+        mock_bulk.assert_called_once()
+
+    @patch("catalog.jobs.iter_bulk_requests", side_effect=ValueError("missing column 'Catalog ID'"))
+    def test_parse_failure_returns_400(self, mock_iter, job_request):
+        data, status = process_upload(job_request, Path("bad.xlsx"))
+        assert status == 400
+        assert data["success"] is False
+        assert "Failed to parse file" in data["error"]
+
+    @patch("catalog.jobs.services.bulk_insert", return_value={"inserted": 5, "failed": 0, "errors": []})
+    @patch("catalog.jobs.iter_bulk_requests")
+    def test_parse_failure_late_in_file_inserts_nothing(self, mock_iter, mock_bulk, job_request):
+        def broken_stream(*args, **kwargs):
+            yield SimpleNamespace(catalogs=[_catalog()])
+            raise ValueError("Cannot parse datetime: soon")
+
+        mock_iter.side_effect = broken_stream
+        data, status = process_upload(job_request, Path("bad.xlsx"))
+        assert status == 400
+        assert "Cannot parse datetime" in data["error"]
+        mock_bulk.assert_not_called()
+
+    @patch("catalog.jobs.iter_bulk_requests", side_effect=lambda *a, **k: iter([]))
+    def test_empty_file_returns_400(self, mock_iter, job_request):
+        data, status = process_upload(job_request, Path("empty.xlsx"))
+        assert status == 400
         assert data["success"] is False
         assert "no catalog data" in data["error"]
 
+    @patch("catalog.jobs.services.get_catalog")
+    @patch("catalog.jobs.services.find_catalog_by_customer_id")
+    @patch("catalog.jobs.services.bulk_insert", return_value={"inserted": 5, "failed": 0, "errors": []})
+    @patch("catalog.jobs.iter_bulk_requests", side_effect=_chunks(_catalog()))
+    def test_new_catalog_deep_link_redirect(self, mock_iter, mock_bulk, mock_find, mock_get_cat, job_request):
+        mock_find.side_effect = [None, 42]  # first call: not existing, second: after insert
+        mock_get_cat.return_value = SimpleNamespace(
+            sellers=[SimpleNamespace(customer_display_id="1874")],
+        )
+
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
+        assert "seller=1874" in data["redirect"]
+        assert "event=123456" in data["redirect"]
+
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.jobs.services.bulk_insert", return_value={"inserted": 5, "failed": 0, "errors": []})
+    @patch("catalog.jobs.iter_bulk_requests")
+    def test_inserts_each_chunk_and_reports_progress(self, mock_iter, mock_bulk, mock_find, job_request):
+        chunks = [
+            SimpleNamespace(catalogs=[_catalog(lots=2)]),
+            SimpleNamespace(catalogs=[_catalog(lots=1)]),
+        ]
+        mock_iter.side_effect = lambda *a, **k: iter(chunks)
+        mock_bulk.side_effect = [
+            {"inserted": 2, "failed": 0, "errors": []},
+            {"inserted": 1, "failed": 0, "errors": []},
+        ]
+        progress = MagicMock()
+
+        process_upload(job_request, Path("catalog.xlsx"), on_progress=progress)
+
+        assert [c.args[1] for c in mock_bulk.call_args_list] == chunks
+        assert [c.args[0]["added"] for c in progress.call_args_list] == [0, 2, 3]
+        assert progress.call_args_list[0].args[0]["total"] == 3
+
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.jobs.services.bulk_insert")
+    @patch("catalog.jobs.iter_bulk_requests", side_effect=_chunks(_catalog()))
+    def test_partial_bulk_failure_reports_recovery(self, mock_iter, mock_bulk, mock_find, job_request):
+        mock_bulk.return_value = {
+            "inserted": 3, "failed": 2, "errors": ["Failed to insert 2 lots into catalog 123456: 503"],
+        }
+
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
+
+        assert status == 200
+        assert data["import"] == {"added": 3, "failed": 2}
+        assert data["warnings"] == ["Failed to insert 2 lots into catalog 123456: 503"]
+        assert "/imports/recovery/" in data["recovery_url"]
+
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.jobs.services.bulk_insert", return_value={"inserted": 5, "failed": 0, "errors": []})
+    @patch("catalog.jobs.iter_bulk_requests", side_effect=_chunks(_catalog()))
+    def test_chunk_size_comes_from_settings(self, mock_iter, mock_bulk, mock_find, job_request, settings):
+        settings.CATALOG_IMPORT_CHUNK_LOTS = 7
+        process_upload(job_request, Path("catalog.xlsx"))
+        assert all(c.kwargs["chunk_lots"] == 7 for c in mock_iter.call_args_list)
+
 
 class TestUploadCatalogMergePath:
-    """Contract tests for POST /imports/upload/ — merge path (US2)."""
+    """Contract tests for upload processing — merge path (US2)."""
 
-    @patch("catalog.views.imports.services.merge_catalog")
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id", return_value=42)
-    @patch("catalog.views.imports.load_file")
-    def test_merge_returns_success_with_summary(self, mock_load, mock_find, mock_merge, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
+    @pytest.fixture(autouse=True)
+    def _stream(self):
+        with patch("catalog.jobs.iter_bulk_requests", side_effect=_chunks(_catalog())):
+            yield
 
+    @patch("catalog.jobs.services.merge_catalog")
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.jobs.load_file")
+    def test_merge_returns_success_with_summary(self, mock_load, mock_find, mock_merge, job_request):
         mock_catalog = SimpleNamespace(customer_catalog_id="123456")
         mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
         mock_load.return_value = (mock_bulk_req, "1 catalog, 10 lots")
@@ -100,10 +278,8 @@ class TestUploadCatalogMergePath:
             "added": 3, "updated": 2, "unchanged": 5, "failed": 0, "errors": [],
         }
 
-        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 200
-        data = json.loads(resp.content)
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
+        assert status == 200
         assert data["success"] is True
         assert data["merge"]["added"] == 3
         assert data["merge"]["updated"] == 2
@@ -115,29 +291,23 @@ class TestUploadCatalogMergePath:
         assert call_args[1] is mock_bulk_req
         assert call_args[2] == 42
 
-    @patch("catalog.views.imports.services.merge_catalog", side_effect=Exception("connection timeout"))
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id", return_value=42)
-    @patch("catalog.views.imports.load_file")
-    def test_merge_failure_returns_500(self, mock_load, mock_find, mock_merge, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
-
+    @patch("catalog.jobs.services.merge_catalog", side_effect=Exception("connection timeout"))
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.jobs.load_file")
+    def test_merge_failure_returns_500(self, mock_load, mock_find, mock_merge, job_request):
         mock_catalog = SimpleNamespace(customer_catalog_id="123456")
         mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
         mock_load.return_value = (mock_bulk_req, "1 catalog")
 
-        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 500
-        data = json.loads(resp.content)
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
+        assert status == 500
         assert data["success"] is False
         assert "Merge failed" in data["error"]
 
-    @patch("catalog.views.imports.services.merge_catalog")
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id", return_value=42)
-    @patch("catalog.views.imports.load_file")
-    def test_merge_with_failures_includes_warnings(self, mock_load, mock_find, mock_merge, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
-
+    @patch("catalog.jobs.services.merge_catalog")
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.jobs.load_file")
+    def test_merge_with_failures_includes_warnings(self, mock_load, mock_find, mock_merge, job_request):
         mock_catalog = SimpleNamespace(customer_catalog_id="123456")
         mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
         mock_load.return_value = (mock_bulk_req, "1 catalog")
@@ -146,20 +316,16 @@ class TestUploadCatalogMergePath:
             "errors": ["Failed to update lot ABC-001: server error"],
         }
 
-        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 200
-        data = json.loads(resp.content)
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
+        assert status == 200
         assert data["success"] is True
         assert data["merge"]["failed"] == 1
         assert len(data["warnings"]) == 1
 
-    @patch("catalog.views.imports.services.merge_catalog")
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id", return_value=42)
-    @patch("catalog.views.imports.load_file")
-    def test_merge_with_failures_includes_recovery_url(self, mock_load, mock_find, mock_merge, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
-
+    @patch("catalog.jobs.services.merge_catalog")
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.jobs.load_file")
+    def test_merge_with_failures_includes_recovery_url(self, mock_load, mock_find, mock_merge, job_request):
         mock_catalog = SimpleNamespace(customer_catalog_id="123456")
         mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
         mock_load.return_value = (mock_bulk_req, "1 catalog")
@@ -168,18 +334,14 @@ class TestUploadCatalogMergePath:
             "errors": ["server error"],
         }
 
-        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        data = json.loads(resp.content)
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
         assert "recovery_url" in data
         assert "/imports/recovery/" in data["recovery_url"]
 
-    @patch("catalog.views.imports.services.merge_catalog")
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id", return_value=42)
-    @patch("catalog.views.imports.load_file")
-    def test_merge_deep_link_redirect(self, mock_load, mock_find, mock_merge, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
-
+    @patch("catalog.jobs.services.merge_catalog")
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.jobs.load_file")
+    def test_merge_deep_link_redirect(self, mock_load, mock_find, mock_merge, job_request):
         mock_catalog = SimpleNamespace(customer_catalog_id="123456")
         mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
         mock_load.return_value = (mock_bulk_req, "1 catalog")
@@ -189,40 +351,18 @@ class TestUploadCatalogMergePath:
             "customer_catalog_id": "123456",
         }
 
-        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        data = json.loads(resp.content)
+        data, status = process_upload(job_request, Path("catalog.xlsx"))
         assert "seller=1874" in data["redirect"]
         assert "event=123456" in data["redirect"]
 
-    @patch("catalog.views.imports.services.get_catalog")
-    @patch("catalog.views.imports.services.find_catalog_by_customer_id")
-    @patch("catalog.views.imports.services.bulk_insert")
-    @patch("catalog.views.imports.load_file")
-    def test_new_catalog_deep_link_redirect(self, mock_load, mock_bulk, mock_find, mock_get_cat, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
-
-        mock_catalog = SimpleNamespace(customer_catalog_id="123456")
-        mock_bulk_req = SimpleNamespace(catalogs=[mock_catalog])
-        mock_load.return_value = (mock_bulk_req, "1 catalog, 5 lots")
-        mock_find.side_effect = [None, 42]  # first call: not existing, second: after insert
-        mock_get_cat.return_value = SimpleNamespace(
-            sellers=[SimpleNamespace(customer_display_id="1874")],
-        )
-
-        f = SimpleUploadedFile("catalog.xlsx", b"fake", content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        data = json.loads(resp.content)
-        assert "seller=1874" in data["redirect"]
-        assert "event=123456" in data["redirect"]
+    @patch("catalog.jobs.services.merge_catalog")
+    @patch("catalog.jobs.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.jobs.load_file")
+    def test_merge_receives_progress_callback(self, mock_load, mock_find, mock_merge, job_request):
+        mock_load.return_value = (SimpleNamespace(catalogs=[SimpleNamespace(customer_catalog_id="1")]), "")
+        mock_merge.return_value = {"added": 0, "updated": 0, "unchanged": 1, "failed": 0, "errors": []}
+        progress = MagicMock()
 
-    def test_oversized_file_returns_400(self, client):
-        from django.core.files.uploadedfile import SimpleUploadedFile
+        process_upload(job_request, Path("catalog.xlsx"), on_progress=progress)
 
-        # 1.1 MB file
-        f = SimpleUploadedFile("big.xlsx", b"x" * (1048576 + 1), content_type="application/octet-stream")
-        resp = client.post("/imports/upload/", {"file": f})
-        assert resp.status_code == 400
-        data = json.loads(resp.content)
-        assert data["success"] is False
-        assert "too large" in data["error"].lower()
+        assert mock_merge.call_args.kwargs["on_progress"] is progress
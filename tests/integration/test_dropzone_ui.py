@@ -91,12 +91,14 @@ class TestDropzoneUI:
         assert "sessionStorage.getItem" in content
         assert "sessionStorage.removeItem" in content
 
-    def test_client_side_file_size_check(self, mock_sellers, client):
+    def test_client_side_file_size_check(self, mock_sellers, client, settings):
+        settings.CATALOG_MAX_UPLOAD_SIZE = 20 * 1048576
         mock_sellers.return_value = _mock_paginated()
         resp = client.get("/")
         content = resp.content.decode()
-        assert "file.size > 1048576" in content
-        assert "File too large" in content
+        assert "var maxUploadSize = 20971520;" in content
+        assert "file.size > maxUploadSize" in content
+        assert "File too large (max 20 MB)" in content
 
     def test_100pct_failure_detection(self, mock_sellers, client):
         mock_sellers.return_value = _mock_paginated()
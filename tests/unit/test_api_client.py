@@ -0,0 +1,251 @@
+"""Unit tests for catalog.api_client — pooled session and request-scoped handlers."""
+
+import email
+import http.client
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from ABConnect.exceptions import ABConnectError
+from requests.cookies import MockRequest, MockResponse
+
+from catalog import api_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    api_client.reset_http_session()
+    api_client.api_breaker.reset()
+    yield
+    api_client.reset_http_session()
+    api_client.api_breaker.reset()
+
+
+def _token_storage(access_token):
+    return SimpleNamespace(get_token=lambda: {"access_token": access_token})
+
+
+class TestHttpSession:
+    def test_one_session_shared_across_threads(self):
+        sessions = []
+        threads = [
+            threading.Thread(target=lambda: sessions.append(api_client.get_http_session()))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(s) for s in sessions}) == 1
+
+    def test_pool_size_and_keep_alive_from_settings(self, settings):
+        settings.CATALOG_API_POOL_SIZE = 7
+        settings.CATALOG_API_KEEP_ALIVE = False
+
+        session = api_client.get_http_session()
+
+        assert session.get_adapter("https://catalog-api.abconnect.co")._pool_maxsize == 7
+        assert session.headers["Connection"] == "close"
+
+
+    def test_shared_session_keeps_no_cookies(self):
+        session = api_client.get_http_session()
+        headers = email.message_from_string("Set-Cookie: sid=user-a; Path=/\r\n\r\n", _class=http.client.HTTPMessage)
+        sent = requests.Request("GET", "https://catalog-api.abconnect.co/api/Lot/1").prepare()
+
+        session.cookies.extract_cookies(MockResponse(headers), MockRequest(sent))
+
+        assert len(session.cookies) == 0
+
+
+class TestPooledCatalogRequestHandler:
+    @patch("catalog.api_client.get_http_session")
+    def test_sends_through_shared_session_with_token(self, mock_session):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"ok": True}
+        mock_session.return_value.request.return_value = response
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok-1"))
+
+        result = handler.call("get", "/Lot/5", params={"x": 1})
+
+        assert result == {"ok": True}
+        kwargs = mock_session.return_value.request.call_args.kwargs
+        assert kwargs["method"] == "GET"
+        assert kwargs["url"] == f"{handler.base_url}Lot/5"
+        assert kwargs["headers"]["Authorization"] == "Bearer tok-1"
+        assert kwargs["params"] == {"x": 1}
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def breaker_settings(self, settings):
+        settings.CATALOG_API_BREAKER_MIN_CALLS = 4
+        settings.CATALOG_API_BREAKER_ERROR_RATE = 0.5
+        settings.CATALOG_API_BREAKER_WINDOW = 60
+        settings.CATALOG_API_BREAKER_COOLDOWN = 60
+        return settings
+
+    @patch("catalog.api_client.get_http_session")
+    def test_opens_at_error_rate_and_fails_fast(self, mock_session, breaker_settings):
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {}
+        mock_session.return_value.request.side_effect = [
+            ok, requests.ConnectionError("down"), MagicMock(status_code=503), requests.Timeout("slow"),
+        ]
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"))
+
+        handler.call("get", "/Lot/1")
+        for _ in range(3):
+            with pytest.raises(Exception):
+                handler.call("get", "/Lot/1")
+        with pytest.raises(api_client.CatalogAPIUnavailable):
+            handler.call("get", "/Lot/1")
+
+        assert mock_session.return_value.request.call_count == 4
+        assert api_client.api_circuit_state()["state"] == "open"
+        assert api_client.api_circuit_state()["rejected"] == 1
+
+    @patch("catalog.api_client.get_http_session")
+    def test_client_errors_do_not_open(self, mock_session, breaker_settings):
+        mock_session.return_value.request.return_value = MagicMock(status_code=404)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"))
+
+        for _ in range(6):
+            with pytest.raises(Exception):
+                handler.call("get", "/Lot/1")
+
+        assert api_client.api_circuit_state()["state"] == "closed"
+
+    @patch("catalog.api_client.get_http_session")
+    def test_trial_call_after_cooldown_closes(self, mock_session, breaker_settings):
+        breaker_settings.CATALOG_API_BREAKER_MIN_CALLS = 1
+        breaker_settings.CATALOG_API_BREAKER_COOLDOWN = 0
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"ok": True}
+        mock_session.return_value.request.side_effect = [requests.ConnectionError("down"), ok]
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"))
+        with pytest.raises(requests.ConnectionError):
+            handler.call("get", "/Lot/1")
+        assert api_client.api_circuit_state()["state"] == "open"
+
+        assert handler.call("get", "/Lot/1") == {"ok": True}
+        assert api_client.api_circuit_state()["state"] == "closed"
+
+    def test_failed_trial_reopens(self, breaker_settings):
+        breaker = api_client._CircuitBreaker()
+        breaker_settings.CATALOG_API_BREAKER_MIN_CALLS = 1
+        breaker_settings.CATALOG_API_BREAKER_COOLDOWN = 0
+        breaker.record(failed=True)
+
+        breaker.before_call()  # the trial
+        assert breaker.state()["state"] == "half_open"
+        with pytest.raises(api_client.CatalogAPIUnavailable):
+            breaker.before_call()  # only one trial at a time
+        breaker.record(failed=True)
+
+        assert breaker.state()["state"] == "open"
+
+
+class TestRequestDeadline:
+    @patch("catalog.api_client.get_http_session")
+    def test_timeouts_bounded_by_remaining_budget(self, mock_session, settings):
+        settings.CATALOG_API_CONNECT_TIMEOUT = 5
+        settings.CATALOG_API_READ_TIMEOUT = 30
+        mock_session.return_value.request.return_value = MagicMock(status_code=200)
+        request = SimpleNamespace()
+        api_client.set_deadline(request, 2)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"), request=request)
+
+        handler.call("get", "/Lot/5")
+
+        connect, read = mock_session.return_value.request.call_args.kwargs["timeout"]
+        assert connect <= 2 and read <= 2
+
+    @patch("catalog.api_client.get_http_session")
+    def test_default_timeouts_without_budget(self, mock_session, settings):
+        settings.CATALOG_API_CONNECT_TIMEOUT = 5
+        settings.CATALOG_API_READ_TIMEOUT = 30
+        mock_session.return_value.request.return_value = MagicMock(status_code=200)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"))
+
+        handler.call("get", "/Lot/5")
+
+        assert mock_session.return_value.request.call_args.kwargs["timeout"] == (5, 30)
+
+    @patch("catalog.api_client.get_http_session")
+    def test_spent_budget_skips_the_call(self, mock_session):
+        request = SimpleNamespace()
+        api_client.set_deadline(request, 0)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"), request=request)
+
+        with pytest.raises(ABConnectError) as exc_info:
+            handler.call("get", "/Lot/5")
+
+        assert exc_info.value.code == "DEADLINE_EXCEEDED"
+        mock_session.return_value.request.assert_not_called()
+
+    @patch("catalog.api_client.get_http_session")
+    def test_timeout_inside_budget_is_a_deadline_error(self, mock_session):
+        mock_session.return_value.request.side_effect = requests.ReadTimeout("slow")
+        request = SimpleNamespace()
+        api_client.set_deadline(request, 1)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"), request=request)
+
+        with pytest.raises(ABConnectError) as exc_info:
+            handler.call("get", "/Lot/5")
+
+        assert exc_info.value.code == "DEADLINE_EXCEEDED"
+
+    @patch("catalog.api_client.rate_limit.release")
+    @patch("catalog.api_client.rate_limit.acquire", return_value="tok")
+    @patch("catalog.api_client.get_http_session")
+    def test_budget_timeout_spares_breaker_and_limiter(self, mock_session, mock_acquire, mock_release, settings):
+        settings.CATALOG_API_BREAKER_MIN_CALLS = 1
+        mock_session.return_value.request.side_effect = requests.ReadTimeout("slow")
+        request = SimpleNamespace()
+        api_client.set_deadline(request, 1)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"), request=request)
+
+        for _ in range(3):
+            with pytest.raises(ABConnectError):
+                handler.call("get", "/Lot/5")
+
+        assert api_client.api_circuit_state()["state"] == "closed"
+        assert api_client.api_circuit_state()["recent_failures"] == 0
+        assert mock_release.call_args.args == ("tok",)
+        assert mock_release.call_args.kwargs == {"adapt": False}
+
+    @patch("catalog.api_client.get_http_session")
+    def test_budget_timeout_hands_the_half_open_trial_on(self, mock_session, settings):
+        settings.CATALOG_API_BREAKER_COOLDOWN = 0
+        api_client.api_breaker._open(0)
+        mock_session.return_value.request.side_effect = requests.ReadTimeout("slow")
+        request = SimpleNamespace()
+        api_client.set_deadline(request, 1)
+        handler = api_client.PooledCatalogRequestHandler(_token_storage("tok"), request=request)
+        with pytest.raises(ABConnectError):
+            handler.call("get", "/Lot/5")
+
+        mock_session.return_value.request.side_effect = None
+        mock_session.return_value.request.return_value = MagicMock(status_code=200)
+        api_client.PooledCatalogRequestHandler(_token_storage("tok")).call("get", "/Lot/5")
+
+        assert api_client.api_circuit_state()["state"] == "closed"
+
+
+class TestBuildCatalogApi:
+    @patch("catalog.api_client.SessionTokenStorage")
+    def test_endpoints_keep_their_own_request_token(self, mock_storage):
+        mock_storage.side_effect = lambda request: _token_storage(request.token)
+
+        first = api_client.build_catalog_api(SimpleNamespace(token="alice"))
+        second = api_client.build_catalog_api(SimpleNamespace(token="bob"))
+
+        # Building the second API must not re-point the first one's endpoints
+        assert first.lots._handler._get_auth_headers()["Authorization"] == "Bearer alice"
+        assert second.lots._handler._get_auth_headers()["Authorization"] == "Bearer bob"
+        for endpoint in (first.catalogs, first.sellers, first.bulk):
+            assert endpoint._handler is first.lots._handler
+            assert isinstance(endpoint._handler, api_client.PooledCatalogRequestHandler)
@@ -0,0 +1,156 @@
+"""Unit tests for serving cached data while the Catalog API is down."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from ABConnect.api.models.catalog import CatalogExpandedDto
+from ABConnect.exceptions import RequestError
+from django.core.cache.backends.locmem import LocMemCache
+
+from catalog import services
+from catalog.api_client import CatalogAPIUnavailable
+from catalog.cache import swr_fill, swr_set
+from catalog.records import EventRecord, SellerRecord
+
+
+@pytest.fixture(autouse=True)
+def local_cache():
+    backend = LocMemCache("api-fallback-tests", {})
+    with patch("catalog.cache.cache", backend):
+        yield backend
+    backend.clear()
+
+
+def _catalog_dto():
+    return CatalogExpandedDto.model_validate({
+        "id": 7,
+        "customerCatalogId": "CAT001",
+        "title": "Spring Sale",
+        "startDate": "2099-01-01T10:00:00",
+        "endDate": "2099-01-02T10:00:00",
+        "isCompleted": False,
+        "sellers": [{"id": 42, "name": "Acme", "customerDisplayId": 4098, "isActive": True}],
+        "lots": [{"id": 100, "lotNumber": "1"}],
+    })
+
+
+class TestGetCatalogFallback:
+    @patch("catalog.services.get_catalog_api")
+    def test_serves_last_fetched_event_when_api_down(self, mock_api):
+        mock_api.return_value.catalogs.get.return_value = _catalog_dto()
+        services.get_catalog(SimpleNamespace(), 7)
+
+        mock_api.return_value.catalogs.get.side_effect = CatalogAPIUnavailable()
+        request = SimpleNamespace()
+        catalog = services.get_catalog(request, 7)
+
+        assert catalog == _catalog_dto()
+        assert services.served_stale(request)
+
+    @patch("catalog.services.get_catalog_api")
+    def test_outage_without_snapshot_raises(self, mock_api):
+        mock_api.return_value.catalogs.get.side_effect = requests.ConnectionError("down")
+
+        with pytest.raises(requests.ConnectionError):
+            services.get_catalog(SimpleNamespace(), 7)
+
+    @patch("catalog.services.get_catalog_api")
+    def test_not_found_is_not_masked(self, mock_api):
+        mock_api.return_value.catalogs.get.return_value = _catalog_dto()
+        services.get_catalog(SimpleNamespace(), 7)
+
+        mock_api.return_value.catalogs.get.side_effect = RequestError(404, "Not found")
+        request = SimpleNamespace()
+        with pytest.raises(RequestError):
+            services.get_catalog(request, 7)
+        assert not services.served_stale(request)
+
+
+class TestCatalogSnapshotWrites:
+    @patch("catalog.services.safe_cache_set_many")
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.get_catalog_api")
+    def test_unchanged_event_is_not_rewritten(self, mock_api, mock_set, mock_set_many):
+        mock_api.return_value.catalogs.get.return_value = _catalog_dto()
+
+        services.get_catalog(SimpleNamespace(), 7)
+        services.get_catalog(SimpleNamespace(), 7)
+
+        assert mock_set.call_count == 1
+        assert mock_set_many.call_count == 2  # catalog and seller id maps, first read only
+
+    @patch("catalog.services.safe_cache_set_many")
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.get_catalog_api")
+    def test_changed_event_is_rewritten(self, mock_api, mock_set, mock_set_many):
+        mock_api.return_value.catalogs.get.return_value = _catalog_dto()
+        services.get_catalog(SimpleNamespace(), 7)
+
+        changed = _catalog_dto().model_copy(update={"title": "Renamed"})
+        mock_api.return_value.catalogs.get.return_value = changed
+        services.get_catalog(SimpleNamespace(), 7)
+
+        assert mock_set.call_count == 2
+        assert mock_set.call_args.args[1]["title"] == "Renamed"
+
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.get_catalog_api")
+    def test_unchanged_event_rewritten_after_interval(self, mock_api, mock_set, monkeypatch):
+        mock_api.return_value.catalogs.get.return_value = _catalog_dto()
+        services.get_catalog(SimpleNamespace(), 7)
+
+        monkeypatch.setattr(services.catalog_snapshot_writes, "REWRITE_INTERVAL", 0)
+        services.get_catalog(SimpleNamespace(), 7)
+
+        assert mock_set.call_count == 2
+
+
+class TestListFallback:
+    @patch("catalog.services.get_catalog_api")
+    def test_fresh_events_fall_back_to_cache(self, mock_api):
+        events = [EventRecord(1, "Spring Sale", "C1", datetime(2099, 1, 1))]
+        swr_fill("catalogs_seller_42", lambda: events)
+        mock_api.return_value.catalogs.list.side_effect = CatalogAPIUnavailable()
+        request = SimpleNamespace()
+
+        result = services.list_catalogs(request, seller_id=42, use_cache=False)
+        filtered = services.list_catalogs(request, seller_id=42, use_cache=False, Title="spring")
+
+        assert [e.id for e in result.items] == [1]
+        assert [e.id for e in filtered.items] == [1]
+        assert services.served_stale(request)
+
+    @patch("catalog.services.get_catalog_api")
+    def test_get_seller_falls_back_to_id_map(self, mock_api):
+        services.remember_sellers([SellerRecord(42, "Acme", 4098)])
+        mock_api.return_value.sellers.get.side_effect = CatalogAPIUnavailable()
+        request = SimpleNamespace()
+
+        assert services.get_seller(request, 42) == SellerRecord(42, "Acme", 4098)
+        assert services.served_stale(request)
+
+    @patch("catalog.services._api_down", return_value=True)
+    def test_stale_list_flagged_while_api_down(self, _):
+        swr_set("sellers_all", [SellerRecord(1, "A", "S1")], soft_ttl=0)
+        request = SimpleNamespace(session={})
+
+        with patch("catalog.services.swr_refresh"):
+            result = services.list_sellers(request)
+
+        assert [s.id for s in result.items] == [1]
+        assert services.served_stale(request)
+
+    @patch("catalog.services.get_catalog_api")
+    def test_fresh_request_is_not_flagged(self, mock_api):
+        mock_api.return_value = MagicMock()
+        mock_api.return_value.sellers.list.return_value = SimpleNamespace(
+            items=[SellerRecord(1, "A", "S1")], total_pages=1,
+        )
+        request = SimpleNamespace()
+
+        services.list_sellers(request)
+
+        assert not services.served_stale(request)
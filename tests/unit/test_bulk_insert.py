@@ -0,0 +1,219 @@
+"""Unit tests for services.split_bulk_request and chunked services.bulk_insert."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from ABConnect.exceptions import RequestError
+
+from catalog.importers import CatalogDataBuilder
+from catalog.services import bulk_insert, split_bulk_request
+
+
+def _bulk_request(lots=5, catalogs=("123456",)):
+    builder = CatalogDataBuilder()
+    for catalog_id in catalogs:
+        for i in range(lots):
+            builder.add_row({
+                "Catalog ID": catalog_id,
+                "House ID": 1874,
+                "House Name": "Test House",
+                "Catalog Title": "Spring Sale",
+                "Catalog Start Date": "2099-05-01 10:00:00",
+                "Lot ID": 1000 + i,
+                "Lot Num": str(i + 1),
+                "Lot Title": f"Lot {i + 1}",
+            })
+    return builder.build()
+
+
+def _request():
+    return SimpleNamespace(session={"abc_username": "test"})
+
+
+class TestSplitBulkRequest:
+    def test_splits_by_lot_count(self):
+        batches = split_bulk_request(_bulk_request(5), max_lots=2, max_bytes=10**9)
+
+        assert [len(b.catalogs[0].lots) for b in batches] == [2, 2, 1]
+        for batch in batches:
+            assert batch.catalogs[0].customer_catalog_id == "123456"
+            assert batch.catalogs[0].sellers[0].customer_display_id == 1874
+
+    def test_splits_by_bytes(self):
+        batches = split_bulk_request(_bulk_request(3), max_lots=100, max_bytes=1)
+        assert [len(b.catalogs[0].lots) for b in batches] == [1, 1, 1]
+
+    def test_one_catalog_per_batch(self):
+        batches = split_bulk_request(_bulk_request(2, catalogs=("1", "2")), max_lots=100, max_bytes=10**9)
+        assert [b.catalogs[0].customer_catalog_id for b in batches] == ["1", "2"]
+
+    def test_defaults_from_settings(self, settings):
+        settings.CATALOG_BULK_BATCH_LOTS = 3
+        settings.CATALOG_BULK_BATCH_BYTES = 10**9
+        assert [len(b.catalogs[0].lots) for b in split_bulk_request(_bulk_request(4))] == [3, 1]
+
+
+@pytest.fixture
+def small_batches(settings):
+    settings.CATALOG_BULK_BATCH_LOTS = 2
+    settings.CATALOG_BULK_BATCH_BYTES = 10**9
+    settings.CATALOG_MERGE_RETRY_BACKOFF = 0
+
+
+@pytest.mark.usefixtures("small_batches")
+class TestBulkInsert:
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_first_batch_creates_catalog_before_the_rest(self, mock_api, mock_cache):
+        lock = threading.Lock()
+        calls = []
+
+        def insert(batch):
+            with lock:
+                calls.append([lot.customer_item_id for lot in batch.catalogs[0].lots])
+
+        mock_api.return_value.bulk.insert.side_effect = insert
+
+        result = bulk_insert(_request(), _bulk_request(5))
+
+        assert result == {"inserted": 5, "failed": 0, "errors": []}
+        assert calls[0] == ["1000", "1001"]
+        assert sorted(calls[1:]) == [["1002", "1003"], ["1004"]]
+        mock_cache.assert_not_called()
+
+    @patch("catalog.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_failed_leader_is_replaced_by_the_next_batch(self, mock_api, mock_cache, mock_find):
+        lock = threading.Lock()
+        calls = []
+        in_flight = {"now": 0, "peak": 0}
+
+        def insert(batch):
+            ids = [lot.customer_item_id for lot in batch.catalogs[0].lots]
+            with lock:
+                calls.append(ids)
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+            if ids[0] == "1000":
+                raise RequestError(400, "Bad catalog")
+
+        mock_api.return_value.bulk.insert.side_effect = insert
+
+        result = bulk_insert(_request(), _bulk_request(5))
+
+        assert calls == [["1000", "1001"], ["1002", "1003"], ["1004"]]
+        assert in_flight["peak"] == 1
+        assert (result["inserted"], result["failed"]) == (3, 2)
+        assert [c.args[1]["customer_item_id"] for c in mock_cache.call_args_list] == ["1000", "1001"]
+
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_transient_error_is_retried(self, mock_api, mock_cache):
+        mock_api.return_value.bulk.insert.side_effect = [RequestError(503, "Service Unavailable"), None]
+
+        result = bulk_insert(_request(), _bulk_request(2))
+
+        assert result["inserted"] == 2
+        assert mock_api.return_value.bulk.insert.call_count == 2
+        mock_cache.assert_not_called()
+
+    @patch("catalog.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_failed_batch_goes_to_recovery(self, mock_api, mock_cache, mock_find):
+        def insert(batch):
+            if batch.catalogs[0].lots[0].customer_item_id == "1002":
+                raise RequestError(400, "Bad lot")
+
+        mock_api.return_value.bulk.insert.side_effect = insert
+
+        result = bulk_insert(_request(), _bulk_request(4))
+
+        assert result["inserted"] == 2
+        assert result["failed"] == 2
+        assert "Bad lot" in result["errors"][0]
+        entries = [c.args[1] for c in mock_cache.call_args_list]
+        assert [e["customer_item_id"] for e in entries] == ["1002", "1003"]
+        assert entries[0]["operation"] == "create"
+        assert entries[0]["catalog_id"] == 42
+        assert entries[0]["customer_catalog_id"] == "123456"
+        assert entries[0]["seller_display_id"] == 1874
+        assert entries[0]["add_lot_request"]["catalogs"][0]["catalogId"] == 42
+        mock_find.assert_called_once()
+
+    @patch("catalog.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_all_batches_failing_raises(self, mock_api, mock_cache, mock_find):
+        mock_api.return_value.bulk.insert.side_effect = RequestError(400, "Bad catalog")
+
+        with pytest.raises(RuntimeError, match="All 3 lots failed"):
+            bulk_insert(_request(), _bulk_request(3))
+
+        entries = [c.args[1] for c in mock_cache.call_args_list]
+        assert len(entries) == 3
+        assert entries[0]["add_lot_request"] is None
+
+
+@pytest.mark.usefixtures("small_batches")
+class TestBulkInsertFingerprints:
+    @patch("catalog.services.store_lot_fingerprints")
+    @patch("catalog.services.load_lot_fingerprints", return_value={"999": [5, "old"]})
+    @patch("catalog.services.get_catalog_api")
+    def test_records_inserted_lots(self, mock_api, mock_load, mock_store):
+        bulk_insert(_request(), _bulk_request(3))
+
+        customer_catalog_id, stored = mock_store.call_args.args
+        assert customer_catalog_id == "123456"
+        assert set(stored) == {"999", "1000", "1001", "1002"}
+        assert stored["1000"][0] is None
+
+    @patch("catalog.services.store_lot_fingerprints")
+    @patch("catalog.services.load_lot_fingerprints", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_missing_map_only_started_for_new_catalog(self, mock_api, mock_load, mock_store):
+        bulk_insert(_request(), _bulk_request(3))
+        mock_store.assert_not_called()
+
+        bulk_insert(_request(), _bulk_request(3), new_catalogs={"123456"})
+        customer_catalog_id, stored = mock_store.call_args.args
+        assert customer_catalog_id == "123456"
+        assert set(stored) == {"1000", "1001", "1002"}
+
+    @patch("catalog.services.invalidate_lot_fingerprints")
+    @patch("catalog.services.store_lot_fingerprints")
+    @patch("catalog.services.find_catalog_by_customer_id", return_value=42)
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_failed_batch_invalidates(self, mock_api, mock_cache, mock_find, mock_store, mock_invalidate):
+        mock_api.return_value.bulk.insert.side_effect = [None, RequestError(400, "Bad lot")]
+
+        bulk_insert(_request(), _bulk_request(4))
+
+        mock_invalidate.assert_called_once_with("123456")
+        mock_store.assert_not_called()
+
+
+@pytest.mark.usefixtures("small_batches")
+class TestBulkInsertItemIndex:
+    @patch("catalog.services.record_item_locations")
+    @patch("catalog.services.find_catalog_by_customer_id", return_value=None)
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog_api")
+    def test_indexes_inserted_lots_only(self, mock_api, mock_cache, mock_find, mock_record):
+        mock_api.return_value.bulk.insert.side_effect = [None, RequestError(400, "Bad lot")]
+
+        bulk_insert(_request(), _bulk_request(4))
+
+        (locations,) = mock_record.call_args.args
+        assert sorted(locations) == ["1000", "1001"]
+        assert locations["1000"] == {
+            "lot_id": None, "customer_catalog_id": "123456", "seller_display_id": 1874, "lot_position": None,
+        }
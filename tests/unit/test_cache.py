@@ -1,8 +1,26 @@
 """Unit tests for catalog.cache safe wrappers (015-redis-caching)."""
 
+import time
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
-from catalog.cache import safe_cache_get, safe_cache_set
+from catalog import rate_limit, services
+from catalog.records import EventRecord
+from catalog.cache import (
+    cache_stats,
+    redis_circuit_state,
+    safe_cache_delete,
+    safe_cache_get,
+    safe_cache_get_many,
+    safe_cache_set,
+    safe_cache_set_many,
+    swr_fill,
+    swr_refresh,
+    swr_set,
+    swr_unwrap,
+    swr_version,
+    swr_wrap,
+)
 
 
 class TestSafeCacheGet:
@@ -51,3 +69,409 @@ class TestSafeCacheSet:
         mock_cache.set.side_effect = Exception("boom")
         safe_cache_set("mykey", "value")
         assert "Cache write failed for key=mykey: boom" in caplog.text
+
+
+class TestSafeCacheDelete:
+    """Tests for safe_cache_delete."""
+
+    @patch("catalog.cache.cache")
+    def test_calls_cache_delete(self, mock_cache):
+        safe_cache_delete("mykey")
+        mock_cache.delete.assert_called_once_with("mykey")
+
+    @patch("catalog.cache.cache")
+    def test_logs_warning_on_exception(self, mock_cache, caplog):
+        mock_cache.delete.side_effect = Exception("boom")
+        safe_cache_delete("mykey")
+        assert "Cache delete failed for key=mykey: boom" in caplog.text
+
+
+class TestSafeCacheGetMany:
+    """Tests for safe_cache_get_many."""
+
+    @patch("catalog.cache.cache")
+    def test_returns_found_keys(self, mock_cache):
+        mock_cache.get_many.return_value = {"a": 1}
+        assert safe_cache_get_many(["a", "b"]) == {"a": 1}
+        mock_cache.get_many.assert_called_once_with(["a", "b"])
+
+    @patch("catalog.cache.cache")
+    def test_empty_keys_skip_redis(self, mock_cache):
+        assert safe_cache_get_many([]) == {}
+        mock_cache.get_many.assert_not_called()
+
+    @patch("catalog.cache.cache")
+    def test_returns_empty_on_exception(self, mock_cache, caplog):
+        mock_cache.get_many.side_effect = ConnectionError("Redis down")
+        assert safe_cache_get_many(["a", "b"]) == {}
+        assert "Cache read failed for 2 keys" in caplog.text
+
+
+class TestSafeCacheSetMany:
+    """Tests for safe_cache_set_many."""
+
+    @patch("catalog.cache.cache")
+    def test_calls_cache_set_many(self, mock_cache):
+        safe_cache_set_many({"a": 1}, timeout=60)
+        mock_cache.set_many.assert_called_once_with({"a": 1}, 60)
+
+    @patch("catalog.cache.cache")
+    def test_noop_on_exception(self, mock_cache, caplog):
+        mock_cache.set_many.side_effect = ConnectionError("Redis down")
+        safe_cache_set_many({"a": 1})
+        assert "Cache write failed for 1 keys" in caplog.text
+
+
+def _fake_redis(mock_cache, store):
+    """Back a patched cache with *store*, including the L1 generation counter."""
+    def incr(key):
+        store[key] = store.get(key, 0) + 1
+        return store[key]
+
+    mock_cache.get.side_effect = lambda key, default=None: store.get(key, default)
+    mock_cache.get_many.side_effect = lambda keys: {k: store[k] for k in keys if k in store}
+    mock_cache.incr.side_effect = incr
+    return store
+
+
+class TestLocalCache:
+    """Tests for the in-process L1 in front of Redis."""
+
+    @patch("catalog.cache.cache")
+    def test_repeat_read_served_from_l1(self, mock_cache):
+        mock_cache.get.side_effect = lambda key, default=None: {"sellers_all": [1]}.get(key, default)
+
+        assert safe_cache_get("sellers_all") == [1]
+        assert safe_cache_get("sellers_all") == [1]
+
+        read_keys = [c.args[0] for c in mock_cache.get.call_args_list]
+        assert read_keys.count("sellers_all") == 1
+        assert cache_stats() == {"l1": {"hits": 1, "misses": 1}, "redis": {"hits": 1, "misses": 0}}
+
+    @patch("catalog.cache.cache")
+    def test_other_keys_bypass_l1(self, mock_cache):
+        mock_cache.get.return_value = "v"
+        safe_cache_get("lot_v1_1")
+        safe_cache_get("lot_v1_1")
+
+        assert mock_cache.get.call_count == 2
+        assert cache_stats()["l1"] == {"hits": 0, "misses": 0}
+
+    @patch("catalog.cache.cache")
+    def test_expired_entry_goes_back_to_redis(self, mock_cache, settings):
+        settings.CATALOG_L1_CACHE_TTL = 0.01
+        mock_cache.get.side_effect = lambda key, default=None: [1] if key == "sellers_all" else default
+
+        safe_cache_get("sellers_all")
+        time.sleep(0.02)
+        safe_cache_get("sellers_all")
+
+        assert cache_stats()["redis"]["hits"] == 2
+
+    @patch("catalog.cache.cache")
+    def test_generation_change_clears_l1(self, mock_cache, settings):
+        settings.CATALOG_L1_SYNC_INTERVAL = 0
+        store = {"sellers_all": [1], "l1_generation": 1}
+        mock_cache.get.side_effect = lambda key, default=None: store.get(key, default)
+
+        safe_cache_get("sellers_all")
+        store.update({"sellers_all": [2], "l1_generation": 2})  # another worker wrote
+
+        assert safe_cache_get("sellers_all") == [2]
+
+    @patch("catalog.cache.cache")
+    def test_write_updates_l1_and_bumps_generation(self, mock_cache):
+        store = _fake_redis(mock_cache, {"l1_generation": 4})
+
+        safe_cache_set("catalogs_seller_1", [3])
+
+        assert store["l1_generation"] == 5
+        assert safe_cache_get("catalogs_seller_1") == [3]
+        assert [c.args[0] for c in mock_cache.get.call_args_list] == ["l1_generation"]
+
+    @patch("catalog.cache.cache")
+    def test_delete_evicts_l1(self, mock_cache):
+        _fake_redis(mock_cache, {})
+        safe_cache_set("sellers_all", [1])
+
+        safe_cache_delete("sellers_all")
+
+        assert safe_cache_get("sellers_all") is None
+
+    @patch("catalog.cache.cache")
+    def test_get_many_only_asks_redis_for_l1_misses(self, mock_cache):
+        _fake_redis(mock_cache, {"catalogs_seller_1": [2]})
+        safe_cache_set("sellers_all", [1])
+
+        result = safe_cache_get_many(["sellers_all", "catalogs_seller_1", "catalogs_seller_2"])
+
+        assert result == {"sellers_all": [1], "catalogs_seller_1": [2]}
+        assert mock_cache.get_many.call_args.args[0] == ["catalogs_seller_1", "catalogs_seller_2"]
+        assert cache_stats()["redis"] == {"hits": 1, "misses": 1}
+
+    @patch("catalog.cache.cache")
+    def test_lru_bound(self, mock_cache, settings):
+        settings.CATALOG_L1_CACHE_SIZE = 2
+        _fake_redis(mock_cache, {})
+        for i in range(3):
+            safe_cache_set(f"catalogs_seller_{i}", [i])
+
+        assert safe_cache_get("catalogs_seller_0") is None
+        assert safe_cache_get("catalogs_seller_2") == [2]
+
+    @patch("catalog.cache.cache")
+    def test_disabled_with_zero_ttl(self, mock_cache, settings):
+        settings.CATALOG_L1_CACHE_TTL = 0
+        mock_cache.get.return_value = [1]
+        safe_cache_get("sellers_all")
+        safe_cache_get("sellers_all")
+        assert mock_cache.get.call_count == 2
+
+
+class TestRedisCircuitBreaker:
+    """Tests for the process-local breaker in front of Redis."""
+
+    @patch("catalog.cache.cache")
+    def test_opens_after_consecutive_failures(self, mock_cache, settings):
+        settings.CATALOG_REDIS_BREAKER_THRESHOLD = 3
+        mock_cache.get.side_effect = ConnectionError("Redis down")
+
+        for _ in range(5):
+            assert safe_cache_get("k", "miss") == "miss"
+
+        assert mock_cache.get.call_count == 3
+        state = redis_circuit_state()
+        assert state["state"] == "open"
+        assert state["short_circuited"] == 2
+
+    @patch("catalog.cache.cache")
+    def test_success_resets_failure_count(self, mock_cache, settings):
+        settings.CATALOG_REDIS_BREAKER_THRESHOLD = 2
+        mock_cache.get.side_effect = [ConnectionError("Redis down"), "v", ConnectionError("Redis down"), "w"]
+
+        assert [safe_cache_get("k") for _ in range(4)] == [None, "v", None, "w"]
+        assert redis_circuit_state()["state"] == "closed"
+
+    @patch("catalog.cache.cache")
+    def test_non_connection_errors_do_not_trip(self, mock_cache, settings):
+        settings.CATALOG_REDIS_BREAKER_THRESHOLD = 1
+        mock_cache.set.side_effect = TypeError("cannot pickle")
+
+        safe_cache_set("k", object())
+
+        assert redis_circuit_state()["state"] == "closed"
+
+    @patch("catalog.cache.threading.Thread")
+    @patch("catalog.cache.cache")
+    def test_probe_after_cooldown_closes_breaker(self, mock_cache, mock_thread, settings):
+        settings.CATALOG_REDIS_BREAKER_THRESHOLD = 1
+        settings.CATALOG_REDIS_BREAKER_COOLDOWN = 0
+        mock_cache.set.side_effect = ConnectionError("Redis down")
+        safe_cache_set("k", 1)
+
+        # The call that finds the cooldown over still short-circuits; the probe runs beside it
+        assert safe_cache_get("k", "miss") == "miss"
+        assert redis_circuit_state()["state"] == "half_open"
+        mock_thread.call_args.kwargs["target"]()
+
+        assert redis_circuit_state()["state"] == "closed"
+        mock_cache.get.return_value = 2
+        assert safe_cache_get("k") == 2
+
+    @patch("catalog.cache.threading.Thread")
+    @patch("catalog.cache.cache")
+    def test_failed_probe_reopens(self, mock_cache, mock_thread, settings):
+        settings.CATALOG_REDIS_BREAKER_THRESHOLD = 1
+        settings.CATALOG_REDIS_BREAKER_COOLDOWN = 0
+        mock_cache.get.side_effect = ConnectionError("Redis down")
+        safe_cache_get("k")
+        safe_cache_get("k")
+
+        mock_thread.call_args.kwargs["target"]()
+
+        assert redis_circuit_state()["state"] == "open"
+        assert mock_cache.get.call_count == 2
+
+
+class TestSWREntries:
+    """Tests for swr_wrap / swr_unwrap / swr_set."""
+
+    def test_fresh_entry(self):
+        assert swr_unwrap(swr_wrap([1], soft_ttl=60, hard_ttl=600)) == ([1], False)
+
+    def test_entry_past_soft_ttl_is_stale(self):
+        assert swr_unwrap(swr_wrap([1], soft_ttl=0, hard_ttl=600)) == ([1], True)
+
+    def test_miss(self):
+        assert swr_unwrap(None) == (None, False)
+
+    def test_legacy_value_is_served_stale(self):
+        assert swr_unwrap([{"id": 1}]) == ([{"id": 1}], True)
+
+    def test_version_identifies_the_write(self):
+        entry = swr_wrap([1], soft_ttl=60, hard_ttl=600)
+        assert swr_version(entry) == entry["fresh_until"]
+        assert swr_version([{"id": 1}]) is None
+        assert swr_version(None) is None
+
+    @patch("catalog.cache.cache")
+    def test_set_expires_at_hard_ttl(self, mock_cache, settings):
+        settings.CATALOG_CACHE_SOFT_TTL = 30
+        settings.CATALOG_CACHE_HARD_TTL = 900
+        swr_set("k", [1])
+
+        key, entry, timeout = mock_cache.set.call_args.args
+        assert key == "k"
+        assert timeout == 900
+        assert entry["value"] == [1]
+        assert entry["expires_at"] - entry["fresh_until"] == 870
+
+
+class TestSWRRefresh:
+    """Tests for the single-flight background refresh."""
+
+    @patch("catalog.cache.threading.Thread")
+    @patch("catalog.cache.cache")
+    def test_lock_winner_refreshes_and_releases(self, mock_cache, mock_thread):
+        mock_cache.add.return_value = True
+
+        assert swr_refresh("k", lambda: [2], soft_ttl=10, hard_ttl=100) is True
+        mock_thread.call_args.kwargs["target"]()
+
+        assert mock_cache.add.call_args.args[0] == "swr_lock_k"
+        key, entry, timeout = mock_cache.set.call_args.args
+        assert (key, entry["value"], timeout) == ("k", [2], 100)
+        mock_cache.delete.assert_called_once_with("swr_lock_k")
+
+    @patch("catalog.cache.threading.Thread")
+    @patch("catalog.cache.cache")
+    def test_lock_held_elsewhere_skips_refresh(self, mock_cache, mock_thread):
+        mock_cache.add.return_value = False
+
+        assert swr_refresh("k", lambda: [2]) is False
+        mock_thread.assert_not_called()
+
+    @patch("catalog.cache.threading.Thread")
+    @patch("catalog.cache.cache")
+    def test_redis_down_skips_refresh(self, mock_cache, mock_thread, caplog):
+        mock_cache.add.side_effect = ConnectionError("Redis down")
+
+        assert swr_refresh("k", lambda: [2]) is False
+        mock_thread.assert_not_called()
+        assert "Cache lock failed for key=swr_lock_k" in caplog.text
+
+    @patch("catalog.cache.threading.Thread")
+    @patch("catalog.cache.cache")
+    def test_loader_error_keeps_stale_entry(self, mock_cache, mock_thread, caplog):
+        mock_cache.add.return_value = True
+
+        def loader():
+            raise RuntimeError("API down")
+
+        swr_refresh("k", loader)
+        mock_thread.call_args.kwargs["target"]()
+
+        mock_cache.set.assert_not_called()
+        mock_cache.delete.assert_called_once_with("swr_lock_k")
+        assert "Background refresh failed for key=k" in caplog.text
+
+
+class TestSWRFill:
+    """Tests for single-flight loading of missing entries."""
+
+    @patch("catalog.cache.cache")
+    def test_lock_winner_loads_and_stores(self, mock_cache):
+        mock_cache.add.return_value = True
+        loader = MagicMock(return_value=[1])
+
+        assert swr_fill("k", loader, soft_ttl=10, hard_ttl=100) == [1]
+
+        loader.assert_called_once()
+        assert mock_cache.set.call_args.args[1]["value"] == [1]
+        mock_cache.delete.assert_called_once_with("swr_lock_k")
+
+    @patch("catalog.cache.time.sleep")
+    @patch("catalog.cache.cache")
+    def test_waiter_reads_winner_result(self, mock_cache, mock_sleep):
+        mock_cache.add.return_value = False
+        stored = {"swr_lock_k": 1}
+        mock_cache.get.side_effect = lambda key, default=None: stored.get(key, default)
+
+        def release(_):
+            stored.pop("swr_lock_k", None)
+            stored["k"] = swr_wrap([2])
+
+        mock_sleep.side_effect = release
+        loader = MagicMock()
+
+        assert swr_fill("k", loader, wait=5) == [2]
+        loader.assert_not_called()
+
+    @patch("catalog.cache.time.sleep")
+    @patch("catalog.cache.cache")
+    def test_waiter_loads_itself_after_timeout(self, mock_cache, mock_sleep):
+        mock_cache.add.return_value = False
+        mock_cache.get.return_value = 1  # lock never released
+
+        assert swr_fill("k", lambda: [3], wait=0) == [3]
+        assert mock_cache.set.call_args.args[1]["value"] == [3]
+        mock_cache.delete.assert_not_called()
+
+    @patch("catalog.cache.cache")
+    def test_redis_down_just_loads(self, mock_cache):
+        mock_cache.add.side_effect = ConnectionError("Redis down")
+        assert swr_fill("k", lambda: [4]) == [4]
+        mock_cache.set.assert_not_called()
+
+
+class TestListSWR:
+    """Seller and event lists serve stale entries and refresh in the background."""
+
+    @patch("catalog.services.swr_refresh")
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.get_catalog_api")
+    def test_stale_sellers_served_and_refreshed(self, mock_api, mock_get, mock_refresh):
+        mock_get.return_value = swr_wrap([{"id": 1, "name": "A", "customer_display_id": 10}], soft_ttl=0)
+
+        result = services.list_sellers(SimpleNamespace(session={}))
+
+        assert result.items[0].name == "A"
+        mock_api.assert_not_called()
+        assert mock_refresh.call_args.args[0] == services.SELLERS_CACHE_KEY
+
+    @patch("catalog.services.swr_refresh")
+    @patch("catalog.services.safe_cache_get")
+    def test_fresh_catalogs_not_refreshed(self, mock_get, mock_refresh):
+        mock_get.return_value = swr_wrap(
+            [{"id": 7, "title": "T", "customer_catalog_id": "C", "start_date": "2099-01-01T00:00:00"}],
+        )
+
+        result = services.list_catalogs(SimpleNamespace(), seller_id=42)
+
+        assert result.items[0].title == "T"
+        mock_refresh.assert_not_called()
+
+    @patch("catalog.services.swr_refresh")
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.build_catalog_api")
+    def test_refresh_loader_refetches_catalogs(self, mock_build, mock_get, mock_refresh):
+        mock_get.return_value = swr_wrap([], soft_ttl=0)
+        mock_build.return_value.catalogs.list.return_value = SimpleNamespace(
+            items=[SimpleNamespace(id=1, title="New", customer_catalog_id="N", start_date=None)],
+            total_pages=1,
+        )
+        request = SimpleNamespace(session={"abc_token": {"access_token": "t"}}, user=None)
+        services.set_deadline(request, 5)
+
+        services.list_catalogs(request, seller_id=42, future_only=False)
+        key, loader = mock_refresh.call_args.args
+        request.session["abc_token"] = {"access_token": "changed later"}
+
+        assert key == "catalogs_seller_42"
+        assert loader() == [EventRecord(1, "New", "N", None)]
+        # The refresh gets its own client: no deadline, background priority, auth copied up front
+        (detached,) = mock_build.call_args.args
+        assert detached is not request
+        assert not hasattr(detached, "catalog_deadline")
+        assert detached.catalog_api_priority == rate_limit.BACKGROUND
+        assert detached.session == {"abc_token": {"access_token": "t"}}
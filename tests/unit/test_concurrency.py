@@ -0,0 +1,368 @@
+"""Unit tests for catalog.concurrency helpers and their use in services."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from ABConnect.exceptions import ABConnectError
+
+from catalog import services
+from catalog.concurrency import (
+    DeadlineExceeded,
+    LatencyTracker,
+    call_with_retry,
+    fan_out,
+    fetch_all_pages,
+    hedged_call,
+    run_graph,
+)
+from catalog.services import fetch_all_lots, get_lots_for_event, list_sellers
+
+
+class TestFanOut:
+    def test_preserves_input_order(self):
+        def slow_echo(n):
+            time.sleep(0.01 * (5 - n))
+            return n
+
+        assert fan_out(slow_echo, range(5), max_workers=5) == [0, 1, 2, 3, 4]
+
+    def test_respects_max_workers(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def work(_):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+        fan_out(work, range(10), max_workers=3)
+        assert state["peak"] <= 3
+
+    def test_raises_deadline_exceeded(self):
+        with pytest.raises(DeadlineExceeded):
+            fan_out(lambda _: time.sleep(0.5), range(4), max_workers=4, timeout=0.05)
+
+    def test_reraises_first_failure(self):
+        def work(n):
+            if n == 2:
+                raise ValueError("bad lot")
+            return n
+
+        with pytest.raises(ValueError, match="bad lot"):
+            fan_out(work, range(4), max_workers=2)
+
+    def test_empty_input(self):
+        assert fan_out(lambda n: n, []) == []
+
+
+class TestCallWithRetry:
+    def test_retries_until_success(self):
+        calls = iter([ConnectionError("reset"), ConnectionError("reset"), "ok"])
+
+        def flaky():
+            result = next(calls)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        assert call_with_retry(flaky, attempts=3, backoff=0) == "ok"
+
+    def test_gives_up_after_attempts(self):
+        attempts = []
+
+        def always_fails():
+            attempts.append(1)
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            call_with_retry(always_fails, attempts=2, backoff=0)
+        assert len(attempts) == 2
+
+    def test_non_retryable_raises_immediately(self):
+        attempts = []
+
+        def bad_request():
+            attempts.append(1)
+            raise ValueError("400")
+
+        with pytest.raises(ValueError):
+            call_with_retry(bad_request, attempts=3, backoff=0, retry_on=lambda e: False)
+        assert len(attempts) == 1
+
+
+def _page(number, total_pages, per_page=2):
+    return SimpleNamespace(
+        items=[f"p{number}-{i}" for i in range(per_page)],
+        total_pages=total_pages,
+        has_next_page=number < total_pages,
+    )
+
+
+class TestFetchAllPages:
+    def test_returns_items_in_page_order(self):
+        def fetch(page):
+            time.sleep(0.01 * (5 - page))
+            return _page(page, 4)
+
+        assert fetch_all_pages(fetch, max_workers=4) == [
+            f"p{n}-{i}" for n in range(1, 5) for i in range(2)
+        ]
+
+    def test_single_page_makes_one_call(self):
+        calls = []
+        fetch_all_pages(lambda page: calls.append(page) or _page(page, 1))
+        assert calls == [1]
+
+    def test_fetches_remaining_pages_concurrently(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fetch(page):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return _page(page, 6)
+
+        fetch_all_pages(fetch, max_workers=3)
+        assert 1 < state["peak"] <= 3
+
+    def test_follows_has_next_page_without_total_pages(self):
+        pages = {
+            1: SimpleNamespace(items=["a"], has_next_page=True),
+            2: SimpleNamespace(items=["b"], has_next_page=False),
+        }
+        assert fetch_all_pages(pages.__getitem__) == ["a", "b"]
+
+    def test_max_pages_stops_early(self):
+        calls = []
+        fetch_all_pages(lambda page: calls.append(page) or _page(page, 10), max_pages=3)
+        assert sorted(calls) == [1, 2, 3]
+
+        pages = {n: SimpleNamespace(items=[n], has_next_page=True) for n in range(1, 10)}
+        assert fetch_all_pages(pages.__getitem__, max_pages=2) == [1, 2]
+
+
+class TestFullListings:
+    @patch("catalog.services.list_lots_by_catalog")
+    def test_fetch_all_lots_reads_every_page(self, mock_list):
+        mock_list.side_effect = lambda request, cid, page, page_size: _page(page, 3)
+
+        lots = fetch_all_lots(SimpleNamespace(session={}), "CAT-1")
+
+        assert len(lots) == 6
+        assert sorted(c.kwargs["page"] for c in mock_list.call_args_list) == [1, 2, 3]
+
+    @patch("catalog.services.fetch_all_pages", return_value=[])
+    def test_listing_deadline_follows_the_caller(self, mock_fetch, settings):
+        settings.CATALOG_API_BACKGROUND_TIMEOUT = 900
+        settings.CATALOG_API_FANOUT_TIMEOUT = 20
+
+        fetch_all_lots(SimpleNamespace(session={}), "CAT-1")  # upload worker: no budget
+        assert mock_fetch.call_args.kwargs["timeout"] == 900
+
+        request = SimpleNamespace(session={})
+        services.set_deadline(request, 5)
+        fetch_all_lots(request, "CAT-1")
+        assert mock_fetch.call_args.kwargs["timeout"] <= 5
+
+    @patch("catalog.services.fetch_all_pages", side_effect=DeadlineExceeded("Fan-out exceeded 5s"))
+    def test_listing_deadline_is_an_api_error(self, _):
+        with pytest.raises(ABConnectError) as exc_info:
+            fetch_all_lots(SimpleNamespace(session={}), "CAT-1")
+        assert exc_info.value.code == "DEADLINE_EXCEEDED"
+
+    @patch("catalog.cache.cache")
+    @patch("catalog.services.safe_cache_get", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_list_sellers_caches_every_page(self, mock_api, mock_get, mock_cache):
+        def sellers_page(page_number, page_size):
+            seller = SimpleNamespace(id=page_number, name=f"S{page_number}", customer_display_id=page_number)
+            return SimpleNamespace(items=[seller], total_pages=2, has_next_page=page_number < 2)
+
+        mock_api.return_value.sellers.list.side_effect = sellers_page
+
+        result = list_sellers(SimpleNamespace(session={}))
+
+        assert [s.id for s in result.items] == [1, 2]
+        assert [d.id for d in mock_cache.set.call_args.args[1]["value"]] == [1, 2]
+
+
+class TestGetLotsForEvent:
+    @patch("catalog.services.safe_cache_get_many", return_value={})
+    @patch("catalog.services.get_catalog_api")
+    def test_returns_lots_in_id_order(self, mock_api, mock_get_many):
+        mock_api.return_value.lots.get.side_effect = lambda lot_id: SimpleNamespace(id=lot_id)
+        request = SimpleNamespace(session={})
+
+        result = get_lots_for_event(request, [30, 10, 20])
+
+        assert [lot.id for lot in result] == [30, 10, 20]
+        assert mock_api.return_value.lots.get.call_count == 3
+
+    @patch("catalog.services.safe_cache_get_many", return_value={})
+    @patch("catalog.services.get_catalog_api")
+    @patch("catalog.services.fan_out", side_effect=DeadlineExceeded("too slow"))
+    def test_deadline_surfaces_as_abconnect_error(self, mock_fan_out, mock_api, mock_get_many):
+        request = SimpleNamespace(session={})
+        with pytest.raises(ABConnectError):
+            get_lots_for_event(request, [1, 2])
+
+    @patch("catalog.services.get_catalog_api")
+    def test_empty_ids_skip_api(self, mock_api):
+        assert get_lots_for_event(SimpleNamespace(session={}), []) == []
+        mock_api.assert_not_called()
+
+
+class TestRunGraph:
+    def test_dependencies_receive_results_and_independent_tasks_overlap(self):
+        started = threading.Barrier(2, timeout=5)
+
+        def lookup(value):
+            started.wait()  # both roots must be running at the same time
+            return value
+
+        results, errors, timings = run_graph({
+            "a": (lambda: lookup(1), ()),
+            "b": (lambda: lookup(2), ()),
+            "sum": (lambda a, b: a + b, ("a", "b")),
+        })
+
+        assert results == {"a": 1, "b": 2, "sum": 3}
+        assert errors == {}
+        assert set(timings) == {"a", "b", "sum"}
+
+    def test_failed_dependency_skips_dependents(self):
+        def boom():
+            raise ValueError("nope")
+
+        results, errors, timings = run_graph({
+            "a": (boom, ()),
+            "b": (lambda a: a, ("a",)),
+            "c": (lambda b: b, ("b",)),
+            "d": (lambda: "ok", ()),
+        })
+
+        assert results == {"d": "ok"}
+        assert list(errors) == ["a"]
+        assert isinstance(errors["a"], ValueError)
+
+    def test_deadline(self):
+        results, errors, _ = run_graph({"slow": (lambda: time.sleep(1), ())}, timeout=0.05)
+        assert results == {}
+        assert isinstance(errors["slow"], DeadlineExceeded)
+
+    def test_unknown_dependency_rejected(self):
+        with pytest.raises(ValueError, match="unknown tasks"):
+            run_graph({"a": (lambda x: x, ("missing",))})
+
+
+class TestLatencyTracker:
+    def test_percentile_needs_enough_samples(self):
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for i in range(9):
+            tracker.record("lots.get", i / 100)
+        assert tracker.percentile("lots.get") is None
+
+        for i in range(9, 100):
+            tracker.record("lots.get", i / 100)
+        assert tracker.percentile("lots.get", 0.95) == 0.95
+        assert tracker.percentile("catalogs.get") is None
+
+
+class TestHedgedCall:
+    def test_slow_call_is_hedged_and_first_answer_wins(self):
+        calls = []
+        latencies = []
+
+        def read():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.3)
+                return "slow"
+            return "hedge"
+
+        assert hedged_call(read, hedge_after=0.02, on_latency=latencies.append) == "hedge"
+        assert len(calls) == 2
+        time.sleep(0.35)
+        assert len(latencies) == 2  # the slow copy still counts towards the next delay
+
+    def test_fast_call_is_not_hedged(self):
+        calls = []
+
+        def read():
+            calls.append(None)
+            return 1
+
+        assert hedged_call(read, hedge_after=0.5) == 1
+        assert len(calls) == 1
+
+    def test_early_failure_is_raised_without_hedging(self):
+        calls = []
+
+        def read():
+            calls.append(None)
+            raise ABConnectError("not found")
+
+        with pytest.raises(ABConnectError):
+            hedged_call(read, hedge_after=0.5)
+        assert len(calls) == 1
+
+    def test_one_failed_copy_is_ignored(self):
+        calls = []
+
+        def read():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise ABConnectError("HTTP 503")
+            time.sleep(0.1)
+            return "ok"
+
+        assert hedged_call(read, hedge_after=0.01) == "ok"
+
+    def test_deadline(self):
+        with pytest.raises(DeadlineExceeded):
+            hedged_call(lambda: time.sleep(0.5), hedge_after=0.01, timeout=0.05)
+
+
+class TestHedgedReads:
+    @patch("catalog.services.safe_cache_get", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_get_lot_hedged_after_p95(self, mock_api, _, settings):
+        settings.CATALOG_API_HEDGE_MIN_DELAY = 0
+        for _ in range(50):
+            services.api_latency.record("lots.get", 0.01)
+        calls = []
+
+        def get(lot_id):
+            calls.append(lot_id)
+            if len(calls) == 1:
+                time.sleep(0.3)
+            return SimpleNamespace(id=lot_id)
+
+        mock_api.return_value.lots.get.side_effect = get
+        started = time.monotonic()
+
+        assert services.get_lot(SimpleNamespace(), 5).id == 5
+        assert time.monotonic() - started < 0.25
+        assert calls == [5, 5]
+
+    @patch("catalog.services.safe_cache_get_many", return_value={})
+    @patch("catalog.services.get_catalog_api")
+    def test_spent_budget_stops_lot_fetches(self, mock_api, _):
+        mock_api.return_value.lots.get.side_effect = lambda lot_id: time.sleep(0.2)
+        request = SimpleNamespace()
+        services.set_deadline(request, 0.05)
+
+        with pytest.raises(ABConnectError) as exc_info:
+            get_lots_for_event(request, [1, 2, 3])
+        assert exc_info.value.code == "DEADLINE_EXCEEDED"
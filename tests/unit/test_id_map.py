@@ -0,0 +1,115 @@
+"""Unit tests for the display-id ↔ id mapping cache in catalog.services."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from catalog import services
+from catalog.records import SellerRecord
+
+
+@pytest.fixture(autouse=True)
+def id_cache():
+    backend = LocMemCache("id-map-tests", {})
+    with patch("catalog.cache.cache", backend):
+        yield backend
+    backend.clear()
+
+
+def _request():
+    return SimpleNamespace()
+
+
+def _api(sellers=(), catalogs=()):
+    api = MagicMock()
+    api.sellers.list.return_value = SimpleNamespace(items=list(sellers))
+    api.catalogs.list.return_value = SimpleNamespace(items=list(catalogs))
+    return api
+
+
+def _seller(id=42, display_id=4098):
+    return SimpleNamespace(id=id, name="Acme", customer_display_id=display_id)
+
+
+def _catalog(id=7, customer_catalog_id="CAT001", sellers=()):
+    return SimpleNamespace(id=id, customer_catalog_id=customer_catalog_id, sellers=list(sellers))
+
+
+class TestFindSeller:
+    @patch("catalog.services.get_catalog_api")
+    def test_second_lookup_served_from_cache(self, mock_api):
+        mock_api.return_value = _api(sellers=[_seller()])
+
+        first = services.find_seller_by_display_id(_request(), 4098)
+        second = services.find_seller_by_display_id(_request(), "4098")
+
+        assert first.id == 42
+        assert second == SellerRecord(42, "Acme", 4098)
+        assert mock_api.return_value.sellers.list.call_count == 1
+        assert services.lookup_seller_display_id(42) == 4098
+
+    @patch("catalog.services.get_catalog_api")
+    def test_miss_is_cached(self, mock_api):
+        mock_api.return_value = _api()
+
+        assert services.find_seller_by_display_id(_request(), "nope") is None
+        assert services.find_seller_by_display_id(_request(), "nope") is None
+        assert mock_api.return_value.sellers.list.call_count == 1
+
+    @patch("catalog.services.get_catalog_api")
+    def test_populated_from_seller_list(self, mock_api):
+        mock_api.return_value = _api()
+        services.remember_sellers([_seller(id=1, display_id="S1"), _seller(id=2, display_id="S2")])
+
+        assert services.find_seller_by_display_id(_request(), "S2").id == 2
+        mock_api.return_value.sellers.list.assert_not_called()
+
+    @patch("catalog.services.get_catalog_api")
+    def test_display_ids_cannot_collide_with_reverse_map(self, mock_api):
+        mock_api.return_value = _api(sellers=[_seller(id=9, display_id="display_5")])
+        # Seller 5's reverse entry must not be read as display id "display_5"
+        services.remember_sellers([_seller(id=5, display_id=777)])
+
+        assert services.find_seller_by_display_id(_request(), "display_5").id == 9
+        mock_api.return_value.sellers.list.assert_called_once()
+
+    @patch("catalog.services.get_catalog_api")
+    def test_unexpected_cached_value_is_looked_up(self, mock_api, id_cache):
+        mock_api.return_value = _api(sellers=[_seller()])
+        id_cache.set(f"{services.SELLER_BY_DISPLAY_ID_KEY_PREFIX}4098", 777)
+
+        assert services.find_seller_by_display_id(_request(), 4098).id == 42
+
+
+class TestFindCatalog:
+    @patch("catalog.services.get_catalog_api")
+    def test_populated_from_get_catalog(self, mock_api):
+        mock_api.return_value.catalogs.get.return_value = _catalog(sellers=[_seller()])
+
+        services.get_catalog(_request(), 7)
+
+        assert services.find_catalog_by_customer_id(_request(), "CAT001") == 7
+        assert services.lookup_customer_catalog_id(7) == "CAT001"
+        assert services.find_seller_by_display_id(_request(), 4098).id == 42
+        mock_api.return_value.catalogs.list.assert_not_called()
+        mock_api.return_value.sellers.list.assert_not_called()
+
+    @patch("catalog.services.get_catalog_api")
+    def test_forgotten_miss_is_looked_up_again(self, mock_api):
+        mock_api.return_value = _api()
+        assert services.find_catalog_by_customer_id(_request(), "NEW") is None
+
+        services.forget_id_misses(customer_catalog_ids=["NEW"])
+        mock_api.return_value.catalogs.list.return_value = SimpleNamespace(items=[_catalog(9, "NEW")])
+
+        assert services.find_catalog_by_customer_id(_request(), "NEW") == 9
+        assert mock_api.return_value.catalogs.list.call_count == 2
+
+    def test_forget_keeps_known_mappings(self):
+        services.remember_catalogs([_catalog(7, "CAT001")])
+
+        services.forget_id_misses(customer_catalog_ids=["CAT001"])
+
+        assert services.find_catalog_by_customer_id(_request(), "CAT001") == 7
@@ -0,0 +1,138 @@
+"""Unit tests for catalog.importers streaming readers and chunked builds."""
+
+import csv
+import json
+from unittest.mock import patch
+
+import openpyxl
+import pytest
+
+from catalog import importers
+from catalog.importers import iter_bulk_requests, iter_rows, load_file
+
+HEADERS = ["Catalog ID", "House ID", "House Name", "Catalog Title", "Catalog Start Date", "Lot ID", "Lot Num", "Lot Title"]
+
+
+def _rows(n, catalog_id=123456):
+    return [
+        {
+            "Catalog ID": catalog_id,
+            "House ID": 1874,
+            "House Name": "Maison Café",
+            "Catalog Title": "Spring Sale",
+            "Catalog Start Date": "2099-05-01 10:00:00",
+            "Lot ID": 1000 + i,
+            "Lot Num": str(i + 1),
+            "Lot Title": f"Lot {i + 1}",
+        }
+        for i in range(n)
+    ]
+
+
+def _write_csv(path, rows, encoding="utf-8"):
+    with open(path, "w", newline="", encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def _write_xlsx(path, rows, trailing_blank_rows=0):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    for row in rows:
+        ws.append([row[h] for h in HEADERS])
+    for i in range(trailing_blank_rows):
+        ws.cell(row=len(rows) + 2 + i, column=1).number_format = "0.00"
+    wb.save(path)
+    return path
+
+
+class TestIterRows:
+    def test_csv(self, tmp_path):
+        path = _write_csv(tmp_path / "c.csv", _rows(3))
+        rows = list(iter_rows(path))
+        assert len(rows) == 3
+        assert rows[0]["Lot ID"] == "1000"
+        assert rows[0]["House Name"] == "Maison Café"
+
+    def test_csv_falls_back_to_cp1252(self, tmp_path):
+        path = _write_csv(tmp_path / "c.csv", _rows(1), encoding="cp1252")
+        assert next(iter_rows(path))["House Name"] == "Maison Café"
+
+    def test_xlsx_skips_blank_rows(self, tmp_path):
+        path = _write_xlsx(tmp_path / "x.xlsx", _rows(2), trailing_blank_rows=3)
+        rows = list(iter_rows(path))
+        assert [r["Lot ID"] for r in rows] == [1000, 1001]
+
+    def test_json_values_spanning_read_boundary(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text(json.dumps(_rows(20), indent=2), encoding="utf-8")
+        with patch.object(importers, "_JSON_READ_SIZE", 16):
+            rows = list(iter_rows(path))
+        assert rows == _rows(20)
+
+    def test_json_empty_array(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text(" [ ] ")
+        assert list(iter_rows(path)) == []
+
+    def test_json_requires_array_of_objects(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text('{"Catalog ID": 1}')
+        with pytest.raises(ValueError, match="top-level array"):
+            list(iter_rows(path))
+        path.write_text("[1, 2]")
+        with pytest.raises(ValueError, match="must be objects"):
+            list(iter_rows(path))
+
+    def test_json_truncated(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text(json.dumps(_rows(2))[:-20])
+        with pytest.raises(ValueError):
+            list(iter_rows(path))
+
+    def test_json_trailing_comma_rejected(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text(json.dumps(_rows(2))[:-1] + ", ]")
+        with pytest.raises(ValueError, match="Trailing ','"):
+            list(iter_rows(path))
+        path.write_text("[,]")
+        with pytest.raises(ValueError):
+            list(iter_rows(path))
+
+    def test_json_data_after_array_rejected(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text(json.dumps(_rows(1)) + "\n  [] ")
+        with pytest.raises(ValueError, match="after JSON array"):
+            list(iter_rows(path))
+
+    def test_unsupported_extension(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported file type: .txt"):
+            iter_rows(tmp_path / "notes.txt")
+
+
+class TestIterBulkRequests:
+    def test_chunks_by_lot_count(self, tmp_path):
+        path = _write_csv(tmp_path / "c.csv", _rows(5))
+        chunks = list(iter_bulk_requests(path, chunk_lots=2))
+
+        assert [len(c.catalogs[0].lots) for c in chunks] == [2, 2, 1]
+        assert {c.catalogs[0].customer_catalog_id for c in chunks} == {"123456"}
+        assert all(c.catalogs[0].sellers for c in chunks)
+        lot_ids = [lot.customer_item_id for c in chunks for lot in c.catalogs[0].lots]
+        assert lot_ids == [str(1000 + i) for i in range(5)]
+
+    def test_chunk_only_contains_catalogs_with_pending_lots(self, tmp_path):
+        path = _write_csv(tmp_path / "c.csv", _rows(2, catalog_id=1) + _rows(2, catalog_id=2))
+        chunks = list(iter_bulk_requests(path, chunk_lots=2))
+        assert [[c.customer_catalog_id for c in chunk.catalogs] for chunk in chunks] == [["1"], ["2"]]
+
+    def test_matches_load_file(self, tmp_path):
+        path = _write_xlsx(tmp_path / "x.xlsx", _rows(4))
+        full, summary = load_file(path)
+        (chunk,) = iter_bulk_requests(path, chunk_lots=100)
+        assert chunk == full
+        assert "(4 rows)" in summary
+        assert "Lots: 4" in summary
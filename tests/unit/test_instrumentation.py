@@ -0,0 +1,140 @@
+"""Unit tests for per-request API/cache metrics (catalog.instrumentation)."""
+
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from catalog import api_client
+from catalog.cache import safe_cache_get, safe_cache_get_many, safe_cache_set
+from catalog.concurrency import fan_out
+from catalog.instrumentation import (
+    MeasuringPickleSerializer,
+    RequestMetrics,
+    bind,
+    endpoint_name,
+    record_api_call,
+    unbind,
+)
+from catalog.middleware import RequestMetricsMiddleware
+
+
+@pytest.fixture
+def metrics():
+    metrics = RequestMetrics()
+    token = bind(metrics)
+    yield metrics
+    unbind(token)
+
+
+@pytest.fixture
+def local_cache():
+    backend = LocMemCache("instrumentation-tests", {})
+    with patch("catalog.cache.cache", backend):
+        yield backend
+    backend.clear()
+
+
+class TestRequestMetrics:
+    @pytest.mark.parametrize("method, path, expected", [
+        ("get", "/Lot/123", "GET /Lot/{id}"),
+        ("get", "Catalog/7/lots?page=2", "GET /Catalog/{id}/lots"),
+        ("post", "/Bulk/insert", "POST /Bulk/insert"),
+    ])
+    def test_endpoint_name(self, method, path, expected):
+        assert endpoint_name(method, path) == expected
+
+    def test_summary_groups_calls_by_endpoint(self, metrics):
+        record_api_call("get", "/Lot/1", 0.1, 200)
+        record_api_call("get", "/Lot/2", 0.3, 200)
+        record_api_call("get", "/Catalog/7", 0.2, "ConnectionError")
+
+        api = metrics.summary()["api"]
+
+        assert api["calls"] == 3
+        assert api["errors"] == 1
+        assert api["ms"] == 600.0
+        assert api["endpoints"]["GET /Lot/{id}"] == {"calls": 2, "errors": 0, "ms": 400.0, "statuses": {"200": 2}}
+
+    def test_nothing_recorded_outside_a_request(self):
+        record_api_call("get", "/Lot/1", 0.1, 200)  # must not raise
+
+    def test_fan_out_workers_record_against_the_request(self, metrics):
+        fan_out(lambda i: record_api_call("get", f"/Lot/{i}", 0.01, 200), range(10), max_workers=4)
+
+        assert metrics.summary()["api"]["calls"] == 10
+
+
+class TestRecording:
+    @patch("catalog.api_client.get_http_session")
+    def test_handler_records_status_and_failures(self, mock_session, metrics):
+        mock_session.return_value.request.side_effect = [MagicMock(status_code=200), ConnectionError("down")]
+        handler = api_client.PooledCatalogRequestHandler(SimpleNamespace(get_token=lambda: {"access_token": "t"}))
+
+        handler.call("get", "/Lot/5")
+        with pytest.raises(ConnectionError):
+            handler.call("get", "/Lot/6")
+
+        assert metrics.summary()["api"]["endpoints"]["GET /Lot/{id}"]["statuses"] == {"200": 1, "ConnectionError": 1}
+
+    def test_cache_hits_misses_and_sets(self, metrics, local_cache):
+        safe_cache_set("a", 1)
+        safe_cache_get("a")
+        safe_cache_get("missing")
+        safe_cache_get_many(["a", "b"])
+
+        cache = metrics.summary()["cache"]
+
+        assert (cache["gets"], cache["hits"], cache["misses"], cache["sets"]) == (4, 2, 2, 1)
+
+    def test_serializer_counts_bytes(self, metrics):
+        serializer = MeasuringPickleSerializer({})
+
+        data = serializer.dumps({"lots": list(range(100))})
+        serializer.loads(data)
+
+        cache = metrics.summary()["cache"]
+        assert cache["bytes_written"] == cache["bytes_read"] == len(data)
+
+
+class TestRequestMetricsMiddleware:
+    def _view(self, server_timing=None):
+        def view(request):
+            record_api_call("get", "/Lot/1", 0.05, 200)
+            response = HttpResponse("ok")
+            if server_timing:
+                response["Server-Timing"] = server_timing
+            return response
+        return view
+
+    def test_adds_server_timing_and_logs_totals(self, caplog):
+        middleware = RequestMetricsMiddleware(self._view())
+
+        with caplog.at_level(logging.INFO, logger="catalog.metrics"):
+            response = middleware(RequestFactory().get("/panels/events/7/lots/"))
+
+        timing = response["Server-Timing"]
+        assert 'api;dur=50.0;desc="1 calls, 0 errors"' in timing
+        assert "cache;dur=" in timing and "total;dur=" in timing
+        logged = next(json.loads(r.getMessage()) for r in caplog.records if "path" in r.getMessage())
+        assert logged["path"] == "/panels/events/7/lots/"
+        assert logged["status"] == 200
+        assert logged["api"]["endpoints"]["GET /Lot/{id}"]["calls"] == 1
+
+    def test_keeps_view_server_timing_entries(self):
+        middleware = RequestMetricsMiddleware(self._view("hydrate-seller;dur=12.0"))
+
+        response = middleware(RequestFactory().get("/"))
+
+        assert response["Server-Timing"].startswith("hydrate-seller;dur=12.0, api;dur=")
+
+    def test_disabled(self, settings):
+        settings.CATALOG_REQUEST_METRICS = False
+        middleware = RequestMetricsMiddleware(self._view())
+
+        assert not middleware(RequestFactory().get("/")).has_header("Server-Timing")
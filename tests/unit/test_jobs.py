@@ -0,0 +1,147 @@
+"""Unit tests for catalog.jobs — background upload job lifecycle."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from catalog import jobs
+
+
+def _job(tmp_path, **overrides):
+    upload = tmp_path / "upload.xlsx"
+    upload.write_bytes(b"fake")
+    job = {
+        "id": "abc123",
+        "status": jobs.JOB_QUEUED,
+        "filename": "catalog.xlsx",
+        "file_path": str(upload),
+        "username": "test@example.com",
+        "session_key": "sess",
+        "progress": jobs._empty_progress(),
+        "result": None,
+    }
+    job.update(overrides)
+    return job
+
+
+def _job_request():
+    return SimpleNamespace(session=MagicMock(modified=False), user=None)
+
+
+class TestEnqueueUpload:
+    @patch("catalog.jobs._queue_connection")
+    @patch("catalog.jobs.cache")
+    def test_records_job_and_pushes_id(self, mock_cache, mock_conn, tmp_path):
+        request = SimpleNamespace(session=MagicMock(session_key="sess"))
+        request.session.get.return_value = "test@example.com"
+
+        job = jobs.enqueue_upload(request, tmp_path / "f.xlsx", "f.xlsx")
+
+        assert job["status"] == jobs.JOB_QUEUED
+        assert job["username"] == "test@example.com"
+        assert job["session_key"] == "sess"
+        mock_cache.set.assert_called_once_with(f"upload_job_{job['id']}", job, jobs.UPLOAD_JOB_TTL)
+        mock_conn.return_value.lpush.assert_called_once_with(jobs.UPLOAD_JOB_QUEUE_KEY, job["id"])
+
+
+class TestRunUploadJob:
+    @patch("catalog.jobs._save_job")
+    @patch("catalog.jobs._job_request", side_effect=lambda job: _job_request())
+    @patch("catalog.jobs.process_upload")
+    @patch("catalog.jobs.get_job")
+    def test_success_stores_result_and_removes_file(self, mock_get, mock_process, mock_req, mock_save, tmp_path):
+        job = _job(tmp_path)
+        mock_get.return_value = job
+        payload = {"success": True, "redirect": "/", "merge": {"added": 1}}
+        mock_process.return_value = (payload, 200)
+        statuses = []
+        mock_save.side_effect = lambda saved: statuses.append(saved["status"])
+
+        result = jobs.run_upload_job("abc123")
+
+        assert result["status"] == jobs.JOB_SUCCEEDED
+        assert result["result"] == payload
+        assert not (tmp_path / "upload.xlsx").exists()
+        assert statuses[0] == jobs.JOB_RUNNING
+        assert statuses[-1] == jobs.JOB_SUCCEEDED
+
+    @patch("catalog.jobs._save_job")
+    @patch("catalog.jobs._job_request", side_effect=lambda job: _job_request())
+    @patch("catalog.jobs.process_upload", side_effect=RuntimeError("boom"))
+    @patch("catalog.jobs.get_job")
+    def test_crash_marks_job_failed(self, mock_get, mock_process, mock_req, mock_save, tmp_path):
+        mock_get.return_value = _job(tmp_path)
+
+        result = jobs.run_upload_job("abc123")
+
+        assert result["status"] == jobs.JOB_FAILED
+        assert "boom" in result["result"]["error"]
+        assert not (tmp_path / "upload.xlsx").exists()
+
+    @patch("catalog.jobs.get_job", return_value=None)
+    def test_missing_job_is_skipped(self, mock_get):
+        assert jobs.run_upload_job("gone") is None
+
+    @patch("catalog.jobs.process_upload")
+    @patch("catalog.jobs.get_job")
+    def test_job_already_failed_is_not_run(self, mock_get, mock_process, tmp_path):
+        mock_get.return_value = _job(tmp_path, status=jobs.JOB_FAILED)
+
+        assert jobs.run_upload_job("abc123")["status"] == jobs.JOB_FAILED
+        mock_process.assert_not_called()
+        assert not (tmp_path / "upload.xlsx").exists()
+
+
+def _ago(seconds):
+    return (datetime.now(tz=timezone.utc) - timedelta(seconds=seconds)).isoformat()
+
+
+class TestExpireStalled:
+    @pytest.mark.parametrize("overrides", [
+        {"status": jobs.JOB_QUEUED, "created_at": _ago(400)},
+        {"status": jobs.JOB_RUNNING, "started_at": _ago(900), "heartbeat_at": _ago(200)},
+    ])
+    @patch("catalog.jobs._save_job")
+    def test_unpicked_or_abandoned_job_fails(self, mock_save, overrides, tmp_path, settings):
+        settings.UPLOAD_JOB_QUEUE_TIMEOUT = 300
+        settings.UPLOAD_JOB_STALL_TIMEOUT = 120
+
+        job = jobs.expire_stalled(_job(tmp_path, **overrides))
+
+        assert job["status"] == jobs.JOB_FAILED
+        assert job["result"]["success"] is False
+        mock_save.assert_called_once_with(job)
+
+    @pytest.mark.parametrize("overrides", [
+        {"status": jobs.JOB_QUEUED, "created_at": _ago(10)},
+        {"status": jobs.JOB_RUNNING, "started_at": _ago(900), "heartbeat_at": _ago(5)},
+        {"status": jobs.JOB_SUCCEEDED, "created_at": _ago(900)},
+    ])
+    @patch("catalog.jobs._save_job")
+    def test_live_or_finished_job_unchanged(self, mock_save, overrides, tmp_path):
+        job = _job(tmp_path, **overrides)
+
+        assert jobs.expire_stalled(job) is job
+        mock_save.assert_not_called()
+
+
+class TestProgressTracker:
+    @patch("catalog.jobs._save_job")
+    def test_flushes_at_most_once_per_interval(self, mock_save):
+        tracker = jobs._ProgressTracker({"id": "abc", "progress": {}})
+
+        tracker.update({"added": 1})
+        tracker.update({"added": 2})
+
+        assert mock_save.call_count == 1
+        assert tracker.job["progress"] == {"added": 2}
+
+    @patch("catalog.jobs._save_job")
+    def test_heartbeat_saves_without_progress(self, mock_save):
+        tracker = jobs._ProgressTracker({"id": "abc", "progress": {}})
+
+        tracker.heartbeat()
+
+        assert "heartbeat_at" in mock_save.call_args.args[0]
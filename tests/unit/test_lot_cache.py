@@ -0,0 +1,145 @@
+"""Unit tests for the per-lot LotDto cache in catalog.services."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ABConnect.api.models.catalog import LotDto
+
+from catalog import services
+from catalog.cache import swr_wrap
+
+LOT_PAYLOAD = {
+    "id": 100,
+    "customerItemId": "ITEM-1",
+    "initialData": {"Qty": 1, "L": 10.0, "CPack": "3"},
+    "overridenData": [],
+    "catalogs": [{"catalogId": 42, "lotNumber": "1"}],
+    "imageLinks": [],
+}
+
+
+def _lot():
+    return LotDto.model_validate(LOT_PAYLOAD)
+
+
+class TestGetLotCache:
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.get_catalog_api")
+    def test_hit_skips_api(self, mock_api, mock_get, mock_set):
+        mock_get.return_value = _lot().model_dump(by_alias=True, mode="json")
+
+        lot = services.get_lot(SimpleNamespace(), 100)
+
+        mock_api.assert_not_called()
+        mock_get.assert_called_once_with("lot_v1_100")
+        assert lot == _lot()
+
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.safe_cache_get", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_miss_fetches_and_caches(self, mock_api, mock_get, mock_set):
+        mock_api.return_value.lots.get.return_value = _lot()
+
+        lot = services.get_lot(SimpleNamespace(), 100)
+
+        assert lot.id == 100
+        key, value, timeout = mock_set.call_args.args
+        assert key == "lot_v1_100"
+        assert LotDto.model_validate(value) == _lot()
+        assert timeout == services.LOT_CACHE_TTL
+
+
+class TestLotCacheWriteThrough:
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.get_catalog_api")
+    def test_create_lot_writes_through(self, mock_api, mock_set):
+        mock_api.return_value.lots.create.return_value = _lot()
+        services.create_lot(SimpleNamespace(), object())
+        assert mock_set.call_args.args[0] == "lot_v1_100"
+
+    @patch("catalog.services.safe_cache_delete")
+    @patch("catalog.services.get_catalog_api")
+    def test_delete_lot_invalidates(self, mock_api, mock_delete):
+        services.delete_lot(SimpleNamespace(), 100)
+        mock_delete.assert_called_once_with("lot_v1_100")
+
+    @patch("catalog.services.forget_item_locations")
+    @patch("catalog.services.safe_cache_delete")
+    @patch("catalog.services.get_catalog_api")
+    def test_delete_lot_drops_item_location(self, mock_api, mock_delete, mock_forget):
+        services.delete_lot(SimpleNamespace(), 100, "ITEM-1")
+        mock_forget.assert_called_once_with(["ITEM-1"])
+
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.get_catalog_api")
+    def test_save_override_writes_through_updated_lot(self, mock_api, mock_set):
+        updated = LotDto.model_validate({**LOT_PAYLOAD, "overridenData": [{"Qty": 5}]})
+        mock_api.return_value.lots.get.return_value = _lot()
+        mock_api.return_value.lots.update.return_value = updated
+
+        services.save_lot_override(SimpleNamespace(), 100, {"qty": 5})
+
+        key, value, _ = mock_set.call_args.args
+        assert key == "lot_v1_100"
+        assert value["overridenData"][0]["Qty"] == 5
+
+
+class TestGetLotsForEventBatching:
+    @patch("catalog.services.safe_cache_set_many")
+    @patch("catalog.services.safe_cache_get_many")
+    @patch("catalog.services.get_catalog_api")
+    def test_all_cached_needs_no_api_calls(self, mock_api, mock_get_many, mock_set_many):
+        mock_get_many.return_value = {"lot_v1_100": _lot().model_dump(by_alias=True, mode="json")}
+
+        lots = services.get_lots_for_event(SimpleNamespace(), [100])
+
+        mock_get_many.assert_called_once()
+        mock_api.assert_not_called()
+        assert lots == [_lot()]
+
+    @patch("catalog.services.safe_cache_set_many")
+    @patch("catalog.services.safe_cache_get_many")
+    @patch("catalog.services.get_catalog_api")
+    def test_only_misses_are_fetched_and_cached(self, mock_api, mock_get_many, mock_set_many):
+        other = LotDto.model_validate({**LOT_PAYLOAD, "id": 200})
+        mock_get_many.return_value = {"lot_v1_100": _lot().model_dump(by_alias=True, mode="json")}
+        mock_api.return_value.lots.get.return_value = other
+
+        lots = services.get_lots_for_event(SimpleNamespace(), [200, 100])
+
+        mock_api.return_value.lots.get.assert_called_once_with(200)
+        assert [lot.id for lot in lots] == [200, 100]
+        assert list(mock_set_many.call_args.args[0]) == ["lot_v1_200"]
+
+
+class TestPrefetchCache:
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.safe_cache_get_many")
+    @patch("catalog.services.get_catalog_api")
+    def test_list_sellers_reuses_prefetched_value(self, mock_api, mock_get_many, mock_get):
+        mock_get_many.return_value = {
+            services.SELLERS_CACHE_KEY: swr_wrap([{"id": 1, "name": "A", "customer_display_id": 10}]),
+        }
+        request = SimpleNamespace()
+
+        services.prefetch_cache(request, [services.SELLERS_CACHE_KEY, "catalogs_seller_1"])
+        result = services.list_sellers(request)
+
+        mock_get.assert_not_called()
+        mock_api.assert_not_called()
+        assert result.items[0].name == "A"
+
+    @patch("catalog.cache.cache")
+    @patch("catalog.services.safe_cache_get")
+    @patch("catalog.services.safe_cache_get_many", return_value={})
+    @patch("catalog.services.get_catalog_api")
+    def test_prefetched_miss_is_not_read_again(self, mock_api, mock_get_many, mock_get, mock_cache):
+        mock_api.return_value.sellers.list.return_value = SimpleNamespace(items=[])
+        request = SimpleNamespace()
+
+        services.prefetch_cache(request, [services.SELLERS_CACHE_KEY])
+        services.list_sellers(request)
+
+        mock_get.assert_not_called()
+        mock_api.return_value.sellers.list.assert_called_once()
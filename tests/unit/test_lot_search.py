@@ -0,0 +1,74 @@
+"""Unit tests for services.search_lots combined, cached lot search."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from catalog.services import search_lots
+
+
+def _page(ids, total_pages=1, page_number=1):
+    return SimpleNamespace(
+        items=[SimpleNamespace(id=i) for i in ids],
+        total_pages=total_pages,
+        has_next_page=page_number < total_pages,
+    )
+
+
+class TestSearchLots:
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.safe_cache_get", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_merges_both_searches_with_correct_totals(self, mock_api, mock_get, mock_set):
+        def lots_list(page_number, page_size, **filters):
+            if "CustomerItemId" in filters:
+                return _page([1, 2])
+            return _page([2, 3, 4])
+
+        mock_api.return_value.lots.list.side_effect = lots_list
+
+        result = search_lots(SimpleNamespace(), "42", page=1, page_size=3)
+
+        assert [lot.id for lot in result.items] == [1, 2, 3]
+        assert result.total_items == 4
+        assert result.total_pages == 2
+        assert result.has_next_page is True
+        key, cached, ttl = mock_set.call_args.args
+        assert key.startswith("lot_search_")
+        assert cached == {"ids": [1, 2, 3, 4], "truncated": False}
+        assert result.truncated is False
+
+    @patch("catalog.services.safe_cache_set")
+    @patch("catalog.services.safe_cache_get", return_value=None)
+    @patch("catalog.services.get_catalog_api")
+    def test_broad_query_reads_at_most_the_result_cap(self, mock_api, mock_get, mock_set, settings):
+        settings.CATALOG_SEARCH_MAX_RESULTS = 150
+        pages_read = []
+
+        def lots_list(page_number, page_size, **filters):
+            if "CustomerItemId" in filters:
+                return _page([])
+            pages_read.append(page_number)
+            start = (page_number - 1) * page_size
+            return _page(range(start, start + page_size), total_pages=50, page_number=page_number)
+
+        mock_api.return_value.lots.list.side_effect = lots_list
+
+        result = search_lots(SimpleNamespace(), "1", page=1, page_size=25)
+
+        assert sorted(pages_read) == [1, 2]
+        assert result.total_items == 150
+        assert result.truncated is True
+
+    @patch("catalog.services.get_lots_for_event")
+    @patch("catalog.services.safe_cache_get", return_value={"ids": [1, 2, 3, 4], "truncated": False})
+    @patch("catalog.services.get_catalog_api")
+    def test_later_page_served_from_cached_ids(self, mock_api, mock_get, mock_lots):
+        mock_lots.side_effect = lambda request, ids: [SimpleNamespace(id=i) for i in ids]
+
+        result = search_lots(SimpleNamespace(), "42", page=2, page_size=3)
+
+        mock_api.return_value.lots.list.assert_not_called()
+        mock_lots.assert_called_once()
+        assert [lot.id for lot in result.items] == [4]
+        assert result.total_items == 4
+        assert result.has_previous_page is True
@@ -52,6 +52,17 @@ def _make_bulk_request(file_lots, customer_catalog_id="CAT-001"):
     return SimpleNamespace(catalogs=[catalog])
 
 
+def _fail_create_for(*item_ids):
+    """create_lot side effect that fails only for the given customer_item_ids.
+
+    Merge runs lots in parallel, so side effects must not depend on call order.
+    """
+    def side_effect(request, add_req):
+        if add_req.customer_item_id in item_ids:
+            raise Exception("server error")
+    return side_effect
+
+
 class TestLotsDiffer:
     def test_identical_lots_return_false(self):
         a = _make_lot_data(qty=1, l=10.0, w=5.0, h=3.0, wgt=2.0, cpack="3", force_crate=False)
@@ -176,7 +187,7 @@ class TestMergeCatalog:
         assert result["updated"] == 1
         assert result["unchanged"] == 1
         assert result["failed"] == 0
-        mock_delete.assert_called_once_with(request, 2)
+        mock_delete.assert_called_once_with(request, 2, "CHANGED")
         assert mock_create.call_count == 2
 
     @patch("catalog.services.cache_recovery_entry")
@@ -210,7 +221,7 @@ class TestMergeCatalog:
 
     @patch("catalog.services.cache_recovery_entry")
     @patch("catalog.services.get_catalog", return_value=_mock_catalog_obj())
-    @patch("catalog.services.create_lot", side_effect=[Exception("server error"), None])
+    @patch("catalog.services.create_lot", side_effect=_fail_create_for("FAIL"))
     @patch("catalog.services.delete_lot")
     @patch("catalog.services.fetch_all_lots", return_value=[])
     def test_best_effort_failure(self, mock_fetch, mock_delete, mock_create, mock_get_cat, mock_cache, db):
@@ -289,3 +300,227 @@ class TestMergeCatalog:
 
         assert result["seller_display_id"] == "1874"
         assert result["customer_catalog_id"] == "EVT-100"
+
+
+class TestMergeParallelAndRetry:
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog", return_value=_mock_catalog_obj())
+    @patch("catalog.services.create_lot")
+    @patch("catalog.services.delete_lot")
+    @patch("catalog.services.fetch_all_lots", return_value=[])
+    def test_transient_error_is_retried(self, mock_fetch, mock_delete, mock_create, mock_get_cat, mock_cache, db, settings):
+        """A 503 on create is retried and the lot counts as added."""
+        settings.CATALOG_MERGE_RETRY_BACKOFF = 0
+        mock_create.side_effect = [_transient_error(), None]
+        request = SimpleNamespace(session={"abc_username": "test"})
+        bulk = _make_bulk_request([_make_file_lot("A", _make_lot_data(qty=1), "1")])
+
+        result = merge_catalog(request, bulk, catalog_id=42)
+
+        assert result["added"] == 1
+        assert result["failed"] == 0
+        assert mock_create.call_count == 2
+        mock_cache.assert_not_called()
+
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog", return_value=_mock_catalog_obj())
+    @patch("catalog.services.create_lot")
+    @patch("catalog.services.delete_lot")
+    @patch("catalog.services.fetch_all_lots")
+    def test_update_retry_does_not_repeat_delete(self, mock_fetch, mock_delete, mock_create, mock_get_cat, mock_cache, db, settings):
+        """When create fails transiently after delete, only create is retried."""
+        settings.CATALOG_MERGE_RETRY_BACKOFF = 0
+        mock_fetch.return_value = [_make_server_lot(7, "X", _make_lot_data(qty=1))]
+        mock_create.side_effect = [_transient_error(), None]
+        request = SimpleNamespace(session={"abc_username": "test"})
+        bulk = _make_bulk_request([_make_file_lot("X", _make_lot_data(qty=2), "1")])
+
+        result = merge_catalog(request, bulk, catalog_id=42)
+
+        assert result["updated"] == 1
+        mock_delete.assert_called_once_with(request, 7, "X")
+        assert mock_create.call_count == 2
+
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog", return_value=_mock_catalog_obj())
+    @patch("catalog.services.create_lot", side_effect=_fail_create_for("B", "D"))
+    @patch("catalog.services.delete_lot")
+    @patch("catalog.services.fetch_all_lots", return_value=[])
+    def test_errors_and_recovery_entries_keep_file_order(self, mock_fetch, mock_delete, mock_create, mock_get_cat, mock_cache, db):
+        """Parallel execution still reports failures in file order."""
+        request = SimpleNamespace(session={"abc_username": "test"})
+        data = _make_lot_data(qty=1)
+        bulk = _make_bulk_request([_make_file_lot(i, data, str(n)) for n, i in enumerate("ABCDE")])
+
+        result = merge_catalog(request, bulk, catalog_id=42)
+
+        assert result["added"] == 3
+        assert result["failed"] == 2
+        assert ["B" in result["errors"][0], "D" in result["errors"][1]] == [True, True]
+        cached_ids = [c[0][1]["customer_item_id"] for c in mock_cache.call_args_list]
+        assert cached_ids == ["B", "D"]
+
+    @patch("catalog.services.record_item_locations")
+    @patch("catalog.services.cache_recovery_entry")
+    @patch("catalog.services.get_catalog", return_value=_mock_catalog_obj())
+    @patch("catalog.services.create_lot", side_effect=_fail_create_for("X"))
+    @patch("catalog.services.delete_lot")
+    @patch("catalog.services.fetch_all_lots")
+    def test_item_index_skips_failed_lots_and_keeps_positions(
+        self, mock_fetch, mock_delete, mock_create, mock_get_cat, mock_cache, mock_record, db
+    ):
+        request = SimpleNamespace(session={"abc_username": "test"})
+        mock_fetch.return_value = [
+            _make_server_lot(1, "U", _make_lot_data(qty=1)),
+            _make_server_lot(2, "X", _make_lot_data(qty=1)),
+        ]
+        bulk = _make_bulk_request([
+            _make_file_lot("U", _make_lot_data(qty=1), "1"),
+            _make_file_lot("X", _make_lot_data(qty=2), "2"),
+            _make_file_lot("N", _make_lot_data(qty=1), "3"),
+        ])
+
+        merge_catalog(request, bulk, catalog_id=42)
+
+        (locations,) = mock_record.call_args.args
+        assert sorted(locations) == ["N", "U"]
+        assert locations["U"]["lot_id"] == 1
+        assert all("lot_position" not in location for location in locations.values())
+        mock_delete.assert_called_once_with(request, 2, "X")
+
+
+def _transient_error():
+    from ABConnect.exceptions import RequestError
+
+    return RequestError(503, "Service Unavailable")
+
+
+class TestLotFingerprint:
+    def test_matches_lots_differ_normalization(self):
+        from catalog.services import lot_fingerprint
+
+        a = _make_lot_data(qty=None, l=-0.0, cpack=None, force_crate=None)
+        b = _make_lot_data(qty=0, l=0.0, cpack="", force_crate=False)
+        assert lots_differ(a, b) is False
+        assert lot_fingerprint(a) == lot_fingerprint(b)
+
+    def test_changes_with_compared_fields(self):
+        from catalog.services import lot_fingerprint
+
+        base = lot_fingerprint(_make_lot_data(qty=1, cpack="3"))
+        assert lot_fingerprint(_make_lot_data(qty=2, cpack="3")) != base
+        assert lot_fingerprint(_make_lot_data(qty=1, cpack="4")) != base
+        assert lot_fingerprint(_make_lot_data(qty=1, cpack="3", force_crate=True)) != base
+
+
+@patch("catalog.services.invalidate_lot_fingerprints")
+@patch("catalog.services.store_lot_fingerprints")
+@patch("catalog.services.cache_recovery_entry")
+@patch("catalog.services.get_catalog", return_value=_mock_catalog_obj())
+@patch("catalog.services.delete_lot")
+class TestMergeFingerprints:
+    def _fingerprints(self, **lots):
+        from catalog.services import lot_fingerprint
+
+        return {item_id: [lot_id, lot_fingerprint(data)] for item_id, (lot_id, data) in lots.items()}
+
+    @patch("catalog.services.create_lot", side_effect=lambda request, req: SimpleNamespace(id=900))
+    @patch("catalog.services.load_lot_fingerprints", return_value=None)
+    @patch("catalog.services.fetch_all_lots")
+    def test_full_fetch_stores_fingerprints(
+        self, mock_fetch, mock_load, mock_create, mock_delete, mock_get_cat, mock_cache, mock_store, mock_invalidate, db
+    ):
+        same = _make_lot_data(qty=1)
+        mock_fetch.return_value = [_make_server_lot(100, "A", same)]
+        request = SimpleNamespace(session={"abc_username": "test"})
+        bulk = _make_bulk_request([_make_file_lot("A", same), _make_file_lot("B", _make_lot_data(qty=2))])
+
+        merge_catalog(request, bulk, catalog_id=42)
+
+        customer_catalog_id, stored = mock_store.call_args.args
+        assert customer_catalog_id == "CAT-001"
+        assert stored == self._fingerprints(A=(100, same), B=(900, _make_lot_data(qty=2)))
+        mock_invalidate.assert_not_called()
+
+    @patch("catalog.services.create_lot")
+    @patch("catalog.services.get_lots_for_event")
+    @patch("catalog.services.load_lot_fingerprints")
+    @patch("catalog.services.fetch_all_lots")
+    def test_fresh_fingerprints_skip_full_fetch(
+        self, mock_fetch, mock_load, mock_get_lots, mock_create, mock_delete, mock_get_cat, mock_cache, mock_store, mock_invalidate, db
+    ):
+        old, new = _make_lot_data(qty=1), _make_lot_data(qty=5)
+        mock_load.return_value = self._fingerprints(A=(100, old), B=(101, old))
+        mock_get_lots.return_value = [_make_server_lot(101, "B", old)]
+        request = SimpleNamespace(session={"abc_username": "test"})
+        bulk = _make_bulk_request([
+            _make_file_lot("A", old),
+            _make_file_lot("B", new),
+            _make_file_lot("C", new),
+        ])
+
+        result = merge_catalog(request, bulk, catalog_id=42)
+
+        mock_fetch.assert_not_called()
+        mock_get_lots.assert_called_once_with(request, [101])
+        mock_delete.assert_called_once_with(request, 101, "B")
+        assert (result["added"], result["updated"], result["unchanged"]) == (1, 1, 1)
+
+    @patch("catalog.services.create_lot")
+    @patch("catalog.services.get_lots_for_event")
+    @patch("catalog.services.load_lot_fingerprints")
+    @patch("catalog.services.fetch_all_lots")
+    def test_lot_count_mismatch_falls_back_to_full_fetch(
+        self, mock_fetch, mock_load, mock_get_lots, mock_create, mock_delete, mock_get_cat, mock_cache, mock_store, mock_invalidate, db
+    ):
+        same = _make_lot_data(qty=1)
+        mock_load.return_value = self._fingerprints(A=(100, same))
+        mock_get_cat.return_value = SimpleNamespace(
+            sellers=[SimpleNamespace(customer_display_id="1874")],
+            lots=[SimpleNamespace(id=100), SimpleNamespace(id=101)],
+        )
+        mock_fetch.return_value = [_make_server_lot(100, "A", same), _make_server_lot(101, "B", same)]
+        request = SimpleNamespace(session={"abc_username": "test"})
+
+        result = merge_catalog(request, _make_bulk_request([_make_file_lot("B", same)]), catalog_id=42)
+
+        mock_fetch.assert_called_once()
+        mock_get_lots.assert_not_called()
+        mock_create.assert_not_called()  # B is on the server already; not a new lot
+        assert result["unchanged"] == 1
+
+    @patch("catalog.services.create_lot")
+    @patch("catalog.services.get_lots_for_event", side_effect=Exception("404 lot not found"))
+    @patch("catalog.services.load_lot_fingerprints")
+    @patch("catalog.services.fetch_all_lots")
+    def test_stale_fingerprints_fall_back_to_full_fetch(
+        self, mock_fetch, mock_load, mock_get_lots, mock_create, mock_delete, mock_get_cat, mock_cache, mock_store, mock_invalidate, db
+    ):
+        old, new = _make_lot_data(qty=1), _make_lot_data(qty=5)
+        mock_load.return_value = self._fingerprints(A=(100, old))
+        mock_fetch.return_value = [_make_server_lot(200, "A", old)]
+        request = SimpleNamespace(session={"abc_username": "test"})
+
+        result = merge_catalog(request, _make_bulk_request([_make_file_lot("A", new)]), catalog_id=42)
+
+        mock_fetch.assert_called_once()
+        mock_delete.assert_called_once_with(request, 200, "A")
+        assert result["updated"] == 1
+
+    @patch("catalog.services.create_lot")
+    @patch("catalog.services.load_lot_fingerprints", return_value=None)
+    @patch("catalog.services.fetch_all_lots", return_value=[])
+    def test_failed_lot_invalidates_fingerprints(
+        self, mock_fetch, mock_load, mock_create, mock_delete, mock_get_cat, mock_cache, mock_store, mock_invalidate, db
+    ):
+        mock_create.side_effect = _fail_create_for("B")
+        request = SimpleNamespace(session={"abc_username": "test"})
+        bulk = _make_bulk_request([
+            _make_file_lot("A", _make_lot_data(qty=1), "1"),
+            _make_file_lot("B", _make_lot_data(qty=1), "2"),
+        ])
+
+        merge_catalog(request, bulk, catalog_id=42)
+
+        mock_invalidate.assert_called_once_with("CAT-001")
+        mock_store.assert_not_called()
@@ -0,0 +1,71 @@
+"""Unit tests for catalog.monitoring and the /status/ view."""
+
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+
+from catalog import monitoring
+from tests.conftest import AUTH_SESSION
+
+
+@pytest.fixture(autouse=True)
+def reset_log_clock():
+    monitoring._last_logged["at"] = None
+    yield
+    monitoring._last_logged["at"] = None
+
+
+@pytest.fixture
+def limiter():
+    with patch("catalog.monitoring.rate_limit.limiter_state", return_value={"limit": 8.0, "in_flight": 2}) as state:
+        yield state
+
+
+class TestStatus:
+    def test_reports_cache_breakers_and_limiter(self, limiter):
+        status = monitoring.status()
+
+        assert set(status) == {"pid", "cache", "redis_breaker", "api_breaker", "api_limiter"}
+        assert status["api_limiter"] == {"limit": 8.0, "in_flight": 2}
+        assert status["api_breaker"]["state"] == "closed"
+
+    def test_logged_at_most_once_per_interval(self, limiter, settings, caplog):
+        settings.CATALOG_STATUS_LOG_INTERVAL = 60
+
+        with caplog.at_level(logging.INFO, logger="catalog.metrics"):
+            monitoring.log_status_periodically()
+            monitoring.log_status_periodically()
+
+        assert len(caplog.records) == 1
+        assert json.loads(caplog.records[0].getMessage())["status"]["api_limiter"]["in_flight"] == 2
+
+    def test_log_disabled(self, limiter, settings, caplog):
+        settings.CATALOG_STATUS_LOG_INTERVAL = 0
+
+        with caplog.at_level(logging.INFO, logger="catalog.metrics"):
+            monitoring.log_status_periodically()
+
+        assert not caplog.records
+        limiter.assert_not_called()
+
+
+class TestStatusView:
+    def test_requires_login(self, db):
+        response = Client().get("/status/")
+
+        assert response.status_code == 302
+
+    def test_returns_status_json(self, staff_user, limiter):
+        client = Client()
+        client.force_login(staff_user)
+        session = client.session
+        session.update(AUTH_SESSION)
+        session.save()
+
+        response = client.get("/status/")
+
+        assert response.status_code == 200
+        assert response.json()["api_limiter"] == {"limit": 8.0, "in_flight": 2}
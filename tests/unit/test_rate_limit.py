@@ -0,0 +1,144 @@
+"""Unit tests for catalog.rate_limit — the shared Catalog API concurrency limiter."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from catalog import api_client, jobs, rate_limit
+
+
+@pytest.fixture
+def redis_conn():
+    with patch("catalog.rate_limit._connection") as connection:
+        yield connection.return_value
+
+
+def _eval_args(call):
+    """Split an eval() call into (script, keys, args)."""
+    script, numkeys, *rest = call.args
+    return script, rest[:numkeys], rest[numkeys:]
+
+
+def _grant_only_over_limit(script, numkeys, *rest):
+    """Stand in for a saturated limiter: only over-limit acquires succeed."""
+    return 1 if rest[numkeys:][5] == 1 else 0
+
+
+class TestAcquire:
+    def test_granted_permit_returns_token(self, redis_conn):
+        redis_conn.eval.return_value = 1
+
+        token = rate_limit.acquire()
+
+        script, keys, args = _eval_args(redis_conn.eval.call_args)
+        assert script == rate_limit._ACQUIRE
+        assert keys == [rate_limit.INFLIGHT_KEY, rate_limit.LIMIT_KEY]
+        assert args[2] == token
+        assert args[4] == 1.0  # interactive calls may use the whole limit
+
+    @patch("catalog.rate_limit.time.sleep")
+    def test_waits_for_a_free_permit(self, mock_sleep, redis_conn):
+        redis_conn.eval.side_effect = [0, 0, 1]
+
+        assert rate_limit.acquire() is not None
+        assert redis_conn.eval.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_background_calls_use_their_share(self, redis_conn, settings):
+        settings.CATALOG_API_BACKGROUND_SHARE = 0.25
+        redis_conn.eval.return_value = 1
+
+        rate_limit.acquire(rate_limit.BACKGROUND)
+
+        assert _eval_args(redis_conn.eval.call_args)[2][4] == 0.25
+
+    @patch("catalog.rate_limit.time.sleep")
+    def test_takes_permit_over_limit_after_wait(self, mock_sleep, redis_conn, settings):
+        settings.CATALOG_API_INTERACTIVE_PERMIT_WAIT = 0
+        redis_conn.eval.side_effect = _grant_only_over_limit
+
+        token = rate_limit.acquire()
+
+        assert token is not None
+        calls = [_eval_args(call) for call in redis_conn.eval.call_args_list]
+        assert [args[5] for _, _, args in calls] == [0, 1]
+        assert calls[-1][2][2] == token  # the over-limit permit is held under the returned token
+
+    def test_interactive_calls_wait_much_less(self, redis_conn, settings):
+        settings.CATALOG_API_INTERACTIVE_PERMIT_WAIT = 0.25
+        settings.CATALOG_API_PERMIT_WAIT = 10
+        redis_conn.eval.side_effect = _grant_only_over_limit
+        waited = {}
+
+        for priority in (rate_limit.INTERACTIVE, rate_limit.BACKGROUND):
+            slept = []
+            with patch("catalog.rate_limit.time.sleep", side_effect=slept.append), \
+                    patch("catalog.rate_limit.time.monotonic", side_effect=lambda: sum(slept)):
+                assert rate_limit.acquire(priority) is not None
+            waited[priority] = sum(slept)
+
+        assert 0.25 <= waited[rate_limit.INTERACTIVE] < 0.5
+        assert waited[rate_limit.BACKGROUND] >= 10
+
+    def test_redis_down_fails_open(self, redis_conn):
+        redis_conn.eval.side_effect = ConnectionError("Redis down")
+
+        assert rate_limit.acquire() is None
+
+    def test_disabled(self, redis_conn, settings):
+        settings.CATALOG_API_THROTTLE = False
+
+        assert rate_limit.acquire() is None
+        redis_conn.eval.assert_not_called()
+
+
+class TestRelease:
+    @pytest.mark.parametrize("kwargs, factor", [
+        ({"latency": 0.1}, 0),
+        ({"latency": 60}, rate_limit.SLOW_CUT),
+        ({"overloaded": True}, rate_limit.OVERLOAD_CUT),
+    ])
+    def test_adapts_limit_to_outcome(self, redis_conn, kwargs, factor):
+        redis_conn.eval.return_value = b"8"
+
+        rate_limit.release("tok", **kwargs)
+
+        script, keys, args = _eval_args(redis_conn.eval.call_args)
+        assert script == rate_limit._RELEASE
+        assert keys == [rate_limit.INFLIGHT_KEY, rate_limit.LIMIT_KEY, rate_limit.LIMIT_CUT_KEY]
+        assert args[0] == "tok"
+        assert args[4] == factor
+
+    def test_release_without_adapting(self, redis_conn):
+        rate_limit.release("tok", adapt=False)
+
+        script, keys, args = _eval_args(redis_conn.eval.call_args)
+        assert script == rate_limit._RETURN
+        assert (keys, args) == ([rate_limit.INFLIGHT_KEY], ["tok"])
+
+    def test_no_permit_no_call(self, redis_conn):
+        rate_limit.release(None, overloaded=True)
+        redis_conn.eval.assert_not_called()
+
+
+class TestHandlerIntegration:
+    @patch("catalog.api_client.rate_limit.release")
+    @patch("catalog.api_client.rate_limit.acquire", return_value="tok")
+    @patch("catalog.api_client.get_http_session")
+    def test_call_holds_permit_and_reports_throttling(self, mock_session, mock_acquire, mock_release):
+        mock_session.return_value.request.return_value = MagicMock(status_code=429)
+        storage = SimpleNamespace(get_token=lambda: {"access_token": "t"})
+        handler = api_client.PooledCatalogRequestHandler(storage, priority=rate_limit.BACKGROUND)
+
+        with pytest.raises(Exception):
+            handler.call("get", "/Lot/1")
+
+        mock_acquire.assert_called_once_with(rate_limit.BACKGROUND, wait=None)
+        assert mock_release.call_args.args == ("tok",)
+        assert mock_release.call_args.kwargs["overloaded"] is True
+
+    def test_upload_jobs_run_as_background(self, db):
+        request = jobs._job_request({"session_key": None, "username": "nobody"})
+
+        assert request.catalog_api_priority == rate_limit.BACKGROUND
@@ -0,0 +1,61 @@
+"""Unit tests for catalog.records cached list records."""
+
+import pickle
+from datetime import date, datetime
+
+from catalog.records import (
+    EventRecord,
+    SellerRecord,
+    event_records,
+    seller_records,
+    sort_events,
+    upcoming_events,
+)
+
+
+def _event(id, start_date):
+    return EventRecord(id, f"Event {id}", f"C{id}", start_date)
+
+
+class TestRecords:
+    def test_pickle_round_trip(self):
+        seller = SellerRecord(1, "A", "SA")
+        event = _event(7, datetime(2099, 1, 1, 10, 30))
+
+        assert pickle.loads(pickle.dumps(seller)) == seller
+        restored = pickle.loads(pickle.dumps(event))
+        assert restored == event
+        assert restored.start_ts == event.start_ts
+
+    def test_seller_records_converts_dicts(self):
+        assert seller_records([{"id": 1, "name": "A", "customer_display_id": "SA"}]) == [SellerRecord(1, "A", "SA")]
+
+
+class TestEventOrdering:
+    def test_sorted_newest_first_undated_last(self):
+        events = sort_events([_event(1, datetime(2020, 1, 1)), _event(2, None), _event(3, datetime(2099, 1, 1))])
+        assert [e.id for e in events] == [3, 1, 2]
+
+    def test_event_records_converts_legacy_dicts(self):
+        events = event_records([
+            {"id": 1, "title": "Old", "customer_catalog_id": "O", "start_date": "2020-01-01T00:00:00"},
+            {"id": 2, "title": "New", "customer_catalog_id": "N", "start_date": "2099-01-01T00:00:00"},
+        ])
+
+        assert [e.id for e in events] == [2, 1]
+        assert events[0].start_date == datetime(2099, 1, 1)
+
+    def test_event_records_passes_records_through(self):
+        events = [_event(1, datetime(2099, 1, 1))]
+        assert event_records(events) is events
+
+    def test_upcoming_events_is_a_prefix(self):
+        events = sort_events([
+            _event(1, datetime(2026, 10, 16, 23, 59)),
+            _event(2, datetime(2026, 10, 17, 0, 0)),
+            _event(3, datetime(2027, 1, 1)),
+            _event(4, None),
+        ])
+
+        assert [e.id for e in upcoming_events(events, date(2026, 10, 17))] == [3, 2]
+        assert upcoming_events(events, date(2030, 1, 1)) == []
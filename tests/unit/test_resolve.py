@@ -1,9 +1,15 @@
+import json
 from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 
-from catalog.services import resolve_item
+from catalog.services import (
+    forget_item_locations,
+    record_event_item_locations,
+    record_item_locations,
+    resolve_item,
+)
 
 
 def _mock_lot(lot_id, customer_item_id, catalog_id):
@@ -27,6 +33,13 @@ def _mock_paginated(items):
     return SimpleNamespace(items=items)
 
 
+@pytest.fixture(autouse=True)
+def empty_item_index():
+    with patch("catalog.services.lookup_item_location", return_value=None) as lookup, \
+            patch("catalog.services.record_item_locations") as record:
+        yield SimpleNamespace(lookup=lookup, record=record)
+
+
 class TestResolveItem:
     @patch("catalog.services.get_catalog")
     @patch("catalog.services.get_catalog_api")
@@ -83,3 +96,89 @@ class TestResolveItem:
         request = SimpleNamespace(session={"abc_username": "test"})
         result = resolve_item(request, "LAST")
         assert result["lot_position"] == 2
+
+
+class TestItemLocationIndex:
+    @patch("catalog.services.get_catalog_api")
+    def test_indexed_item_skips_api(self, mock_api, empty_item_index):
+        empty_item_index.lookup.return_value = {
+            "lot_id": None, "catalog_id": None, "customer_catalog_id": "EVT-1",
+            "seller_display_id": 1874, "lot_position": None,
+        }
+
+        result = resolve_item(SimpleNamespace(session={}), "ITEM-1")
+
+        mock_api.assert_not_called()
+        assert result["customer_item_id"] == "ITEM-1"
+        assert result["customer_catalog_id"] == "EVT-1"
+        assert result["seller_display_id"] == 1874
+
+    @patch("catalog.services.get_catalog")
+    @patch("catalog.services.get_catalog_api")
+    def test_api_result_is_indexed(self, mock_api, mock_get_cat, empty_item_index):
+        mock_api.return_value.lots.list.return_value = _mock_paginated([_mock_lot(100, "ITEM-1", 42)])
+        mock_get_cat.return_value = _mock_catalog(42, "EVT-200", "1874", lots=[SimpleNamespace(id=100)])
+
+        resolve_item(SimpleNamespace(session={}), "ITEM-1")
+
+        (locations,) = empty_item_index.record.call_args.args
+        assert locations == {"ITEM-1": {
+            "lot_id": 100, "catalog_id": 42, "customer_catalog_id": "EVT-200",
+            "seller_display_id": "1874", "lot_position": 0,
+        }}
+
+    def test_event_lots_indexed_with_positions(self, empty_item_index):
+        event = _mock_catalog(42, "EVT-200", "1874", lots=[SimpleNamespace(id=i) for i in (7, 8, 9)])
+        lots = [SimpleNamespace(id=9, customer_item_id="C"), SimpleNamespace(id=8, customer_item_id="B")]
+
+        record_event_item_locations(event, lots)
+
+        (locations,) = empty_item_index.record.call_args.args
+        assert {k: v["lot_position"] for k, v in locations.items()} == {"C": 2, "B": 1}
+        assert locations["C"]["catalog_id"] == 42
+
+
+class TestRecordItemLocations:
+    @pytest.fixture(autouse=True)
+    def empty_item_index(self):
+        # Exercise the real writer here instead of the module-level stub
+        yield
+
+    @patch("catalog.services._item_index_connection")
+    def test_writes_one_pipelined_hset(self, mock_conn):
+        pipe = mock_conn.return_value.pipeline.return_value
+
+        record_item_locations({"ITEM-1": {"customer_catalog_id": "EVT-1"}, "": {}})
+
+        key, = pipe.hset.call_args.args
+        mapping = pipe.hset.call_args.kwargs["mapping"]
+        assert key == "cat_item_locations"
+        assert list(mapping) == ["ITEM-1"]
+        assert '"customer_catalog_id": "EVT-1"' in mapping["ITEM-1"]
+        pipe.execute.assert_called_once()
+
+    @patch("catalog.services._item_index_connection")
+    def test_omitted_fields_keep_indexed_values_in_same_event(self, mock_conn):
+        indexed = json.dumps({"lot_id": 5, "customer_catalog_id": "EVT-1", "lot_position": 3})
+        mock_conn.return_value.hmget.return_value = [indexed, indexed]
+
+        record_item_locations({
+            "SAME": {"lot_id": 6, "customer_catalog_id": "EVT-1"},
+            "MOVED": {"lot_id": 7, "customer_catalog_id": "EVT-2"},
+        })
+
+        mapping = mock_conn.return_value.pipeline.return_value.hset.call_args.kwargs["mapping"]
+        assert json.loads(mapping["SAME"])["lot_position"] == 3
+        assert json.loads(mapping["SAME"])["lot_id"] == 6
+        assert json.loads(mapping["MOVED"])["lot_position"] is None
+
+    @patch("catalog.services._item_index_connection")
+    def test_forget_deletes_hash_fields(self, mock_conn):
+        forget_item_locations(["ITEM-1", None, 2])
+
+        mock_conn.return_value.hdel.assert_called_once_with("cat_item_locations", "ITEM-1", "2")
+
+    @patch("catalog.services._item_index_connection", side_effect=ConnectionError("Redis down"))
+    def test_redis_down_is_swallowed(self, mock_conn, caplog):
+        record_item_locations({"ITEM-1": {}})
+        assert "Item index write failed for 1 items" in caplog.text
@@ -0,0 +1,47 @@
+"""Unit tests for catalog.search_index trigram filtering."""
+
+from types import SimpleNamespace
+
+from catalog.search_index import TextIndex, index_for, normalize
+
+
+def _records(*names):
+    return [SimpleNamespace(id=i, name=name) for i, name in enumerate(names)]
+
+
+class TestNormalize:
+    def test_strips_accents_case_and_punctuation(self):
+        assert normalize("  Maison-CAFÉ  &  Co. ") == "maison cafe co"
+
+    def test_empty(self):
+        assert normalize(None) == ""
+
+
+class TestTextIndex:
+    def test_substring_match_keeps_order(self):
+        index = TextIndex(_records("Blue Barn Auctions", "Red Barn", "Barnaby's", "Acme"), "name")
+        assert [r.id for r in index.search("barn")] == [0, 1, 2]
+
+    def test_trigram_candidates_are_verified(self):
+        # "bcd abc" has both of the query's trigrams but not the substring
+        index = TextIndex(_records("xabcdx", "bcd abc"), "name")
+        assert [r.id for r in index.search("abcd")] == [0]
+
+    def test_short_query_scans(self):
+        index = TextIndex(_records("Ab House", "Zed"), "name")
+        assert [r.id for r in index.search("ab")] == [0]
+
+    def test_no_match_and_empty_query(self):
+        index = TextIndex(_records("Acme", None), "name")
+        assert index.search("zzz") == []
+        assert len(index.search("  ")) == 2
+
+    def test_index_reused_while_version_unchanged(self):
+        # Each cache read returns a new list; the version ties them to one write
+        first = index_for("t", _records("Acme"), "name", 100.0)
+        assert index_for("t", _records("Acme"), "name", 100.0) is first
+        assert index_for("t", _records("Acme", "Zed"), "name", 200.0) is not first
+
+    def test_unversioned_index_not_reused(self):
+        records = _records("Acme")
+        assert index_for("u", records, "name", None) is not index_for("u", records, "name", None)